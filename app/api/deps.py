@@ -1,11 +1,16 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass
+from typing import Any
 
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import identity_cache
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.data_versions import IDENTITY_SCOPE, read_data_versions, read_scope_version, scope_version_expression
+from app.core.database import get_async_db, get_db, get_read_db
 from app.models import Employee, User, UserRole
 
 settings = get_settings()
@@ -15,48 +20,140 @@ def get_db_session() -> Generator[Session, None, None]:
     yield from get_db()
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db_session)) -> User:
-    if not settings.auth_enabled:
-        stub = db.scalar(select(User).where(User.role == UserRole.ADMIN).limit(1))
-        if stub is not None:
-            return stub
-        raise HTTPException(status_code=503, detail="Auth disabled but no admin user exists")
+def get_read_db_session() -> Generator[Session, None, None]:
+    """Session on the read-only engine, for routes that never write."""
+    yield from get_read_db()
 
-    user_id = request.session.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
 
-    user = db.get(User, int(user_id))
-    if user is None:
-        request.session.clear()
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired")
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Writer session for `async def` routes, which must not run blocking queries on the event loop."""
+    async for db in get_async_db():
+        yield db
 
-    return user
 
+@dataclass(frozen=True)
+class Identity:
+    """The signed-in user and their employee record, resolved once per request."""
 
-def get_current_user_optional(request: Request, db: Session = Depends(get_db_session)) -> User | None:
-    if not settings.auth_enabled:
-        return db.scalar(select(User).where(User.role == UserRole.ADMIN).limit(1))
+    user: User
+    employee: Employee | None
+
+
+def _column_values(instance: Any) -> dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
 
-    user_id = request.session.get("user_id")
-    if not user_id:
+
+def _load_identity(db: Session, user_id: int | None) -> tuple[int, dict[str, Any], dict[str, Any] | None] | None:
+    """Identity data version, user and linked employee in one query; `None` picks the first admin.
+
+    Users without a linked record are matched to an employee by email in a second, indexed lookup.
+    An OR of both conditions in the join could use neither index and scanned `employees` instead.
+    """
+    stmt = select(func.coalesce(scope_version_expression(IDENTITY_SCOPE), 0), User, Employee).outerjoin(
+        Employee, Employee.id == User.employee_id
+    )
+    if user_id is None:
+        stmt = stmt.where(User.role == UserRole.ADMIN).order_by(User.id)
+    else:
+        stmt = stmt.where(User.id == user_id)
+    row = db.execute(stmt.limit(1)).first()
+    if row is None:
         return None
-    return db.get(User, int(user_id))
+    version, user, employee = row
+    if employee is None:
+        employee = db.scalar(select(Employee).where(Employee.email == user.email))
+    return version, _column_values(user), _column_values(employee) if employee is not None else None
+
+
+def _lookup_identity(db: Session, key: int | None) -> Identity | None:
+    values = identity_cache.get(key)
+    # Commits in this process clear the cache directly; other workers' writes show up as a newer version.
+    if values is not None and values[0] != read_scope_version(db, IDENTITY_SCOPE):
+        values = None
+    if values is None:
+        values = _load_identity(db, key)
+        if values is None:
+            return None
+        identity_cache.set(key, values)
+
+    # Fresh unattached instances per request, so nothing mutable is shared between requests.
+    _, user_values, employee_values = values
+    return Identity(
+        user=User(**user_values), employee=Employee(**employee_values) if employee_values is not None else None
+    )
+
+
+def _resolve_identity(request: Request, db: Session) -> Identity | None:
+    """Resolved once per request; later dependencies reuse `request.state.identity`."""
+    if hasattr(request.state, "identity"):
+        return request.state.identity
+    identity = None
+    if not settings.auth_enabled:
+        identity = _lookup_identity(db, None)
+    elif request.session.get("user_id"):
+        identity = _lookup_identity(db, int(request.session["user_id"]))
+    request.state.identity = identity
+    return identity
+
+
+def get_current_user(request: Request, db: Session = Depends(get_read_db_session)) -> User:
+    """The signed-in user as a transient snapshot rebuilt from the identity cache.
+
+    It is not attached to any session: read its attributes, but load the row with
+    `db.get(User, current_user.id)` before changing it or using it in a relationship.
+    """
+    identity = _resolve_identity(request, db)
+    if identity is not None:
+        return identity.user
+
+    if not settings.auth_enabled:
+        raise HTTPException(status_code=503, detail="Auth disabled but no admin user exists")
+    if not request.session.get("user_id"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+    request.session.clear()
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired")
+
+
+def get_current_user_optional(request: Request, db: Session = Depends(get_read_db_session)) -> User | None:
+    identity = _resolve_identity(request, db)
+    return identity.user if identity is not None else None
 
 
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """The signed-in admin, the same detached snapshot as `get_current_user` returns."""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
 
 
 def get_current_employee_record(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
 ) -> Employee | None:
+    identity: Identity | None = getattr(request.state, "identity", None)
+    if identity is not None and identity.user is current_user:
+        return identity.employee
+
+    # Users that did not come from the identity query (e.g. dependency overrides).
     if current_user.employee_id is not None:
         employee = db.get(Employee, current_user.employee_id)
         if employee is not None:
             return employee
 
     return db.scalar(select(Employee).where(Employee.email == current_user.email).limit(1))
+
+
+def get_viewer_scope(
+    current_user: User = Depends(get_current_user),
+    current_employee: Employee | None = Depends(get_current_employee_record),
+) -> tuple[str, int | None]:
+    """What a cached response may vary on: admins all see the same data, employees only their own."""
+    if current_user.role == UserRole.EMPLOYEE:
+        return ("employee", current_employee.id if current_employee is not None else None)
+    return ("admin", None)
+
+
+def get_data_versions(db: Session = Depends(get_read_db_session)) -> dict[str, int]:
+    """One primary-key scan per request; sees commits from every worker process."""
+    return read_data_versions(db)
@@ -0,0 +1,66 @@
+import hashlib
+from collections.abc import Callable
+from datetime import date
+
+from fastapi import Depends, Request, Response
+
+from app.api.deps import get_data_versions, get_viewer_scope
+from app.core.compression import strip_encoding_from_etag
+from app.core.data_versions import CAP_TABLE_SCOPE, data_version
+
+# Browsers may keep the body but must revalidate before every use.
+CACHE_CONTROL = "private, no-cache"
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+async def not_modified_handler(_: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        strip_encoding_from_etag(candidate.strip().removeprefix("W/")) == etag for candidate in if_none_match.split(",")
+    )
+
+
+def compute_etag(request: Request, viewer_scope: tuple, version: int) -> str:
+    """Strong validator for a read: the same URL, viewer and data version always render the same bytes.
+
+    Today's date is included because endpoints default `as_of` to it.
+    """
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    fingerprint = f"{request.url.path}?{query}|{viewer_scope}|{version}|{date.today().isoformat()}"
+    return '"' + hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def conditional_get(scope: str) -> Callable[..., dict[str, str]]:
+    """Dependency answering If-None-Match with 304 before the route body runs.
+
+    Returns the validator headers; they are also set on the injected response, which routes that
+    return their own `Response` must copy.
+    """
+
+    def check_etag(
+        request: Request,
+        response: Response,
+        viewer_scope: tuple = Depends(get_viewer_scope),
+        versions: dict[str, int] = Depends(get_data_versions),
+    ) -> dict[str, str]:
+        etag = compute_etag(request, viewer_scope, data_version(versions, scope))
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        response.headers.update(headers)
+        return headers
+
+    return check_etag
+
+
+cap_table_etag = conditional_get(CAP_TABLE_SCOPE)
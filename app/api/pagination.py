@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+
+
+def encode_cursor(data: dict[str, Any]) -> str:
+    payload = json.dumps(data, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(raw: str) -> dict[str, Any]:
+    try:
+        padded = raw + "=" * (-len(raw) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return data
+
+
+def is_cursor_int(value: Any) -> bool:
+    """JSON `true`/`false` decode to bools, which `isinstance(value, int)` would accept as 1/0."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def encode_id_cursor(row_id: int) -> str:
+    return encode_cursor({"id": row_id})
+
+
+def decode_id_cursor(raw: str) -> int:
+    row_id = decode_cursor(raw).get("id")
+    if not is_cursor_int(row_id):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return row_id
+
+
+def reject_offset_with_cursor(after: str | None, offset: int) -> None:
+    """`offset` on top of a cursor would skip rows past it, the deep scan keyset paging avoids."""
+    if after is not None and offset:
+        raise HTTPException(status_code=400, detail="Pass either after or offset, not both")
+
+
+def set_next_page_link(request: Request, response: Response, next_cursor: str | None) -> None:
+    if next_cursor is None:
+        return
+    next_url = request.url.remove_query_params("offset").include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
@@ -0,0 +1,83 @@
+import time
+from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_user_optional, get_read_db_session
+from app.core.database import track_queries
+from app.core.profiling import ProfileStore, build_report, profile_store, profile_tag, request_profiler
+from app.models import User, UserRole
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def _profiling_requested(request: Request) -> bool:
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM) or ""
+    return flag.lower() in _TRUTHY
+
+
+def get_profiling_admin(request: Request, db: Session = Depends(get_read_db_session)) -> User | None:
+    """The admin asking for a profile; the identity is only looked up when the flag is present.
+
+    The session opens no connection unless that lookup runs, so unflagged requests cost nothing.
+    """
+    if not _profiling_requested(request):
+        return None
+    current_user = get_current_user_optional(request, db)
+    if current_user is None or current_user.role != UserRole.ADMIN:
+        return None
+    return current_user
+
+
+async def profile_request(
+    request: Request,
+    admin: User | None = Depends(get_profiling_admin),
+) -> AsyncGenerator[None, None]:
+    """Profile this request when an admin asks (`X-Profile: 1` or `?profile=1`) or it is sampled.
+
+    The flag is ignored for anyone else. Covers the remaining dependencies, the endpoint and
+    response serialization; the report is stored for `/api/admin/profiles`.
+    """
+    requested = admin is not None
+    if requested:
+        tag = request_profiler.begin()
+    elif request_profiler.should_sample():
+        tag = request_profiler.begin(exclusive=True)
+    else:
+        tag = None
+    if tag is None:
+        yield
+        return
+
+    profile_tag.set(tag)
+    started = time.perf_counter()
+    with track_queries() as queries:
+        queries.log = []
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            profile_tag.set(0)
+            sql_log, queries.log = queries.log, None
+            stats = request_profiler.end(tag)
+
+    route = request.scope.get("route")
+    request_info = {
+        "id": ProfileStore.new_id(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "method": request.method,
+        "path": request.url.path,
+        "query": request.url.query,
+        "route": getattr(route, "path", None),
+        "sampled": not requested,
+        "requested_by": admin.email if requested else None,
+    }
+    report = await run_in_threadpool(
+        build_report, stats, request_info=request_info, duration_seconds=duration, sql_log=sql_log
+    )
+    await run_in_threadpool(profile_store.save, report, stats)
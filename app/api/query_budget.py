@@ -0,0 +1,61 @@
+import logging
+from collections.abc import Callable
+from typing import TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.database import track_queries
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+QUERY_BUDGET_ATTR = "__query_budget__"
+Endpoint = TypeVar("Endpoint", bound=Callable)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(max_queries: int) -> Callable[[Endpoint], Endpoint]:
+    """Most SQL statements one request to the decorated route may run, dependencies and commit included.
+
+    Place it under the router decorator. Over-budget requests are logged, or raise
+    `QueryBudgetExceeded` when `enforce_query_budgets` is set (as the test client does).
+    """
+
+    def decorate(endpoint: Endpoint) -> Endpoint:
+        setattr(endpoint, QUERY_BUDGET_ATTR, max_queries)
+        return endpoint
+
+    return decorate
+
+
+class QueryBudgetMiddleware:
+    """Checks each routed request's statement count against its budget and warns about repeated statements."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as queries:
+            await self.app(scope, receive, send)
+
+        route = scope.get("route")
+        if route is None:
+            return
+        label = f"{scope['method']} {route.path}"
+        if settings.n_plus_one_threshold:
+            for statement, runs in queries.repeated_statements(settings.n_plus_one_threshold):
+                logger.warning("Possible N+1 in %s: ran %d times: %s", label, runs, " ".join(statement.split())[:300])
+
+        budget = getattr(getattr(route, "endpoint", None), QUERY_BUDGET_ATTR, None)
+        if budget is not None and queries.count > budget:
+            message = f"{label} ran {queries.count} SQL statements, over its budget of {budget}"
+            if settings.enforce_query_budgets:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -5,10 +5,12 @@ import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_current_user_optional, get_db_session
+from app.api.deps import get_async_db_session, get_current_user, get_current_user_optional
+from app.api.query_budget import query_budget
 from app.core.config import get_settings
+from app.core.oidc import oidc_provider
 from app.models import Employee, User, UserRole
 from app.schemas import AuthSession, AuthUser
 
@@ -22,10 +24,17 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 settings = get_settings()
 logger = logging.getLogger(__name__)
 oauth_google_client = None
+# `fetched_at` of the provider metadata last copied into the client.
+_copied_metadata_at: float | None = None
 
 
-def _get_oauth_client():
-    global oauth_google_client
+async def _get_oauth_client():
+    """Google client whose endpoints and keys come from the cached provider metadata (no discovery fetch).
+
+    Metadata is copied only when the provider has refreshed since the last copy, so keys authlib
+    re-fetched itself after a rotation are not overwritten with the older cached set.
+    """
+    global oauth_google_client, _copied_metadata_at
 
     if OAuth is None:
         raise HTTPException(status_code=503, detail="Google SSO is not available: authlib is not installed")
@@ -39,12 +48,20 @@ def _get_oauth_client():
             name="google",
             client_id=settings.google_client_id,
             client_secret=settings.google_client_secret,
-            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
             client_kwargs={"scope": "openid email profile"},
             timeout=45.0,
         )
         oauth_google_client = oauth.google
+        _copied_metadata_at = None
 
+    try:
+        metadata = await oidc_provider.get()
+    except (httpx.HTTPError, KeyError, ValueError) as exc:
+        logger.exception("Could not load OpenID provider metadata")
+        raise HTTPException(status_code=503, detail="Google SSO provider metadata is unavailable") from exc
+    if _copied_metadata_at is None or oidc_provider.fetched_at != _copied_metadata_at:
+        oauth_google_client.server_metadata.update(metadata)
+        _copied_metadata_at = oidc_provider.fetched_at
     return oauth_google_client
 
 
@@ -61,7 +78,7 @@ def _is_org_email(email: str, hd_claim: str | None) -> bool:
     return email.lower().endswith(f"@{domain}")
 
 
-def _determine_role(db: Session, email: str, existing_user: User | None) -> UserRole:
+def _determine_role(email: str, existing_user: User | None) -> UserRole:
     email_lower = email.lower()
     if existing_user is not None:
         if email_lower in settings.admin_email_list:
@@ -79,17 +96,18 @@ async def login(request: Request):
     if not settings.auth_enabled:
         raise HTTPException(status_code=400, detail="Auth is disabled")
 
-    google = _get_oauth_client()
+    google = await _get_oauth_client()
     redirect_uri = request.url_for("auth_callback")
     return await google.authorize_redirect(request, redirect_uri, prompt="select_account")
 
 
 @router.get("/callback", name="auth_callback")
-async def auth_callback(request: Request, db: Session = Depends(get_db_session)):
+@query_budget(6)
+async def auth_callback(request: Request, db: AsyncSession = Depends(get_async_db_session)):
     if not settings.auth_enabled:
         raise HTTPException(status_code=400, detail="Auth is disabled")
 
-    google = _get_oauth_client()
+    google = await _get_oauth_client()
     try:
         token = await google.authorize_access_token(request)
         userinfo = token.get("userinfo")
@@ -123,8 +141,8 @@ async def auth_callback(request: Request, db: Session = Depends(get_db_session))
     if not _is_org_email(email, hd_claim):
         raise HTTPException(status_code=403, detail="Only organization users are allowed")
 
-    user = db.scalar(select(User).where(User.email == email).limit(1))
-    role = _determine_role(db, email, user)
+    user = await db.scalar(select(User).where(User.email == email).limit(1))
+    role = _determine_role(email, user)
 
     if user is None:
         user = User(email=email, full_name=full_name, google_sub=google_sub, role=role)
@@ -134,14 +152,13 @@ async def auth_callback(request: Request, db: Session = Depends(get_db_session))
         user.google_sub = google_sub
         user.role = role
 
-    matching_employee = db.scalar(select(Employee).where(Employee.email == email).limit(1))
+    matching_employee = await db.scalar(select(Employee).where(Employee.email == email).limit(1))
     if matching_employee is not None:
         user.employee_id = matching_employee.id
 
     user.last_login_at = datetime.now(timezone.utc)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     request.session.clear()
     request.session["user_id"] = user.id
@@ -156,6 +173,7 @@ def logout(request: Request) -> dict[str, bool]:
 
 
 @router.get("/me", response_model=AuthSession)
+@query_budget(2)
 def me(current_user: User | None = Depends(get_current_user_optional)) -> AuthSession:
     if current_user is None:
         return AuthSession(authenticated=False, user=None)
@@ -173,6 +191,7 @@ def me(current_user: User | None = Depends(get_current_user_optional)) -> AuthSe
 
 
 @router.get("/require", response_model=AuthUser)
+@query_budget(2)
 def require_user(current_user: User = Depends(get_current_user)) -> AuthUser:
     return AuthUser(
         id=current_user.id,
@@ -1,68 +1,153 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import func, select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_employee_record, get_current_user, get_db_session
+from app.api.deps import (
+    get_current_employee_record,
+    get_current_user,
+    get_data_versions,
+    get_read_db_session,
+    get_viewer_scope,
+)
+from app.api.etag import cap_table_etag
+from app.api.pagination import decode_cursor, encode_cursor, is_cursor_int
+from app.api.query_budget import query_budget
+from app.core.cache import cached_json_response
 from app.core.config import get_settings
-from app.models import Employee, EmployeeStatus, Grant, User, UserRole
-from app.schemas import DashboardSummary
-from app.services.vesting import summarize_grant
+from app.core.data_versions import CAP_TABLE_SCOPE
+from app.models import Employee, EmployeeStatus, User, UserRole
+from app.schemas import DashboardSummary, GrantSummaryPage, GrantSummarySort
+from app.services.cap_table import SummaryPageKey, VestingTotals, compute_vesting_totals, grant_summary_page
+from app.services.pool import get_pool_snapshot
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 settings = get_settings()
 
 
+def _decode_summary_cursor(raw: str, sort: GrantSummarySort, as_of: date) -> SummaryPageKey:
+    """A cursor only continues the listing it came from: same sort and same vesting date."""
+    data = decode_cursor(raw)
+    if data.get("sort") != sort.value or data.get("as_of") != as_of.isoformat() or not is_cursor_int(data.get("id")):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    value = data.get("value")
+    if sort != GrantSummarySort.ID and not is_cursor_int(value):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return SummaryPageKey(grant_id=data["id"], value=value)
+
+
+def _encode_summary_cursor(key: SummaryPageKey, sort: GrantSummarySort, as_of: date) -> str:
+    data = {"sort": sort.value, "as_of": as_of.isoformat(), "id": key.grant_id}
+    if key.value is not None:
+        data["value"] = key.value
+    return encode_cursor(data)
+
+
 @router.get("/summary", response_model=DashboardSummary)
+@query_budget(8)
 def get_dashboard_summary(
     as_of: date | None = Query(default=None),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
-) -> DashboardSummary:
+    viewer_scope: tuple = Depends(get_viewer_scope),
+    versions: dict[str, int] = Depends(get_data_versions),
+    etag_headers: dict[str, str] = Depends(cap_table_etag),
+) -> Response:
     effective_date = as_of or date.today()
+    return cached_json_response(
+        versions,
+        CAP_TABLE_SCOPE,
+        ("dashboard_summary", effective_date, viewer_scope),
+        lambda: _build_dashboard_summary(db, effective_date, current_user, current_employee),
+        etag_headers,
+    )
 
-    stmt = select(Grant).options(selectinload(Grant.employee), selectinload(Grant.exercises)).order_by(Grant.id.desc())
-    if current_user.role == UserRole.EMPLOYEE:
-        if current_employee is None:
-            grants = []
-        else:
-            grants = db.scalars(stmt.where(Grant.employee_id == current_employee.id)).all()
-    else:
-        grants = db.scalars(stmt).all()
-
-    grant_summaries = [summarize_grant(grant, effective_date) for grant in grants]
 
+def _build_dashboard_summary(
+    db: Session, effective_date: date, current_user: User, current_employee: Employee | None
+) -> DashboardSummary:
     if current_user.role == UserRole.EMPLOYEE:
+        totals = VestingTotals()
+        if current_employee is not None:
+            totals = compute_vesting_totals(db, effective_date, employee_id=current_employee.id)
         active_employees = 1 if current_employee and current_employee.status == EmployeeStatus.ACTIVE else 0
         total_employees = 1 if current_employee else 0
         pool_allocated = 0
         pool_remaining = 0
         pool_size = 0
     else:
+        totals = compute_vesting_totals(db, effective_date)
         active_employees = db.scalar(
             select(func.count()).select_from(Employee).where(Employee.status == EmployeeStatus.ACTIVE)
         )
         total_employees = db.scalar(select(func.count()).select_from(Employee))
-        pool_allocated = sum(grant.total_options for grant in grants)
-        pool_remaining = max(settings.esop_pool_size - pool_allocated, 0)
-        pool_size = settings.esop_pool_size
-
-    vested_options = sum(item.vested_options for item in grant_summaries)
-    unvested_options = sum(item.unvested_options for item in grant_summaries)
-    exercised_options = sum(item.exercised_options for item in grant_summaries)
+        pool = get_pool_snapshot(db, settings.esop_pool_size)
+        pool_allocated = pool.allocated_options
+        pool_remaining = pool.remaining_options
+        pool_size = pool.pool_size
 
     return DashboardSummary(
         as_of=effective_date,
         total_employees=total_employees or 0,
         active_employees=active_employees or 0,
-        total_grants=len(grants),
+        total_grants=totals.total_grants,
         pool_size=pool_size,
         pool_allocated=pool_allocated,
         pool_remaining=pool_remaining,
-        vested_options=vested_options,
-        unvested_options=unvested_options,
-        exercised_options=exercised_options,
-        grant_summaries=grant_summaries,
+        vested_options=totals.vested_options,
+        unvested_options=totals.unvested_options,
+        exercised_options=totals.exercised_options,
+    )
+
+
+@router.get("/grant-summaries", response_model=GrantSummaryPage)
+@query_budget(6)
+def list_grant_summaries(
+    as_of: date | None = Query(default=None),
+    after: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    employee_id: int | None = Query(default=None),
+    status_filter: EmployeeStatus | None = Query(default=None, alias="status"),
+    exercisable: bool | None = Query(default=None),
+    sort: GrantSummarySort = Query(default=GrantSummarySort.ID),
+    db: Session = Depends(get_read_db_session),
+    current_user: User = Depends(get_current_user),
+    current_employee: Employee | None = Depends(get_current_employee_record),
+    viewer_scope: tuple = Depends(get_viewer_scope),
+    versions: dict[str, int] = Depends(get_data_versions),
+    etag_headers: dict[str, str] = Depends(cap_table_etag),
+) -> Response:
+    effective_date = as_of or date.today()
+    after_key = _decode_summary_cursor(after, sort, effective_date) if after else None
+
+    if current_user.role == UserRole.EMPLOYEE:
+        if current_employee is None or (employee_id is not None and employee_id != current_employee.id):
+            empty_page = GrantSummaryPage(items=[]).model_dump_json()
+            return Response(content=empty_page, media_type="application/json", headers=etag_headers)
+        employee_id = current_employee.id
+
+    def render() -> GrantSummaryPage:
+        items, next_key = grant_summary_page(
+            db,
+            effective_date,
+            limit=limit,
+            sort=sort,
+            after=after_key,
+            employee_id=employee_id,
+            employee_status=status_filter,
+            exercisable=exercisable,
+        )
+        return GrantSummaryPage(
+            items=items,
+            next_cursor=_encode_summary_cursor(next_key, sort, effective_date) if next_key else None,
+        )
+
+    return cached_json_response(
+        versions,
+        CAP_TABLE_SCOPE,
+        ("grant_summaries", effective_date, viewer_scope, after_key, limit, employee_id, status_filter, exercisable, sort),
+        render,
+        etag_headers,
     )
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_employee_record, get_current_user, get_db_session, require_admin
+from app.api.deps import (
+    get_current_employee_record,
+    get_current_user,
+    get_db_session,
+    get_read_db_session,
+    require_admin,
+)
+from app.api.etag import cap_table_etag
+from app.api.pagination import decode_id_cursor, encode_id_cursor, reject_offset_with_cursor, set_next_page_link
+from app.api.query_budget import query_budget
 from app.models import Employee, EmployeeStatus, User, UserRole
 from app.schemas import EmployeeCreate, EmployeeRead, EmployeeUpdate
 
@@ -10,6 +19,7 @@ router = APIRouter(prefix="/api/employees", tags=["employees"])
 
 
 @router.post("", response_model=EmployeeRead, status_code=status.HTTP_201_CREATED)
+@query_budget(7)
 def create_employee(
     payload: EmployeeCreate,
     db: Session = Depends(get_db_session),
@@ -33,30 +43,43 @@ def create_employee(
     return employee
 
 
-@router.get("", response_model=list[EmployeeRead])
+@router.get("", response_model=list[EmployeeRead], dependencies=[Depends(cap_table_etag)])
+@query_budget(5)
 def list_employees(
+    request: Request,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    after: str | None = Query(default=None),
     status_filter: EmployeeStatus | None = Query(default=None, alias="status"),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
 ) -> list[Employee]:
+    reject_offset_with_cursor(after, offset)
     if current_user.role == UserRole.EMPLOYEE:
         if current_employee is None:
             return []
         return [current_employee]
 
-    stmt = select(Employee).order_by(Employee.id.desc()).limit(limit).offset(offset)
+    stmt = select(Employee).order_by(Employee.id.desc()).limit(limit + 1).offset(offset)
+    if after is not None:
+        stmt = stmt.where(Employee.id < decode_id_cursor(after))
     if status_filter is not None:
         stmt = stmt.where(Employee.status == status_filter)
-    return list(db.scalars(stmt).all())
+
+    employees = list(db.scalars(stmt).all())
+    if len(employees) > limit:
+        employees = employees[:limit]
+        set_next_page_link(request, response, encode_id_cursor(employees[-1].id))
+    return employees
 
 
 @router.get("/{employee_id}", response_model=EmployeeRead)
+@query_budget(4)
 def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
 ) -> Employee:
@@ -72,6 +95,7 @@ def get_employee(
 
 
 @router.patch("/{employee_id}", response_model=EmployeeRead)
+@query_budget(10)
 def update_employee(
     employee_id: int,
     payload: EmployeeUpdate,
@@ -111,6 +135,7 @@ def update_employee(
 
 
 @router.delete("/{employee_id}", response_model=EmployeeRead)
+@query_budget(10)
 def deactivate_employee(
     employee_id: int,
     db: Session = Depends(get_db_session),
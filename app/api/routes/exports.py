@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_employee_record, get_current_user, get_read_db_session
+from app.models import Employee, User, UserRole
+from app.schemas import ExportFormat
+from app.services.cap_table import CAP_TABLE_COLUMNS, DEFAULT_BATCH_SIZE, VestingBatch, iter_vesting_batches
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+MEDIA_TYPES = {ExportFormat.CSV: "text/csv; charset=utf-8", ExportFormat.NDJSON: "application/x-ndjson"}
+
+
+def _csv_chunks(batches: Iterable[VestingBatch], as_of: date) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CAP_TABLE_COLUMNS)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch.rows(as_of))
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(batches: Iterable[VestingBatch], as_of: date) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(CAP_TABLE_COLUMNS, row)), separators=(",", ":")) + "\n" for row in batch.rows(as_of)
+        )
+
+
+@router.get("/cap-table")
+def export_cap_table(
+    as_of: date | None = Query(default=None),
+    export_format: ExportFormat = Query(default=ExportFormat.CSV, alias="format"),
+    batch_size: int = Query(default=DEFAULT_BATCH_SIZE, ge=100, le=50_000),
+    db: Session = Depends(get_read_db_session),
+    current_user: User = Depends(get_current_user),
+    current_employee: Employee | None = Depends(get_current_employee_record),
+) -> StreamingResponse:
+    """Stream one row per grant, computing vesting one server-side batch at a time.
+
+    The batches read from `db` while the body streams; FastAPI 0.118+ closes yield dependencies
+    only after the response is sent, which is why pyproject requires it.
+    """
+    effective_date = as_of or date.today()
+    batches: Iterable[VestingBatch]
+    if current_user.role == UserRole.EMPLOYEE and current_employee is None:
+        batches = ()
+    else:
+        employee_id = current_employee.id if current_user.role == UserRole.EMPLOYEE else None
+        batches = iter_vesting_batches(db, effective_date, employee_id=employee_id, batch_size=batch_size)
+
+    chunks = _csv_chunks if export_format == ExportFormat.CSV else _ndjson_chunks
+    filename = f"cap-table-{effective_date.isoformat()}.{export_format.value}"
+    return StreamingResponse(
+        chunks(batches, effective_date),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
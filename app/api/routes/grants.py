@@ -1,14 +1,38 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, selectinload
-
-from app.api.deps import get_current_employee_record, get_current_user, get_db_session, require_admin
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from app.api.deps import (
+    get_current_employee_record,
+    get_current_user,
+    get_data_versions,
+    get_db_session,
+    get_read_db_session,
+    get_viewer_scope,
+    require_admin,
+)
+from app.api.etag import cap_table_etag
+from app.api.pagination import decode_id_cursor, encode_id_cursor, reject_offset_with_cursor, set_next_page_link
+from app.api.query_budget import query_budget
+from app.core.cache import cached_json_response
 from app.core.config import get_settings
+from app.core.data_versions import CAP_TABLE_SCOPE
 from app.models import Employee, EmployeeStatus, Exercise, Grant, User, UserRole
-from app.schemas import ExerciseCreate, ExerciseRead, GrantCreate, GrantRead, GrantUpdate, GrantVestingSummary
-from app.services.vesting import summarize_grant, vested_options_for_grant
+from app.schemas import (
+    ExerciseBulkCreate,
+    ExerciseBulkError,
+    ExerciseCreate,
+    ExerciseRead,
+    GrantCreate,
+    GrantRead,
+    GrantUpdate,
+    GrantVestingSummary,
+)
+from app.services.exercises import ExerciseRequest, add_exercise, add_exercises, exercised_options_as_of
+from app.services.pool import allocate_pool_options, ensure_pool_state
+from app.services.vesting import summarize_grants, vested_options_for_grant
 
 router = APIRouter(prefix="/api/grants", tags=["grants"])
 settings = get_settings()
@@ -32,6 +56,7 @@ def _assert_grant_access(grant: Grant, current_user: User, current_employee: Emp
 
 
 @router.post("", response_model=GrantRead, status_code=status.HTTP_201_CREATED)
+@query_budget(16)
 def create_grant(
     payload: GrantCreate,
     db: Session = Depends(get_db_session),
@@ -45,40 +70,80 @@ def create_grant(
     if employee.email.lower() == current_admin.email.lower():
         raise HTTPException(status_code=403, detail="Admins cannot assign grants to themselves")
 
-    allocated = db.scalar(select(func.coalesce(func.sum(Grant.total_options), 0)).select_from(Grant)) or 0
-    if allocated + payload.total_options > settings.esop_pool_size:
-        raise HTTPException(status_code=400, detail="Grant exceeds available ESOP pool")
-
+    ensure_pool_state(db, settings.esop_pool_size)
     grant = Grant(**payload.model_dump())
     db.add(grant)
+    db.flush()
+    if not allocate_pool_options(db, settings.esop_pool_size, payload.total_options, grant_id=grant.id):
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Grant exceeds available ESOP pool")
+
     db.commit()
     db.refresh(grant)
     return grant
 
 
-@router.get("", response_model=list[GrantRead])
+@router.get("", response_model=list[GrantRead], dependencies=[Depends(cap_table_etag)])
+@query_budget(5)
 def list_grants(
+    request: Request,
+    response: Response,
     employee_id: int | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db_session),
+    after: str | None = Query(default=None),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
 ) -> list[Grant]:
-    stmt = select(Grant).order_by(Grant.id.desc()).limit(limit).offset(offset)
+    reject_offset_with_cursor(after, offset)
+    stmt = select(Grant).order_by(Grant.id.desc()).limit(limit + 1).offset(offset)
+    if after is not None:
+        stmt = stmt.where(Grant.id < decode_id_cursor(after))
     if current_user.role == UserRole.EMPLOYEE:
         if current_employee is None:
             return []
         stmt = stmt.where(Grant.employee_id == current_employee.id)
     elif employee_id is not None:
         stmt = stmt.where(Grant.employee_id == employee_id)
-    return list(db.scalars(stmt).all())
+
+    grants = list(db.scalars(stmt).all())
+    if len(grants) > limit:
+        grants = grants[:limit]
+        set_next_page_link(request, response, encode_id_cursor(grants[-1].id))
+    return grants
+
+
+@router.post(
+    "/exercises:bulk",
+    response_model=list[ExerciseRead],
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"description": "Per-row errors; nothing was recorded"}},
+)
+def record_exercises_bulk(
+    payload: ExerciseBulkCreate,
+    db: Session = Depends(get_db_session),
+    current_admin: User = Depends(require_admin),
+) -> list[ExerciseRead]:
+    requests = [ExerciseRequest(**item.model_dump()) for item in payload.exercises]
+    exercises, errors = add_exercises(db, requests, admin_email=current_admin.email)
+    if errors:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=[ExerciseBulkError(index=error.index, detail=error.detail).model_dump() for error in errors],
+        )
+
+    created = [ExerciseRead.model_validate(exercise) for exercise in exercises]
+    db.commit()
+    return created
 
 
 @router.get("/{grant_id}", response_model=GrantRead)
+@query_budget(4)
 def get_grant(
     grant_id: int,
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
 ) -> Grant:
@@ -90,6 +155,7 @@ def get_grant(
 
 
 @router.patch("/{grant_id}", response_model=GrantRead)
+@query_budget(10)
 def update_grant(
     grant_id: int,
     payload: GrantUpdate,
@@ -111,16 +177,12 @@ def update_grant(
     _validate_vesting_config(cliff_months, vesting_months, vesting_frequency_months)
 
     if "total_options" in data:
-        exercised = db.scalar(
-            select(func.coalesce(func.sum(Exercise.options_exercised), 0)).where(Exercise.grant_id == grant_id)
-        )
-        if data["total_options"] < (exercised or 0):
+        if data["total_options"] < grant.exercised_options:
             raise HTTPException(status_code=400, detail="total_options cannot be lower than exercised options")
 
-        allocated_other_grants = (
-            db.scalar(select(func.coalesce(func.sum(Grant.total_options), 0)).where(Grant.id != grant_id)) or 0
-        )
-        if allocated_other_grants + data["total_options"] > settings.esop_pool_size:
+        delta = data["total_options"] - grant.total_options
+        if delta and not allocate_pool_options(db, settings.esop_pool_size, delta, grant_id=grant_id):
+            db.rollback()
             raise HTTPException(status_code=400, detail="Updated grant exceeds available ESOP pool")
 
     for key, value in data.items():
@@ -133,73 +195,73 @@ def update_grant(
 
 
 @router.post("/{grant_id}/exercises", response_model=ExerciseRead, status_code=status.HTTP_201_CREATED)
+@query_budget(10)
 def record_exercise(
     grant_id: int,
     payload: ExerciseCreate,
     db: Session = Depends(get_db_session),
     current_admin: User = Depends(require_admin),
 ) -> Exercise:
-    grant = db.scalar(
-        select(Grant)
-        .options(selectinload(Grant.employee), selectinload(Grant.exercises))
-        .where(Grant.id == grant_id)
-    )
+    grant = db.scalar(select(Grant).options(joinedload(Grant.employee)).where(Grant.id == grant_id))
     if grant is None:
         raise HTTPException(status_code=404, detail="Grant not found")
     if grant.employee.email.lower() == current_admin.email.lower():
         raise HTTPException(status_code=403, detail="Admins cannot execute actions on their own grants")
 
-    exercised_until_date = sum(ex.options_exercised for ex in grant.exercises if ex.exercise_date <= payload.exercise_date)
+    exercised_until_date = exercised_options_as_of(db, grant, payload.exercise_date)
     vested_on_date = vested_options_for_grant(grant, payload.exercise_date)
 
     if exercised_until_date + payload.options_exercised > vested_on_date:
         raise HTTPException(status_code=400, detail="Exercise exceeds vested options on the selected date")
 
-    total_exercised_after = sum(ex.options_exercised for ex in grant.exercises) + payload.options_exercised
-    if total_exercised_after > grant.total_options:
-        raise HTTPException(status_code=400, detail="Exercise exceeds total grant options")
-
     price_per_option = payload.price_per_option_cents
     if price_per_option is None:
         price_per_option = grant.strike_price_cents
 
-    exercise = Exercise(
-        grant_id=grant_id,
-        exercise_date=payload.exercise_date,
-        options_exercised=payload.options_exercised,
-        price_per_option_cents=price_per_option,
-    )
-    db.add(exercise)
+    exercise = add_exercise(db, grant_id, payload.exercise_date, payload.options_exercised, price_per_option)
+    if exercise is None:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Exercise exceeds total grant options")
+
     db.commit()
     db.refresh(exercise)
     return exercise
 
 
 @router.get("/{grant_id}/summary", response_model=GrantVestingSummary)
+@query_budget(5)
 def grant_summary(
     grant_id: int,
     as_of: date | None = Query(default=None),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
-) -> GrantVestingSummary:
-    grant = db.scalar(
-        select(Grant)
-        .options(selectinload(Grant.employee), selectinload(Grant.exercises))
-        .where(Grant.id == grant_id)
-    )
-    if grant is None:
-        raise HTTPException(status_code=404, detail="Grant not found")
-    _assert_grant_access(grant, current_user, current_employee)
-
+    viewer_scope: tuple = Depends(get_viewer_scope),
+    versions: dict[str, int] = Depends(get_data_versions),
+    etag_headers: dict[str, str] = Depends(cap_table_etag),
+) -> Response:
     effective_date = as_of or date.today()
-    return summarize_grant(grant, effective_date)
 
+    def render() -> GrantVestingSummary:
+        grant = db.scalar(select(Grant).options(joinedload(Grant.employee)).where(Grant.id == grant_id))
+        if grant is None:
+            raise HTTPException(status_code=404, detail="Grant not found")
+        _assert_grant_access(grant, current_user, current_employee)
+
+        exercised = exercised_options_as_of(db, grant, effective_date)
+        return summarize_grants([grant], effective_date, exercised=[exercised])[0]
 
-@router.get("/{grant_id}/exercises", response_model=list[ExerciseRead])
+    # The viewer scope is part of the key, so a cached summary is only served to viewers who passed the access check.
+    return cached_json_response(
+        versions, CAP_TABLE_SCOPE, ("grant_summary", grant_id, effective_date, viewer_scope), render, etag_headers
+    )
+
+
+@router.get("/{grant_id}/exercises", response_model=list[ExerciseRead], dependencies=[Depends(cap_table_etag)])
+@query_budget(6)
 def list_exercises(
     grant_id: int,
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     current_user: User = Depends(get_current_user),
     current_employee: Employee | None = Depends(get_current_employee_record),
 ) -> list[Exercise]:
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_db_session, require_admin
+from app.core.config import get_settings
+from app.models import User
+from app.schemas import ImportFormat, ImportKind, ImportReport
+from app.services.bulk_import import DEFAULT_IMPORT_BATCH_SIZE, ImportFormatError, parse_import_rows, run_import
+
+router = APIRouter(prefix="/api/imports", tags=["imports"])
+settings = get_settings()
+
+
+def _import_format(request: Request, requested: ImportFormat | None) -> ImportFormat:
+    if requested is not None:
+        return requested
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if content_type in {"text/csv", "application/csv"}:
+        return ImportFormat.CSV
+    if content_type == "application/json":
+        return ImportFormat.JSON
+    raise HTTPException(status_code=415, detail="Send text/csv or application/json, or pass ?format=")
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Import body exceeds {settings.import_max_bytes} bytes")
+
+
+async def _read_body(request: Request) -> bytes:
+    """The upload, refused before it is buffered when it is over `import_max_bytes`."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > settings.import_max_bytes:
+        raise _too_large()
+    # Chunked uploads carry no length, so the limit is also enforced while reading.
+    chunks, received = [], 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.import_max_bytes:
+            raise _too_large()
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _parse_and_import(
+    db: Session, kind: ImportKind, body: bytes, import_format: ImportFormat, *, admin_email: str, batch_size: int
+) -> ImportReport:
+    try:
+        rows = parse_import_rows(body, import_format)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return run_import(db, kind, rows, pool_size=settings.esop_pool_size, admin_email=admin_email, batch_size=batch_size)
+
+
+@router.post("/{kind}", response_model=ImportReport)
+async def import_records(
+    kind: ImportKind,
+    request: Request,
+    import_format: ImportFormat | None = Query(default=None, alias="format"),
+    batch_size: int = Query(default=DEFAULT_IMPORT_BATCH_SIZE, ge=1, le=50_000),
+    db: Session = Depends(get_db_session),
+    current_admin: User = Depends(require_admin),
+) -> ImportReport:
+    """Validate every row up front, insert the valid ones in batches and report the rest by row number.
+
+    Parsing, validation and the inserts all run in the threadpool; only reading the body is async.
+    """
+    import_format = _import_format(request, import_format)
+    body = await _read_body(request)
+    return await run_in_threadpool(
+        _parse_and_import,
+        db,
+        kind,
+        body,
+        import_format,
+        admin_email=current_admin.email,
+        batch_size=batch_size,
+    )
@@ -0,0 +1,34 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.deps import require_admin
+from app.core.profiling import profile_store
+from app.models import User
+from app.schemas import ProfileSummary
+
+router = APIRouter(prefix="/api/admin/profiles", tags=["admin"])
+
+
+@router.get("", response_model=list[ProfileSummary])
+def list_profiles(current_admin: User = Depends(require_admin)) -> list[dict[str, Any]]:
+    return profile_store.list()
+
+
+@router.get("/{report_id}")
+def get_profile(report_id: str, current_admin: User = Depends(require_admin)) -> dict[str, Any]:
+    """Full report: request details, per-statement SQL timings, hottest functions and the call tree."""
+    report = profile_store.load(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
+
+
+@router.get("/{report_id}/pstats")
+def download_profile_stats(report_id: str, current_admin: User = Depends(require_admin)) -> FileResponse:
+    """The raw profile in pstats format, for `python -m pstats` or snakeviz."""
+    path = profile_store.pstats_path(report_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{report_id}.prof")
@@ -0,0 +1,176 @@
+"""Administrative commands: `python -m app.cli <command>`."""
+import argparse
+import logging
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import data_versions  # noqa: F401  (writes made here must invalidate the web workers' caches)
+from app.core.config import get_settings
+from app.core.database import SessionLocal, create_database_engine, init_db
+from app.schemas import ImportFormat, ImportKind
+from app.services.bulk_import import DEFAULT_IMPORT_BATCH_SIZE, ImportFormatError, parse_import_rows, run_import
+from app.services.exercises import (
+    backfill_after_schema_changes,
+    backfill_exercise_totals,
+    find_exercise_total_mismatches,
+    find_ledger_mismatches,
+    rebuild_exercise_ledger,
+)
+from app.services.synthetic import DEFAULT_AS_OF, DEFAULT_SEED_BATCH_SIZE, SeedError, generate_cap_table
+
+DEFAULT_SEED_DATABASE = "synthetic.db"
+
+
+def _check_exercise_totals(_: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        mismatches = find_exercise_total_mismatches(db)
+        ledger_mismatches = find_ledger_mismatches(db)
+
+    for mismatch in mismatches:
+        print(
+            f"grant {mismatch.grant_id}: stored exercised={mismatch.stored_exercised} "
+            f"last={mismatch.stored_last_exercise_date}, actual exercised={mismatch.actual_exercised} "
+            f"last={mismatch.actual_last_exercise_date}"
+        )
+    for grant_id in ledger_mismatches:
+        print(f"grant {grant_id}: exercise ledger disagrees with exercises")
+    print(f"{len(mismatches)} grant(s) with inconsistent exercise totals")
+    print(f"{len(ledger_mismatches)} grant(s) with an inconsistent exercise ledger")
+    return 1 if mismatches or ledger_mismatches else 0
+
+
+def _backfill_exercise_totals(_: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        corrected = backfill_exercise_totals(db)
+    print(f"Corrected exercise totals on {corrected} grant(s)")
+    return 0
+
+
+def _rebuild_exercise_ledger(_: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        entries = rebuild_exercise_ledger(db)
+    print(f"Rebuilt exercise ledger with {entries} entries")
+    return 0
+
+
+def _import(args: argparse.Namespace) -> int:
+    path = Path(args.path)
+    format_name = args.format or path.suffix.lstrip(".").lower()
+    if format_name not in {fmt.value for fmt in ImportFormat}:
+        print(f"{path}: cannot infer the file format, pass --format", file=sys.stderr)
+        return 2
+    try:
+        rows = parse_import_rows(path.read_bytes(), ImportFormat(format_name))
+    except ImportFormatError as exc:
+        print(f"{path}: {exc}", file=sys.stderr)
+        return 2
+
+    with SessionLocal() as db:
+        report = run_import(
+            db, ImportKind(args.kind), rows, pool_size=get_settings().esop_pool_size, batch_size=args.batch_size
+        )
+    for error in report.errors:
+        print(f"row {error.row}: {error.detail}")
+    print(f"Imported {report.inserted} of {report.total_rows} {report.kind.value} row(s)")
+    return 1 if report.errors else 0
+
+
+def _seed(args: argparse.Namespace) -> int:
+    # Every seeding batch is one deliberately large statement; don't report each as a slow query.
+    logging.getLogger("app.sql").setLevel(logging.ERROR)
+    started = time.perf_counter()
+    database = Path(args.database).resolve()
+    seed_engine = create_database_engine(f"sqlite:///{database}")
+    try:
+        init_db(seed_engine)
+        with sessionmaker(bind=seed_engine, autoflush=False, class_=Session)() as db:
+            report = generate_cap_table(
+                db,
+                employees=args.employees,
+                grants=args.grants,
+                seed=args.seed,
+                pool_size=args.pool_size,
+                exercise_rate=args.exercise_rate,
+                as_of=args.as_of,
+                batch_size=args.batch_size,
+            )
+    except SeedError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    finally:
+        seed_engine.dispose()
+    print(
+        f"Seeded {report.employees} employee(s), {report.grants} grant(s) and {report.exercises} exercise(s) "
+        f"into {database} (pool of {report.pool_size} options) in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__)
+    parser.set_defaults(uses_app_database=True)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "check-exercise-totals", help="Report grants whose exercised counters or ledger disagree with their exercises"
+    ).set_defaults(handler=_check_exercise_totals)
+    commands.add_parser(
+        "backfill-exercise-totals", help="Recompute exercised counters on every grant from its exercises"
+    ).set_defaults(handler=_backfill_exercise_totals)
+    commands.add_parser(
+        "rebuild-exercise-ledger", help="Regenerate the cumulative exercise ledger from the exercises table"
+    ).set_defaults(handler=_rebuild_exercise_ledger)
+
+    import_parser = commands.add_parser("import", help="Bulk import employees or grants from a CSV or JSON file")
+    import_parser.add_argument("kind", choices=[kind.value for kind in ImportKind])
+    import_parser.add_argument("path", help="CSV with a header row, or a JSON array of objects")
+    import_parser.add_argument(
+        "--format", choices=[fmt.value for fmt in ImportFormat], help="Defaults to the file extension"
+    )
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_IMPORT_BATCH_SIZE)
+    import_parser.set_defaults(handler=_import)
+
+    seed_parser = commands.add_parser(
+        "seed",
+        help="Append a deterministic synthetic cap table (employees, grants, exercises) to a SQLite file",
+    )
+    seed_parser.add_argument(
+        "--database",
+        default=DEFAULT_SEED_DATABASE,
+        help="SQLite file to create or extend; never the app database unless you point it there",
+    )
+    seed_parser.add_argument(
+        "--pool-size",
+        type=int,
+        help="ESOP pool for a file without one; by default it is sized to fit the generated grants",
+    )
+    seed_parser.add_argument("--employees", type=int, default=1_000)
+    seed_parser.add_argument("--grants", type=int, default=10_000)
+    seed_parser.add_argument("--seed", type=int, default=0, help="Same seed and sizes give the same data")
+    seed_parser.add_argument(
+        "--exercise-rate", type=float, default=0.3, help="Share of vested grants with an exercise history"
+    )
+    seed_parser.add_argument(
+        "--as-of", type=date.fromisoformat, default=DEFAULT_AS_OF, help="Latest joining, grant and exercise date"
+    )
+    seed_parser.add_argument("--batch-size", type=int, default=DEFAULT_SEED_BATCH_SIZE)
+    seed_parser.set_defaults(handler=_seed, uses_app_database=False)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.uses_app_database:
+        schema_changes = init_db()
+        with SessionLocal() as db:
+            backfill_after_schema_changes(db, schema_changes)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+from app.core.data_versions import IDENTITY_SCOPE, data_version, on_scope_committed
+
+settings = get_settings()
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered response bodies, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= len(previous)
+            self._entries[key] = body
+            self._size_bytes += len(body)
+            while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class TTLCache:
+    """Thread-safe LRU of small values that also expire `ttl_seconds` after being stored."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every entry but keep the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(settings.response_cache_max_entries, settings.response_cache_max_bytes)
+# Users and their employee records by session user id. Commits in this process clear it at once;
+# other workers see the change when their entries expire.
+identity_cache = TTLCache(settings.identity_cache_max_entries, settings.identity_cache_ttl_seconds)
+on_scope_committed(IDENTITY_SCOPE, identity_cache.invalidate)
+
+
+def cached_json_response(
+    versions: Mapping[str, int],
+    scope: str,
+    key: tuple[Hashable, ...],
+    render: Callable[[], BaseModel],
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Serve `render()` as JSON, reusing the stored body until a commit bumps `scope`'s data version.
+
+    `versions` is read before rendering, so a write that lands mid-render only orphans the entry
+    under the old version instead of serving stale data under the new one.
+    """
+    versioned_key = (*key, scope, data_version(versions, scope))
+    body = response_cache.get(versioned_key) if response_cache.enabled else None
+    if body is None:
+        body = render().model_dump_json().encode("utf-8")
+        response_cache.set(versioned_key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
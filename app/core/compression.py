@@ -0,0 +1,131 @@
+import gzip
+
+import anyio
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preference order when the client accepts several encodings equally.
+SUPPORTED_ENCODINGS = ("br", "gzip")
+# Bodies above this are compressed in a worker thread instead of on the event loop.
+THREADED_COMPRESSION_BYTES = 256 * 1024
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Best supported encoding from an Accept-Encoding header, honouring q-values (q=0 refuses)."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(encoding, wildcard), encoding) for encoding in SUPPORTED_ENCODINGS]
+    best_quality = max(quality for quality, _ in candidates)
+    if best_quality <= 0:
+        return None
+    return next(encoding for quality, encoding in candidates if quality == best_quality)
+
+
+def compress(body: bytes, encoding: str, *, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Strong validators must differ per representation, so the encoding is appended inside the quotes."""
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def strip_encoding_from_etag(etag: str) -> str:
+    for encoding in SUPPORTED_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+class CompressionMiddleware:
+    """Compress complete (non-streamed) responses of the given media types above `minimum_size`.
+
+    Streaming responses and anything that already carries a Content-Encoding (precompressed static
+    assets) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        media_types: tuple[str, ...] = ("application/json",),
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = media_types
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            pending_start, start_message = start_message, None
+            headers = MutableHeaders(raw=pending_start["headers"])
+            body = message.get("body", b"")
+            media_type = headers.get("content-type", "").split(";", 1)[0].strip()
+            if media_type not in self.media_types or "content-encoding" in headers:
+                await send(pending_start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(pending_start)
+                await send(message)
+                return
+
+            if len(body) >= THREADED_COMPRESSION_BYTES:
+                compressed = await anyio.to_thread.run_sync(self._compress, body, encoding)
+            else:
+                compressed = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], encoding)
+            await send(pending_start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        return compress(body, encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality)
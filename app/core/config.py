@@ -1,6 +1,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -31,11 +32,40 @@ class Settings(BaseModel):
     cors_origins: str = Field(default="*")
     session_secret_key: str = Field(default="change-this-secret")
     session_cookie_secure: bool = Field(default=False)
+    session_refresh_seconds: int = Field(default=60 * 60, ge=0)
     google_client_id: str | None = Field(default=None)
     google_client_secret: str | None = Field(default=None)
     google_org_domain: str | None = Field(default=None)
+    oidc_discovery_url: str = Field(default="https://accounts.google.com/.well-known/openid-configuration")
+    oidc_cache_path: str = Field(default="oidc_cache.json")
+    oidc_cache_ttl_seconds: int = Field(default=6 * 60 * 60, ge=60)
     admin_emails: str = Field(default="")
     auth_enabled: bool = Field(default=True)
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist", "memory"] = Field(default="wal")
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = Field(default="normal")
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    sqlite_cache_size_kib: int = Field(default=64 * 1024, ge=0)
+    sqlite_temp_store: Literal["default", "file", "memory"] = Field(default="memory")
+    sqlite_busy_timeout_ms: int = Field(default=30_000, ge=0)
+    db_maintenance_interval_seconds: int = Field(default=3600, ge=0)
+    db_pool_size: int = Field(default=5, ge=1)
+    db_read_pool_size: int = Field(default=10, ge=1)
+    response_cache_max_entries: int = Field(default=1024, ge=0)
+    response_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+    identity_cache_max_entries: int = Field(default=4096, ge=0)
+    identity_cache_ttl_seconds: int = Field(default=30, ge=0)
+    import_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1)
+    compression_minimum_size: int = Field(default=1024, ge=0)
+    metrics_enabled: bool = Field(default=True)
+    metrics_public: bool = Field(default=False)
+    metrics_dir: str = Field(default="")
+    metrics_flush_seconds: float = Field(default=5.0, gt=0)
+    slow_query_ms: int = Field(default=250, ge=0)
+    n_plus_one_threshold: int = Field(default=10, ge=0)
+    enforce_query_budgets: bool = Field(default=False)
+    profile_sample_rate: int = Field(default=0, ge=0)
+    profiles_dir: str = Field(default="profiles")
+    profile_max_reports: int = Field(default=50, ge=1)
 
     @property
     def cors_origin_list(self) -> list[str]:
@@ -59,11 +89,42 @@ class Settings(BaseModel):
             cors_origins=os.getenv("CORS_ORIGINS", "*"),
             session_secret_key=os.getenv("SESSION_SECRET_KEY", "change-this-secret"),
             session_cookie_secure=os.getenv("SESSION_COOKIE_SECURE", "false").lower() in {"1", "true", "yes", "on"},
+            session_refresh_seconds=int(os.getenv("SESSION_REFRESH_SECONDS", "3600")),
             google_client_id=os.getenv("GOOGLE_CLIENT_ID"),
             google_client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
             google_org_domain=os.getenv("GOOGLE_ORG_DOMAIN"),
+            oidc_discovery_url=os.getenv(
+                "OIDC_DISCOVERY_URL", "https://accounts.google.com/.well-known/openid-configuration"
+            ),
+            oidc_cache_path=os.getenv("OIDC_CACHE_PATH", "oidc_cache.json"),
+            oidc_cache_ttl_seconds=int(os.getenv("OIDC_CACHE_TTL_SECONDS", str(6 * 60 * 60))),
             admin_emails=os.getenv("ADMIN_EMAILS", ""),
             auth_enabled=os.getenv("AUTH_ENABLED", "true").lower() in {"1", "true", "yes", "on"},
+            sqlite_journal_mode=os.getenv("SQLITE_JOURNAL_MODE", "wal").lower(),
+            sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", "normal").lower(),
+            sqlite_mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+            sqlite_cache_size_kib=int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024))),
+            sqlite_temp_store=os.getenv("SQLITE_TEMP_STORE", "memory").lower(),
+            sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000")),
+            db_maintenance_interval_seconds=int(os.getenv("DB_MAINTENANCE_INTERVAL_SECONDS", "3600")),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            db_read_pool_size=int(os.getenv("DB_READ_POOL_SIZE", "10")),
+            response_cache_max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+            response_cache_max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            identity_cache_max_entries=int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "4096")),
+            identity_cache_ttl_seconds=int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "30")),
+            import_max_bytes=int(os.getenv("IMPORT_MAX_BYTES", str(64 * 1024 * 1024))),
+            compression_minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024")),
+            metrics_enabled=os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes", "on"},
+            metrics_public=os.getenv("METRICS_PUBLIC", "false").lower() in {"1", "true", "yes", "on"},
+            metrics_dir=os.getenv("METRICS_DIR", ""),
+            metrics_flush_seconds=float(os.getenv("METRICS_FLUSH_SECONDS", "5")),
+            slow_query_ms=int(os.getenv("SLOW_QUERY_MS", "250")),
+            n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "10")),
+            enforce_query_budgets=os.getenv("ENFORCE_QUERY_BUDGETS", "false").lower() in {"1", "true", "yes", "on"},
+            profile_sample_rate=int(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            profiles_dir=os.getenv("PROFILES_DIR", "profiles"),
+            profile_max_reports=int(os.getenv("PROFILE_MAX_REPORTS", "50")),
         )
 
 
@@ -0,0 +1,111 @@
+"""Cross-process data versions: the cheap way for any worker to notice another worker's writes.
+
+Every commit that writes a tracked table increments that table's scope rows in `data_versions`
+within the same transaction. Readers fetch all scopes with one primary-key scan per request and
+key their caches on the result, so no worker ever needs to be told to invalidate.
+"""
+from collections.abc import Callable, Mapping
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models import DataVersion
+
+CAP_TABLE_SCOPE = "cap_table"
+IDENTITY_SCOPE = "identity"
+
+# Tables whose writes change what a cached response would contain, by cache scope.
+TABLE_SCOPES: dict[str, frozenset[str]] = {
+    "users": frozenset({IDENTITY_SCOPE}),
+    "employees": frozenset({CAP_TABLE_SCOPE, IDENTITY_SCOPE}),
+    "grants": frozenset({CAP_TABLE_SCOPE}),
+    "exercises": frozenset({CAP_TABLE_SCOPE}),
+    "exercise_ledger": frozenset({CAP_TABLE_SCOPE}),
+    "pool_state": frozenset({CAP_TABLE_SCOPE}),
+}
+_PENDING_SCOPES_KEY = "data_version_scopes"
+_COMMITTED_SCOPES_KEY = "data_version_committed_scopes"
+_commit_callbacks: dict[str, list[Callable[[], None]]] = {}
+# Dialects with `INSERT ... ON CONFLICT DO UPDATE`; others bump with an UPDATE, then INSERT missing scopes.
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def read_data_versions(db: Session) -> dict[str, int]:
+    return dict(db.execute(select(DataVersion.scope, DataVersion.version)).all())
+
+
+def scope_version_expression(scope: str):
+    """Primary-key lookup of one scope's version, usable as a column in another query."""
+    return select(DataVersion.version).where(DataVersion.scope == scope).scalar_subquery()
+
+
+def read_scope_version(db: Session, scope: str) -> int:
+    return db.scalar(select(scope_version_expression(scope))) or 0
+
+
+def data_version(versions: Mapping[str, int], scope: str) -> int:
+    return versions.get(scope, 0)
+
+
+def on_scope_committed(scope: str, callback: Callable[[], None]) -> None:
+    """Call `callback` in this process after every commit that bumped `scope`."""
+    _commit_callbacks.setdefault(scope, []).append(callback)
+
+
+def _mark_scopes(session: Session, table_name: str | None) -> None:
+    scopes = TABLE_SCOPES.get(table_name or "")
+    if scopes:
+        session.info.setdefault(_PENDING_SCOPES_KEY, set()).update(scopes)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_tables(session: Session, _flush_context, _instances) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _mark_scopes(session, getattr(instance, "__tablename__", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _mark_scopes(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_scopes_in_transaction(session: Session) -> None:
+    # Flush first so pending objects are tracked; commit would otherwise flush after this hook.
+    session.flush()
+    scopes = session.info.pop(_PENDING_SCOPES_KEY, None)
+    if not scopes:
+        return
+    session.info[_COMMITTED_SCOPES_KEY] = scopes
+    upsert_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if upsert_insert is not None:
+        stmt = upsert_insert(DataVersion).values([{"scope": scope, "version": 1} for scope in sorted(scopes)])
+        session.execute(
+            stmt.on_conflict_do_update(index_elements=[DataVersion.scope], set_={"version": DataVersion.version + 1})
+        )
+        return
+    for scope in sorted(scopes):
+        bumped = session.execute(
+            update(DataVersion)
+            .where(DataVersion.scope == scope)
+            .values(version=DataVersion.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if bumped.rowcount == 0:
+            session.execute(insert(DataVersion).values(scope=scope, version=1))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session: Session) -> None:
+    for scope in sorted(session.info.pop(_COMMITTED_SCOPES_KEY, ())):
+        for callback in _commit_callbacks.get(scope, ()):
+            callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_scopes(session: Session) -> None:
+    session.info.pop(_PENDING_SCOPES_KEY, None)
+    session.info.pop(_COMMITTED_SCOPES_KEY, None)
@@ -1,14 +1,22 @@
-from collections.abc import Generator
+from collections import Counter
+from collections.abc import AsyncGenerator, Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
+import logging
 import os
+import time
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
+from sqlalchemy import Connection, create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
+sql_logger = logging.getLogger("app.sql")
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
@@ -41,11 +49,201 @@ class Base(DeclarativeBase):
     pass
 
 
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # Executions per SQL text; the same text run many times in one request usually means N+1.
+    statements: Counter[str] = field(default_factory=Counter)
+    # (statement, milliseconds, parameters) for every execution, only while a request is being profiled.
+    log: list[tuple[str, float, str]] | None = None
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, runs) for statement, runs in self.statements.most_common() if runs >= threshold]
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in this context (and threadpool calls made from it).
+
+    Nested use shares the outer tracker, so several middlewares can read the same figures.
+    """
+    active = current_query_stats.get()
+    if active is not None:
+        yield active
+        return
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def _truncate(value: object, limit: int = 500, max_rows: int = 5) -> str:
+    # executemany batches can hold thousands of rows; only the first few are worth formatting.
+    if isinstance(value, (list, tuple)) and len(value) > max_rows and isinstance(value[0], (list, tuple, dict)):
+        text = f"{repr(value[:max_rows])[:-1]}, ... {len(value)} rows]"
+    else:
+        text = repr(value)
+    return text if len(text) <= limit else f"{text[:limit]}... ({len(text)} chars)"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(_conn, _cursor, statement, parameters, context, executemany) -> None:
+    if context is None:
+        return
+    elapsed = time.perf_counter() - context._query_started_at
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements[statement] += 1
+        if stats.log is not None:
+            stats.log.append((statement, elapsed * 1000, _truncate(parameters)))
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        sql_logger.warning(
+            "Slow query (%.1f ms%s): %s | parameters: %s",
+            elapsed * 1000,
+            ", executemany" if executemany else "",
+            " ".join(statement.split()),
+            _truncate(parameters),
+        )
+
+
+def sqlite_pragmas(profile: Settings, read_only: bool = False) -> list[str]:
+    """Per-connection performance profile; page cache is given in KiB (negative cache_size).
+
+    Read-only connections leave the journal mode alone (it is persisted by the writer) and
+    set `query_only` so a stray write fails instead of taking the database lock.
+    """
+    pragmas = [
+        f"PRAGMA synchronous={profile.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={profile.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={profile.sqlite_mmap_size}",
+        f"PRAGMA cache_size=-{profile.sqlite_cache_size_kib}",
+        f"PRAGMA temp_store={profile.sqlite_temp_store}",
+    ]
+    if read_only:
+        return [*pragmas, "PRAGMA query_only=ON"]
+    return [f"PRAGMA journal_mode={profile.sqlite_journal_mode}", *pragmas]
+
+
+def read_only_database_url(database_url: str) -> str | None:
+    """SQLite URI opening the same file with `mode=ro`; None when a separate reader is not possible."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return str(url.set(database=f"file:{url.database}", query={"mode": "ro", "uri": "true"}))
+
+
+def _apply_sqlite_profile(sqlite_engine: Engine, profile: Settings, read_only: bool) -> None:
+    pragmas = sqlite_pragmas(profile, read_only=read_only)
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _apply_performance_profile(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+        if not read_only:
+            # Let SQLAlchemy issue BEGIN itself (see below) instead of pysqlite's implicit deferred BEGIN.
+            dbapi_connection.isolation_level = None
+
+    if not read_only:
+
+        @event.listens_for(sqlite_engine, "begin")
+        def _begin_immediate(connection: Connection) -> None:
+            if connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT":
+                return
+            # Writers take the write lock up front: a deferred transaction that reads first and
+            # writes later fails with SQLITE_BUSY_SNAPSHOT in WAL mode when another writer commits.
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_database_engine(
+    database_url: str,
+    profile: Settings | None = None,
+    *,
+    read_only: bool = False,
+    pool_size: int | None = None,
+) -> Engine:
+    profile = profile or settings
+    pool_args = {"pool_size": pool_size, "max_overflow": pool_size} if pool_size else {}
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url, pool_pre_ping=True, **pool_args)
+
+    connect_args = {"check_same_thread": False, "timeout": profile.sqlite_busy_timeout_ms / 1000}
+    if make_url(database_url).database in (None, "", ":memory:"):
+        pool_args = {}
+    sqlite_engine = create_engine(database_url, connect_args=connect_args, pool_pre_ping=True, **pool_args)
+    _apply_sqlite_profile(sqlite_engine, profile, read_only)
+    return sqlite_engine
+
+
+def async_database_url(database_url: str) -> str:
+    """The same database through an asyncio driver (aiosqlite for SQLite)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.get_driver_name() != "aiosqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return database_url
+
+
+def create_async_database_engine(
+    database_url: str,
+    profile: Settings | None = None,
+    *,
+    pool_size: int | None = None,
+) -> AsyncEngine:
+    """Writer engine for `async def` routes: queries run on the driver's thread, never on the event loop.
+
+    SQLite connections get the same pragmas and `BEGIN IMMEDIATE` as the sync writer.
+    """
+    profile = profile or settings
+    database_url = async_database_url(database_url)
+    pool_args = {"pool_size": pool_size, "max_overflow": pool_size} if pool_size else {}
+    if make_url(database_url).get_backend_name() != "sqlite":
+        return create_async_engine(database_url, pool_pre_ping=True, **pool_args)
+
+    if make_url(database_url).database in (None, "", ":memory:"):
+        pool_args = {}
+    sqlite_engine = create_async_engine(
+        database_url,
+        connect_args={"timeout": profile.sqlite_busy_timeout_ms / 1000},
+        pool_pre_ping=True,
+        **pool_args,
+    )
+    _apply_sqlite_profile(sqlite_engine.sync_engine, profile, read_only=False)
+    return sqlite_engine
+
+
 resolved_database_url = _resolve_database_url(settings.database_url)
-connect_args = {"check_same_thread": False, "timeout": 30} if resolved_database_url.startswith("sqlite") else {}
-engine = create_engine(resolved_database_url, connect_args=connect_args, pool_pre_ping=True)
+engine = create_database_engine(resolved_database_url, pool_size=settings.db_pool_size)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
+_read_database_url = read_only_database_url(resolved_database_url)
+read_engine = (
+    create_database_engine(_read_database_url, read_only=True, pool_size=settings.db_read_pool_size)
+    if _read_database_url
+    else engine
+)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, class_=Session)
+
+async_engine = create_async_database_engine(resolved_database_url, pool_size=settings.db_pool_size)
+# Objects stay usable after commit: reloading expired attributes would need another await.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -55,7 +253,53 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def init_db() -> None:
+def get_read_db() -> Generator[Session, None, None]:
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _add_missing_columns(connection: Connection) -> set[str]:
+    """Additive schema upgrade for tables created by an older release (create_all never alters tables)."""
+    inspector = inspect(connection)
+    quote = connection.dialect.identifier_preparer.quote
+    ddl_compiler = connection.dialect.ddl_compiler(connection.dialect, None)
+    added: set[str] = set()
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            ddl = f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+            if column.server_default is not None:
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                ddl += f" DEFAULT {ddl_compiler.get_column_default_string(column)}"
+            connection.exec_driver_sql(ddl)
+            added.add(f"{table.name}.{column.name}")
+    return added
+
+
+def init_db(bind: Engine | None = None) -> set[str]:
+    """Create missing tables and columns (in the app database unless `bind` is given).
+
+    Returns the names of added tables and `table.column`s.
+    """
     from app import models  # noqa: F401
 
-    Base.metadata.create_all(bind=engine)
+    with (bind or engine).begin() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
+        schema_changes = _add_missing_columns(connection)
+        Base.metadata.create_all(bind=connection)
+    schema_changes.update(table.name for table in Base.metadata.sorted_tables if table.name not in existing_tables)
+    return schema_changes
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.core.database import engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class DatabaseMaintenance:
+    """Periodically refreshes SQLite planner statistics and checkpoints the WAL in a worker thread."""
+
+    def __init__(self, engine: Engine, interval_seconds: int):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.enabled = interval_seconds > 0 and engine.dialect.name == "sqlite"
+        self._task: asyncio.Task | None = None
+        self._status: dict[str, Any] = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_error": None,
+            "last_checkpoint": None,
+        }
+
+    def run_once(self) -> None:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                has_statistics = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+                ).first()
+                connection.execute(text("PRAGMA optimize" if has_statistics else "ANALYZE"))
+                checkpoint = None
+                if connection.execute(text("PRAGMA journal_mode")).scalar() == "wal":
+                    busy, log_frames, checkpointed = connection.execute(text("PRAGMA wal_checkpoint(PASSIVE)")).one()
+                    checkpoint = {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+        except Exception as exc:  # noqa: BLE001 - surfaced on /health, retried next interval
+            logger.exception("Database maintenance run failed")
+            self._status["last_error"] = str(exc)
+        else:
+            self._status["last_error"] = None
+            self._status["last_checkpoint"] = checkpoint
+        finally:
+            self._status["runs"] += 1
+            self._status["last_run_at"] = datetime.now(timezone.utc).isoformat()
+            self._status["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.to_thread(self.run_once)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run_forever(), name="database-maintenance")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            **self._status,
+        }
+
+
+database_maintenance = DatabaseMaintenance(engine, settings.db_maintenance_interval_seconds)
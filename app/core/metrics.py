@@ -0,0 +1,272 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.database import QueryStats, track_queries
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+# Any other method is client-chosen text; labelling with it would grow a new series per request.
+STANDARD_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+OTHER_METHOD = "OTHER"
+
+COUNTERS = {"http_requests_total": "Requests by method, route template and status code."}
+GAUGES = {"http_requests_in_flight": "Requests currently being served."}
+HISTOGRAMS: dict[str, tuple[str, tuple[float, ...]]] = {
+    "http_request_duration_seconds": ("Time from request start to the last response byte.", LATENCY_BUCKETS),
+    "http_response_size_bytes": ("Response body bytes as sent (after compression).", SIZE_BUCKETS),
+    "http_request_db_queries": ("SQL statements executed per request.", QUERY_COUNT_BUCKETS),
+    "http_request_db_seconds": ("Time spent executing SQL per request.", LATENCY_BUCKETS),
+}
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class RequestMetrics:
+    """Per-process request metrics, merged with sibling workers' snapshot files when scraped.
+
+    Each worker writes its totals to `<directory>/<pid>.json` every `flush_interval_seconds`, so a
+    scrape answered by any worker reports all of them (others' figures are up to one interval old).
+    Snapshots of exited workers are deleted when found, so a recycled worker's counts leave the
+    totals (Prometheus treats the drop as a counter reset) instead of lingering beside its successor.
+    """
+
+    def __init__(self, directory: Path | None, flush_interval_seconds: float = 5.0):
+        self.directory = directory
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters: dict[str, dict[str, float]] = {name: {} for name in COUNTERS}
+            self._gauges: dict[str, dict[str, float]] = {name: {"": 0} for name in GAUGES}
+            self._histograms: dict[str, dict[str, dict[str, Any]]] = {name: {} for name in HISTOGRAMS}
+
+    def _observe(self, name: str, labels: str, value: float) -> None:
+        series = self._histograms[name].get(labels)
+        if series is None:
+            buckets = HISTOGRAMS[name][1]
+            series = self._histograms[name][labels] = {"buckets": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+        series["buckets"][bisect_left(HISTOGRAMS[name][1], value)] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def add_in_flight(self, delta: int) -> None:
+        with self._lock:
+            self._gauges["http_requests_in_flight"][""] += delta
+
+    def observe_request(
+        self, method: str, route: str, status: int, duration: float, response_bytes: int, queries: QueryStats
+    ) -> None:
+        route_labels = _labels(method=method, route=route)
+        with self._lock:
+            counter = self._counters["http_requests_total"]
+            status_labels = _labels(method=method, route=route, status=str(status))
+            counter[status_labels] = counter.get(status_labels, 0) + 1
+            self._observe("http_request_duration_seconds", route_labels, duration)
+            self._observe("http_response_size_bytes", route_labels, response_bytes)
+            self._observe("http_request_db_queries", route_labels, queries.count)
+            self._observe("http_request_db_seconds", route_labels, queries.seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return json.loads(
+                json.dumps({"counters": self._counters, "gauges": self._gauges, "histograms": self._histograms})
+            )
+
+    def _snapshot_path(self, pid: int) -> Path:
+        return self.directory / f"{pid}.json"
+
+    def flush(self) -> None:
+        if self.directory is None:
+            return
+        snapshot = self.snapshot()
+        path = self._snapshot_path(os.getpid())
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Could not write metrics snapshot %s", path, exc_info=True)
+
+    def _sibling_snapshots(self) -> list[dict[str, Any]]:
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            if not path.stem.isdigit() or int(path.stem) == os.getpid():
+                continue
+            if not _process_alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self) -> dict[str, Any]:
+        """This worker's live figures summed with the last snapshot of every live sibling."""
+        merged = self.snapshot()
+        for snapshot in self._sibling_snapshots():
+            for kind in ("counters", "gauges"):
+                for name, series in snapshot.get(kind, {}).items():
+                    target = merged[kind].setdefault(name, {})
+                    for labels, value in series.items():
+                        target[labels] = target.get(labels, 0) + value
+            for name, series in snapshot.get("histograms", {}).items():
+                if name not in HISTOGRAMS:
+                    continue
+                target = merged["histograms"].setdefault(name, {})
+                for labels, histogram in series.items():
+                    current = target.setdefault(
+                        labels, {"buckets": [0] * len(histogram["buckets"]), "sum": 0.0, "count": 0}
+                    )
+                    current["buckets"] = [a + b for a, b in zip(current["buckets"], histogram["buckets"])]
+                    current["sum"] += histogram["sum"]
+                    current["count"] += histogram["count"]
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        collected = self.collect()
+        lines: list[str] = []
+        for name, help_text in COUNTERS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for labels, value in sorted(collected["counters"].get(name, {}).items()):
+                lines.append(f"{name}{{{labels}}} {_format_value(value)}")
+        for name, help_text in GAUGES.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in sorted(collected["gauges"].get(name, {}).items()):
+                lines.append(f"{name}{{{labels}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}")
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for labels, histogram in sorted(collected["histograms"].get(name, {}).items()):
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), histogram["buckets"]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _format_value(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {_format_value(histogram['sum'])}")
+                lines.append(f"{name}_count{{{labels}}} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await asyncio.to_thread(self.flush)
+
+    def remove_stale_snapshots(self) -> None:
+        """Delete snapshots of workers that are gone, e.g. from an earlier run that shared the directory."""
+        if self.directory is None or not self.directory.is_dir():
+            return
+        for path in self.directory.glob("*.json"):
+            if path.stem.isdigit() and int(path.stem) != os.getpid() and not _process_alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+
+    def start(self) -> None:
+        if self.directory is not None and self._task is None:
+            self.remove_stale_snapshots()
+            self.flush()
+            self._task = asyncio.create_task(self._flush_forever(), name="metrics-flush")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.flush()
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and counts its SQL statements, labelled by the matched route template."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.metrics = metrics
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.add_in_flight(1)
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_metrics)
+            finally:
+                self.metrics.add_in_flight(-1)
+                route = scope.get("route")
+                method = scope["method"] if scope["method"] in STANDARD_METHODS else OTHER_METHOD
+                self.metrics.observe_request(
+                    method,
+                    getattr(route, "path", UNMATCHED_ROUTE),
+                    status,
+                    time.perf_counter() - started,
+                    response_bytes,
+                    queries,
+                )
+
+
+def _metrics_directory(raw_path: str) -> Path | None:
+    """Workers started by one uvicorn/gunicorn supervisor share a parent pid, hence a default directory."""
+    if raw_path.strip().lower() == "off":
+        return None
+    if raw_path.strip():
+        return Path(raw_path)
+    return Path(tempfile.gettempdir()) / f"esop-metrics-{os.getppid()}"
+
+
+request_metrics = RequestMetrics(_metrics_directory(settings.metrics_dir), settings.metrics_flush_seconds)
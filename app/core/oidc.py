@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Retry delay after a failed refresh while a (stale) copy is still being served.
+RETRY_SECONDS = 60
+
+
+class OIDCProviderCache:
+    """OpenID Connect discovery document plus its JWKS, held in memory and mirrored to a JSON file.
+
+    A worker starts from the file when it is present, and a background task re-fetches at half the
+    TTL, so logins read the metadata from memory instead of waiting on the provider. Expired
+    metadata keeps being served while a refresh runs; only a cold start with no file fetches inline.
+    """
+
+    def __init__(
+        self,
+        discovery_url: str,
+        cache_path: Path | None,
+        ttl_seconds: int,
+        *,
+        timeout_seconds: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.discovery_url = discovery_url
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self.transport = transport
+        self._metadata: dict[str, Any] | None = None
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._status: dict[str, Any] = {"refreshes": 0, "loaded_from_disk": False, "last_error": None}
+
+    @property
+    def fetched_at(self) -> float | None:
+        """When the served metadata was fetched; changes whenever a refresh or cache file replaces it."""
+        return self._fetched_at
+
+    @property
+    def expired(self) -> bool:
+        return self._fetched_at is None or time.time() - self._fetched_at >= self.ttl_seconds
+
+    def load_from_disk(self) -> bool:
+        """Adopt the cached file if it belongs to the configured provider; any age is accepted."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        try:
+            cached = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable OIDC cache file %s", self.cache_path)
+            return False
+        if not isinstance(cached, dict) or cached.get("discovery_url") != self.discovery_url:
+            return False
+        metadata, fetched_at = cached.get("metadata"), cached.get("fetched_at")
+        if not isinstance(metadata, dict) or "jwks" not in metadata or not isinstance(fetched_at, (int, float)):
+            return False
+        self._metadata, self._fetched_at = metadata, float(fetched_at)
+        self._status["loaded_from_disk"] = True
+        return True
+
+    def _write_to_disk(self, metadata: dict[str, Any], fetched_at: float) -> None:
+        if self.cache_path is None:
+            return
+        payload = {"discovery_url": self.discovery_url, "fetched_at": fetched_at, "metadata": metadata}
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            logger.warning("Could not write OIDC cache file %s", self.cache_path, exc_info=True)
+
+    async def refresh(self) -> dict[str, Any]:
+        async with httpx.AsyncClient(timeout=self.timeout_seconds, transport=self.transport) as client:
+            response = await client.get(self.discovery_url)
+            response.raise_for_status()
+            metadata = response.json()
+            jwks_response = await client.get(metadata["jwks_uri"])
+            jwks_response.raise_for_status()
+            metadata["jwks"] = jwks_response.json()
+
+        fetched_at = time.time()
+        self._metadata, self._fetched_at = metadata, fetched_at
+        self._status["refreshes"] += 1
+        self._status["last_error"] = None
+        await asyncio.to_thread(self._write_to_disk, metadata, fetched_at)
+        return metadata
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, KeyError, ValueError) as exc:
+            logger.warning("OIDC metadata refresh failed: %s", exc)
+            self._status["last_error"] = str(exc)
+        except Exception as exc:
+            # Anything else (a malformed document, a bug) must not end the refresh loop either.
+            logger.exception("OIDC metadata refresh failed unexpectedly")
+            self._status["last_error"] = repr(exc)
+
+    async def get(self) -> dict[str, Any]:
+        """Provider metadata with a `jwks` entry; waits on the network only when nothing is cached."""
+        if self._metadata is None:
+            async with self._lock:
+                if self._metadata is None and not self.load_from_disk():
+                    return await self.refresh()
+        if self.expired and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_logged(), name="oidc-refresh")
+        return self._metadata
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            if self._fetched_at is None or time.time() - self._fetched_at >= self.ttl_seconds / 2:
+                await self._refresh_logged()
+            if self._status["last_error"] is not None:
+                delay = RETRY_SECONDS
+            else:
+                delay = max(self._fetched_at + self.ttl_seconds / 2 - time.time(), 1)
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self.load_from_disk()
+            self._task = asyncio.create_task(self._refresh_forever(), name="oidc-metadata-refresh")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refresh_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = self._refresh_task = None
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "discovery_url": self.discovery_url,
+            "running": self._task is not None and not self._task.done(),
+            "fetched_at": self._fetched_at,
+            "expired": self.expired,
+            **self._status,
+        }
+
+
+def _cache_path(raw_path: str) -> Path | None:
+    if not raw_path.strip():
+        return None
+    path = Path(raw_path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+oidc_provider = OIDCProviderCache(
+    settings.oidc_discovery_url, _cache_path(settings.oidc_cache_path), settings.oidc_cache_ttl_seconds
+)
@@ -0,0 +1,204 @@
+import itertools
+import json
+import os
+import re
+import secrets
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import yappi
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Call-tree branches below this share of the request's wall time are folded away.
+CALL_TREE_MIN_SHARE = 0.005
+CALL_TREE_MAX_DEPTH = 40
+TOP_FUNCTIONS = 50
+MAX_SQL_STATEMENTS = 1000
+_REPORT_ID = re.compile(r"^[0-9A-Za-z-]+$")
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Tag of the profile the current request belongs to; threadpool calls inherit it with the context.
+profile_tag: ContextVar[int] = ContextVar("profile_tag", default=0)
+
+
+def _function_label(stat: Any) -> str:
+    module = stat.module.removeprefix(f"{PROJECT_ROOT}{os.sep}")
+    _, site_packages, package_path = module.rpartition("site-packages" + os.sep)
+    return f"{package_path if site_packages else module}:{stat.lineno}({stat.name})"
+
+
+def _call_tree(stats: Any, total_seconds: float) -> list[dict[str, Any]]:
+    by_index = {stat.index: stat for stat in stats}
+    called = {child.index for stat in stats for child in stat.children}
+    min_seconds = total_seconds * CALL_TREE_MIN_SHARE
+
+    def node(stat: Any, calls: int, seconds: float, path: frozenset[int]) -> dict[str, Any]:
+        children = []
+        if len(path) < CALL_TREE_MAX_DEPTH:
+            for child in sorted(stat.children, key=lambda child: child.ttot, reverse=True):
+                if child.ttot < min_seconds or child.index in path or child.index not in by_index:
+                    continue
+                children.append(node(by_index[child.index], child.ncall, child.ttot, path | {child.index}))
+        return {
+            "function": _function_label(stat),
+            "calls": calls,
+            "total_ms": round(seconds * 1000, 3),
+            "children": children,
+        }
+
+    roots = [stat for stat in stats if stat.index not in called and stat.ttot >= min_seconds]
+    return [node(stat, stat.ncall, stat.ttot, frozenset({stat.index})) for stat in sorted(roots, key=lambda s: -s.ttot)]
+
+
+class RequestProfiler:
+    """Wall-clock yappi profiling of individual requests, including their threadpool work.
+
+    yappi runs process-wide while at least one profiled request is in flight; each request's calls
+    are separated by a context-variable tag, so concurrent unprofiled requests are not recorded.
+    yappi cannot drop one tag's stats, so they are cleared when the last profile ends. Sampled
+    profiles only start while no other profile runs, so steady sampled traffic cannot keep the
+    profiler, and its stats, alive indefinitely.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._counter = itertools.count(1)
+        self._tags = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def should_sample(self) -> bool:
+        """True for every `sample_rate`-th request handled by this worker (never when 0)."""
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    def begin(self, *, exclusive: bool = False) -> int | None:
+        """Start profiling under a new tag; with `exclusive`, returns None if another profile is running."""
+        with self._lock:
+            if exclusive and self._active:
+                return None
+            if self._active == 0:
+                yappi.set_clock_type("wall")
+                yappi.set_tag_callback(profile_tag.get)
+                yappi.start(builtins=False, profile_threads=True)
+            self._active += 1
+        return next(self._tags)
+
+    def end(self, tag: int) -> Any:
+        """Stats recorded under `tag`; the global profiler stops with the last active request."""
+        stats = yappi.get_func_stats(filter={"tag": tag})
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                yappi.stop()
+                yappi.clear_stats()
+        return stats
+
+
+def build_report(
+    stats: Any,
+    *,
+    request_info: dict[str, Any],
+    duration_seconds: float,
+    sql_log: list[tuple[str, float, str]],
+) -> dict[str, Any]:
+    functions = sorted(stats, key=lambda stat: stat.tsub, reverse=True)[:TOP_FUNCTIONS]
+    return {
+        **request_info,
+        "duration_ms": round(duration_seconds * 1000, 3),
+        "sql": {
+            "count": len(sql_log),
+            "total_ms": round(sum(ms for _, ms, _ in sql_log), 3),
+            "statements": [
+                {"statement": " ".join(statement.split()), "ms": round(ms, 3), "parameters": parameters}
+                for statement, ms, parameters in sql_log[:MAX_SQL_STATEMENTS]
+            ],
+        },
+        "functions": [
+            {
+                "function": _function_label(stat),
+                "calls": stat.ncall,
+                "own_ms": round(stat.tsub * 1000, 3),
+                "total_ms": round(stat.ttot * 1000, 3),
+            }
+            for stat in functions
+        ],
+        "call_tree": _call_tree(stats, duration_seconds),
+    }
+
+
+class ProfileStore:
+    """Most recent reports as `<id>.json` plus a pstats dump `<id>.prof`, shared by all workers."""
+
+    def __init__(self, directory: Path, max_reports: int):
+        self.directory = directory
+        self.max_reports = max_reports
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(3)}"
+
+    def _path(self, report_id: str, suffix: str) -> Path | None:
+        if not _REPORT_ID.match(report_id):
+            return None
+        return self.directory / f"{report_id}{suffix}"
+
+    def save(self, report: dict[str, Any], stats: Any) -> None:
+        # Reports hold bound SQL parameters and the requester's email: readable by the app user only.
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.directory.chmod(0o700)
+        report_path = self._path(report["id"], ".json")
+        tmp_path = report_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(report), encoding="utf-8")
+        stats.save(str(self._path(report["id"], ".prof")), type="pstat")
+        os.replace(tmp_path, report_path)
+        for stale in sorted(self.directory.glob("*.json"), reverse=True)[self.max_reports :]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".prof").unlink(missing_ok=True)
+
+    def list(self) -> list[dict[str, Any]]:
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True) if self.directory.is_dir() else []:
+            try:
+                report = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            summaries.append(
+                {
+                    "id": report["id"],
+                    "created_at": report["created_at"],
+                    "method": report["method"],
+                    "path": report["path"],
+                    "route": report.get("route"),
+                    "duration_ms": report["duration_ms"],
+                    "sql_count": report["sql"]["count"],
+                    "sql_ms": report["sql"]["total_ms"],
+                    "sampled": report["sampled"],
+                    "requested_by": report.get("requested_by"),
+                }
+            )
+        return summaries
+
+    def load(self, report_id: str) -> dict[str, Any] | None:
+        path = self._path(report_id, ".json")
+        if path is None or not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def pstats_path(self, report_id: str) -> Path | None:
+        path = self._path(report_id, ".prof")
+        return path if path is not None and path.exists() else None
+
+
+def _profiles_directory(raw_path: str) -> Path:
+    path = Path(raw_path.strip() or "profiles")
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+request_profiler = RequestProfiler(settings.profile_sample_rate)
+profile_store = ProfileStore(_profiles_directory(settings.profiles_dir), settings.profile_max_reports)
@@ -1,15 +1,24 @@
 import base64
+import binascii
+import copy
 import hashlib
 import hmac
 import json
-from datetime import datetime, timedelta, timezone
-from http.cookies import SimpleCookie
+import time
+from email.utils import formatdate
 from typing import Any
 
-from starlette.datastructures import MutableHeaders
+ISSUED_AT_KEY = "_iat"
 
 
 class SignedSessionMiddleware:
+    """HMAC-signed JSON session cookie.
+
+    The cookie is only re-sent when the session changed, was cleared, or was issued more than
+    `refresh_after` seconds ago (which slides its expiry forward); unchanged sessions cost one
+    header scan, one HMAC and one JSON decode per request.
+    """
+
     def __init__(
         self,
         app,
@@ -18,6 +27,7 @@ class SignedSessionMiddleware:
         max_age: int = 60 * 60 * 12,
         https_only: bool = False,
         same_site: str = "lax",
+        refresh_after: int = 60 * 60,
     ):
         self.app = app
         self.secret_key = secret_key.encode("utf-8")
@@ -25,92 +35,87 @@ class SignedSessionMiddleware:
         self.max_age = max_age
         self.https_only = https_only
         self.same_site = same_site
-
-    def _sign(self, payload: str) -> str:
-        digest = hmac.new(self.secret_key, payload.encode("utf-8"), hashlib.sha256).hexdigest()
-        return digest
-
-    def _encode(self, data: dict[str, Any]) -> str:
-        payload = json.dumps(data, separators=(",", ":"), sort_keys=True)
-        payload_b64 = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8")
-        signature = self._sign(payload_b64)
-        return f"{payload_b64}.{signature}"
-
-    def _decode(self, raw: str | None) -> dict[str, Any]:
-        if not raw or "." not in raw:
-            return {}
-
-        payload_b64, signature = raw.rsplit(".", 1)
-        expected_signature = self._sign(payload_b64)
-        if not hmac.compare_digest(signature, expected_signature):
-            return {}
+        self.refresh_after = refresh_after
+        self._cookie_prefix = cookie_name.encode("latin-1") + b"="
+        attributes = f"; Path=/; Max-Age={max_age}; HttpOnly; SameSite={same_site}"
+        if https_only:
+            attributes += "; Secure"
+        self._cookie_attributes = attributes.encode("latin-1")
+        self._delete_cookie_header = (
+            self._cookie_prefix
+            + b'""; Path=/; Max-Age=0; Expires=Thu, 01 Jan 1970 00:00:00 GMT; HttpOnly; SameSite='
+            + same_site.encode("latin-1")
+            + (b"; Secure" if https_only else b"")
+        )
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self.secret_key, payload, hashlib.sha256).hexdigest().encode("ascii")
+
+    def _encode(self, data: dict[str, Any], issued_at: int) -> bytes:
+        payload = json.dumps({**data, ISSUED_AT_KEY: issued_at}, separators=(",", ":"), sort_keys=True)
+        payload_b64 = base64.urlsafe_b64encode(payload.encode("utf-8"))
+        return payload_b64 + b"." + self._sign(payload_b64)
+
+    def _decode(self, raw: bytes | None) -> tuple[dict[str, Any], int | None]:
+        """Session data and its issue time; tampered, malformed or expired cookies give an empty session."""
+        if not raw:
+            return {}, None
+        payload_b64, separator, signature = raw.rpartition(b".")
+        if not separator or not hmac.compare_digest(signature, self._sign(payload_b64)):
+            return {}, None
 
         try:
-            payload = base64.urlsafe_b64decode(payload_b64.encode("utf-8")).decode("utf-8")
-            data = json.loads(payload)
-            if isinstance(data, dict):
-                return data
-        except Exception:
-            return {}
-
-        return {}
-
-    def _read_cookie(self, scope) -> dict[str, Any]:
-        headers = dict(scope.get("headers") or [])
-        cookie_header = headers.get(b"cookie", b"").decode("latin-1")
-        cookie = SimpleCookie()
-        cookie.load(cookie_header)
-        morsel = cookie.get(self.cookie_name)
-        if morsel is None:
-            return {}
-        return self._decode(morsel.value)
-
-    def _set_cookie(self, headers: MutableHeaders, value: str) -> None:
-        cookie = SimpleCookie()
-        cookie[self.cookie_name] = value
-        cookie[self.cookie_name]["path"] = "/"
-        cookie[self.cookie_name]["max-age"] = str(self.max_age)
-        cookie[self.cookie_name]["httponly"] = True
-        cookie[self.cookie_name]["samesite"] = self.same_site
-        if self.https_only:
-            cookie[self.cookie_name]["secure"] = True
-
-        expires = datetime.now(timezone.utc) + timedelta(seconds=self.max_age)
-        cookie[self.cookie_name]["expires"] = expires.strftime("%a, %d %b %Y %H:%M:%S GMT")
-
-        headers.append("set-cookie", cookie.output(header="").strip())
-
-    def _delete_cookie(self, headers: MutableHeaders) -> None:
-        cookie = SimpleCookie()
-        cookie[self.cookie_name] = ""
-        cookie[self.cookie_name]["path"] = "/"
-        cookie[self.cookie_name]["max-age"] = "0"
-        cookie[self.cookie_name]["expires"] = "Thu, 01 Jan 1970 00:00:00 GMT"
-        cookie[self.cookie_name]["httponly"] = True
-        cookie[self.cookie_name]["samesite"] = self.same_site
-        if self.https_only:
-            cookie[self.cookie_name]["secure"] = True
-
-        headers.append("set-cookie", cookie.output(header="").strip())
+            data = json.loads(base64.urlsafe_b64decode(payload_b64))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return {}, None
+        if not isinstance(data, dict):
+            return {}, None
+
+        issued_at = data.pop(ISSUED_AT_KEY, None)
+        if not isinstance(issued_at, int):
+            issued_at = None
+        elif time.time() - issued_at > self.max_age:
+            return {}, None
+        return data, issued_at
+
+    def _read_cookie(self, scope) -> bytes | None:
+        """Find our cookie by scanning the raw header pairs; no header dict or cookie jar is built."""
+        for name, value in scope.get("headers") or ():
+            if name != b"cookie":
+                continue
+            for part in value.split(b";"):
+                part = part.strip()
+                if part.startswith(self._cookie_prefix):
+                    return part[len(self._cookie_prefix) :].strip(b'"')
+        return None
+
+    def _set_cookie_header(self, value: bytes, issued_at: int) -> bytes:
+        expires = formatdate(issued_at + self.max_age, usegmt=True).encode("ascii")
+        return self._cookie_prefix + value + self._cookie_attributes + b"; Expires=" + expires
 
     async def __call__(self, scope, receive, send):
         if scope["type"] not in {"http", "websocket"}:
             await self.app(scope, receive, send)
             return
 
-        initial_session = self._read_cookie(scope)
-        scope["session"] = initial_session.copy()
+        initial_session, issued_at = self._decode(self._read_cookie(scope))
+        # Deep copy so in-place edits of nested values still register as a change.
+        scope["session"] = copy.deepcopy(initial_session) if initial_session else {}
 
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
-                headers = MutableHeaders(scope=message)
                 current_session = scope.get("session") or {}
-
+                cookie_header = None
                 if current_session:
-                    encoded = self._encode(current_session)
-                    self._set_cookie(headers, encoded)
+                    now = int(time.time())
+                    stale = issued_at is None or now - issued_at >= self.refresh_after
+                    if stale or current_session != initial_session:
+                        cookie_header = self._set_cookie_header(self._encode(current_session, now), now)
                 elif initial_session:
-                    self._delete_cookie(headers)
+                    cookie_header = self._delete_cookie_header
+
+                if cookie_header is not None:
+                    message["headers"] = [*message.get("headers", ()), (b"set-cookie", cookie_header)]
 
             await send(message)
 
@@ -0,0 +1,105 @@
+import hashlib
+import mimetypes
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from fastapi import Response
+
+from app.core.compression import SUPPORTED_ENCODINGS, choose_encoding, compress, encoded_etag, strip_encoding_from_etag
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+INDEX_NAME = "index.html"
+TEXT_MEDIA_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    content: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def response(self, request_headers: Mapping[str, str]) -> Response:
+        encoding = choose_encoding(request_headers.get("accept-encoding", "")) if self.encoded else None
+        if_none_match = request_headers.get("if-none-match")
+        etag = encoded_etag(self.etag, encoding) if encoding else self.etag
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if self.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if if_none_match and any(
+            strip_encoding_from_etag(candidate.strip()) == self.etag for candidate in if_none_match.split(",")
+        ):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(content=self.encoded[encoding], media_type=self.media_type, headers=headers)
+        return Response(content=self.content, media_type=self.media_type, headers=headers)
+
+
+def _fingerprinted_name(name: str, digest: str) -> str:
+    path = Path(name)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}"))
+
+
+class StaticAssetManifest:
+    """Static files loaded once at startup, precompressed and published under content-hashed names.
+
+    `index.html` is rewritten to reference the hashed URLs, which are served as immutable; the
+    index itself and the original names stay revalidated so deploys take effect immediately.
+    """
+
+    def __init__(self, directory: Path, url_prefix: str = "/static", minimum_size: int = 1024):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.minimum_size = minimum_size
+        self.assets: dict[str, StaticAsset] = {}
+        self.hashed_names: dict[str, str] = {}
+        self.index: StaticAsset | None = None
+
+    def _asset(self, content: bytes, media_type: str, cache_control: str) -> StaticAsset:
+        digest = hashlib.sha256(content).hexdigest()
+        compressible = media_type.startswith(TEXT_MEDIA_TYPES) and len(content) >= self.minimum_size
+        encoded = {}
+        if compressible:
+            encoded = {
+                encoding: compress(content, encoding, gzip_level=9, brotli_quality=11)
+                for encoding in SUPPORTED_ENCODINGS
+            }
+        return StaticAsset(
+            content=content,
+            media_type=media_type,
+            etag=f'"{digest[:32]}"',
+            cache_control=cache_control,
+            encoded=encoded,
+        )
+
+    def load(self) -> None:
+        assets: dict[str, StaticAsset] = {}
+        hashed_names: dict[str, str] = {}
+        for path in sorted(self.directory.rglob("*")):
+            name = path.relative_to(self.directory).as_posix()
+            if not path.is_file() or name == INDEX_NAME:
+                continue
+            content = path.read_bytes()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            hashed_name = _fingerprinted_name(name, hashlib.sha256(content).hexdigest()[:12])
+            asset = self._asset(content, media_type, REVALIDATE_CACHE_CONTROL)
+            assets[name] = asset
+            assets[hashed_name] = replace(asset, cache_control=IMMUTABLE_CACHE_CONTROL)
+            hashed_names[name] = hashed_name
+
+        index_path = self.directory / INDEX_NAME
+        index = None
+        if index_path.exists():
+            html = index_path.read_text(encoding="utf-8")
+            for name, hashed_name in hashed_names.items():
+                html = html.replace(f"{self.url_prefix}/{name}", f"{self.url_prefix}/{hashed_name}")
+            index = self._asset(html.encode("utf-8"), "text/html; charset=utf-8", REVALIDATE_CACHE_CONTROL)
+
+        self.assets, self.hashed_names, self.index = assets, hashed_names, index
+
+    def url_for(self, name: str) -> str:
+        return f"{self.url_prefix}/{self.hashed_names.get(name, name)}"
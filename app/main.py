@@ -1,19 +1,35 @@
 from pathlib import Path
 from contextlib import asynccontextmanager
+from typing import Any
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
+from app.api.deps import get_current_user_optional
+from app.api.etag import NotModified, not_modified_handler
+from app.api.profiling import profile_request
+from app.api.query_budget import QueryBudgetMiddleware
 from app.api.routes.auth import router as auth_router
 from app.api.routes.dashboard import router as dashboard_router
 from app.api.routes.employees import router as employees_router
+from app.api.routes.exports import router as exports_router
 from app.api.routes.grants import router as grants_router
+from app.api.routes.imports import router as imports_router
+from app.api.routes.profiles import router as profiles_router
+from app.core.cache import identity_cache, response_cache
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
-from app.core.database import init_db
+from app.core.database import SessionLocal, async_engine, init_db
 from app.core.logging import configure_logging
+from app.core.maintenance import database_maintenance
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, request_metrics
+from app.core.oidc import oidc_provider
 from app.core.session import SignedSessionMiddleware
+from app.core.static_assets import StaticAssetManifest
+from app.models import User, UserRole
+from app.services.exercises import backfill_after_schema_changes
+from app.services.pool import ensure_pool_state
 
 settings = get_settings()
 configure_logging(settings.debug)
@@ -23,11 +39,26 @@ configure_logging(settings.debug)
 async def lifespan(_: FastAPI):
     if settings.environment.lower() == "production" and settings.session_secret_key == "change-this-secret":
         raise RuntimeError("SESSION_SECRET_KEY must be set in production")
-    init_db()
+    schema_changes = init_db()
+    with SessionLocal() as db:
+        backfill_after_schema_changes(db, schema_changes)
+        ensure_pool_state(db, settings.esop_pool_size)
+        db.commit()
+    static_assets.load()
+    database_maintenance.start()
+    if settings.metrics_enabled:
+        request_metrics.start()
+    if settings.auth_enabled and settings.google_client_id:
+        oidc_provider.start()
     yield
+    await oidc_provider.stop()
+    await request_metrics.stop()
+    await database_maintenance.stop()
+    await async_engine.dispose()
 
 
 app = FastAPI(title=settings.app_name, version="1.0.0", lifespan=lifespan)
+app.add_exception_handler(NotModified, not_modified_handler)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,22 +73,68 @@ app.add_middleware(
     same_site="lax",
     https_only=settings.session_cookie_secure,
     max_age=60 * 60 * 12,
+    refresh_after=settings.session_refresh_seconds,
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+app.add_middleware(QueryBudgetMiddleware)
+if settings.metrics_enabled:
+    # Outermost, so timings and sizes cover every other middleware and the compressed body.
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
 
-app.include_router(auth_router)
-app.include_router(employees_router)
-app.include_router(grants_router)
-app.include_router(dashboard_router)
+# Every API route can be profiled on demand by an admin, or by sampling.
+for api_router in (
+    auth_router,
+    employees_router,
+    grants_router,
+    dashboard_router,
+    imports_router,
+    exports_router,
+    profiles_router,
+):
+    app.include_router(api_router, dependencies=[Depends(profile_request)])
 
 STATIC_DIR = Path(__file__).parent / "static"
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+static_assets = StaticAssetManifest(STATIC_DIR, minimum_size=settings.compression_minimum_size)
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+def health() -> dict[str, Any]:
+    return {
+        "status": "ok",
+        "database_maintenance": database_maintenance.status(),
+        "response_cache": response_cache.stats(),
+        "identity_cache": identity_cache.stats(),
+        "oidc_provider": oidc_provider.status(),
+    }
+
+
+def require_metrics_access(current_user: User | None = Depends(get_current_user_optional)) -> None:
+    """Admins only, unless `METRICS_PUBLIC` opens the endpoint to a scraper on a private network."""
+    if settings.metrics_public:
+        return
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(_: None = Depends(require_metrics_access)) -> PlainTextResponse:
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(request_metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/static/{asset_path:path}", include_in_schema=False)
+def static_asset(asset_path: str, request: Request) -> Response:
+    asset = static_assets.assets.get(asset_path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset.response(request.headers)
 
 
 @app.get("/")
-def index() -> FileResponse:
-    return FileResponse(STATIC_DIR / "index.html")
+def index(request: Request) -> Response:
+    if static_assets.index is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return static_assets.index.response(request.headers)
@@ -1,7 +1,7 @@
 from datetime import date, datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -17,6 +17,12 @@ class UserRole(str, Enum):
     EMPLOYEE = "employee"
 
 
+class PoolLedgerKind(str, Enum):
+    OPENING_BALANCE = "opening_balance"
+    ALLOCATION = "allocation"
+    POOL_SIZE = "pool_size"
+
+
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -55,6 +61,9 @@ class Grant(Base):
     vesting_months: Mapped[int] = mapped_column(Integer, default=48, nullable=False)
     vesting_frequency_months: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Denormalized from exercises; maintained in the same transaction as every Exercise insert.
+    exercised_options: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    last_exercise_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False
@@ -77,6 +86,18 @@ class Exercise(Base):
     grant: Mapped[Grant] = relationship(back_populates="exercises")
 
 
+class ExerciseLedgerEntry(Base):
+    """Running exercised total per grant and exercise date; the latest row on or before D answers "exercised as of D"."""
+
+    __tablename__ = "exercise_ledger"
+    __table_args__ = (UniqueConstraint("grant_id", "exercise_date", name="uq_exercise_ledger_grant_date"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    grant_id: Mapped[int] = mapped_column(ForeignKey("grants.id"), nullable=False)
+    exercise_date: Mapped[date] = mapped_column(Date, nullable=False)
+    cumulative_options: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -93,3 +114,37 @@ class User(Base):
     )
 
     employee: Mapped[Employee | None] = relationship(back_populates="user")
+
+
+class PoolState(Base):
+    """Single-row running total of the ESOP pool, updated atomically with every grant write."""
+
+    __tablename__ = "pool_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    pool_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    allocated_options: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False
+    )
+
+
+class PoolLedgerEntry(Base):
+    __tablename__ = "pool_ledger"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[PoolLedgerKind] = mapped_column(SQLEnum(PoolLedgerKind), nullable=False)
+    grant_id: Mapped[int | None] = mapped_column(ForeignKey("grants.id"), nullable=True, index=True)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    allocated_options: Mapped[int] = mapped_column(Integer, nullable=False)
+    pool_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+
+class DataVersion(Base):
+    """Write counter per cache scope, bumped inside each committing transaction and shared by every worker."""
+
+    __tablename__ = "data_versions"
+
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
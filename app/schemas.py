@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from enum import Enum
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -98,6 +99,19 @@ class ExerciseCreate(BaseModel):
     price_per_option_cents: int | None = Field(default=None, ge=0)
 
 
+class ExerciseBulkItem(ExerciseCreate):
+    grant_id: int
+
+
+class ExerciseBulkCreate(BaseModel):
+    exercises: list[ExerciseBulkItem] = Field(min_length=1, max_length=10_000)
+
+
+class ExerciseBulkError(BaseModel):
+    index: int
+    detail: str
+
+
 class ExerciseRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -134,7 +148,57 @@ class DashboardSummary(BaseModel):
     vested_options: int
     unvested_options: int
     exercised_options: int
-    grant_summaries: list[GrantVestingSummary]
+
+
+class GrantSummarySort(str, Enum):
+    ID = "id"
+    VESTED = "vested"
+    AVAILABLE = "available"
+
+
+class GrantSummaryPage(BaseModel):
+    items: list[GrantVestingSummary]
+    next_cursor: str | None = None
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportKind(str, Enum):
+    EMPLOYEES = "employees"
+    GRANTS = "grants"
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    JSON = "json"
+
+
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportReport(BaseModel):
+    kind: ImportKind
+    total_rows: int
+    inserted: int
+    errors: list[ImportRowError]
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    route: str | None
+    duration_ms: float
+    sql_count: int
+    sql_ms: float
+    sampled: bool
+    requested_by: str | None
 
 
 class AuthUser(BaseModel):
@@ -0,0 +1,238 @@
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Employee, EmployeeStatus, Grant
+from app.schemas import EmployeeCreate, GrantCreate, ImportFormat, ImportKind, ImportReport, ImportRowError
+from app.services.pool import allocate_pool_options, ensure_pool_state, get_pool_snapshot
+
+DEFAULT_IMPORT_BATCH_SIZE = 5_000
+# Stays well below SQLite's bound-parameter limit for IN (...) lookups.
+LOOKUP_CHUNK_SIZE = 500
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class _BatchRejected(Exception):
+    pass
+
+
+def parse_import_rows(content: bytes | str, import_format: ImportFormat) -> list[dict[str, Any]]:
+    """Decode a CSV (with header row) or JSON array upload; blank CSV cells are treated as missing."""
+    try:
+        text = content.decode("utf-8-sig") if isinstance(content, bytes) else content
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("Import files must be UTF-8 encoded") from exc
+    if import_format == ImportFormat.CSV:
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames:
+            raise ImportFormatError("CSV import requires a header row")
+        return [
+            {key.strip(): value.strip() for key, value in row.items() if key and value is not None and value.strip()}
+            for row in reader
+        ]
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ImportFormatError(f"Invalid JSON: {exc.msg}") from exc
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ImportFormatError("JSON import must be an array of objects")
+    return data
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
+
+
+def _validate(schema: type[BaseModel], row: dict[str, Any]) -> tuple[BaseModel | None, str | None]:
+    try:
+        return schema.model_validate(row), None
+    except ValidationError as exc:
+        return None, _validation_detail(exc)
+
+
+def _chunks(values: Sequence[Any], size: int = LOOKUP_CHUNK_SIZE) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _existing_values(db: Session, column, values: Iterable[Any]) -> set[Any]:
+    candidates = sorted(set(values))
+    found: set[Any] = set()
+    for chunk in _chunks(candidates):
+        found.update(db.scalars(select(column).where(column.in_(chunk))))
+    return found
+
+
+def _insert_batches(
+    db: Session,
+    model: type,
+    accepted: list[tuple[int, dict[str, Any]]],
+    batch_size: int,
+    errors: list[ImportRowError],
+    reserve: Callable[[list[dict[str, Any]]], bool] | None = None,
+) -> int:
+    """Insert accepted rows one transaction per batch; a failing batch is reported row by row."""
+    inserted = 0
+    for start in range(0, len(accepted), batch_size):
+        batch = accepted[start : start + batch_size]
+        values = [row_values for _, row_values in batch]
+        try:
+            db.execute(insert(model), values)
+            if reserve is not None and not reserve(values):
+                raise _BatchRejected("Grant exceeds available ESOP pool")
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            errors.extend(ImportRowError(row=row, detail="Conflicts with an existing record") for row, _ in batch)
+        except _BatchRejected as exc:
+            db.rollback()
+            errors.extend(ImportRowError(row=row, detail=str(exc)) for row, _ in batch)
+        else:
+            inserted += len(batch)
+    return inserted
+
+
+def import_employees(
+    db: Session,
+    rows: Sequence[dict[str, Any]],
+    *,
+    admin_email: str | None = None,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    errors: list[ImportRowError] = []
+    candidates: list[tuple[int, EmployeeCreate]] = []
+    for row_number, row in enumerate(rows, start=1):
+        payload, detail = _validate(EmployeeCreate, row)
+        if payload is None:
+            errors.append(ImportRowError(row=row_number, detail=detail))
+        elif admin_email and payload.email.strip().lower() == admin_email.lower():
+            errors.append(ImportRowError(row=row_number, detail="Admins cannot create their own employee record"))
+        else:
+            candidates.append((row_number, payload))
+
+    taken_codes = _existing_values(db, Employee.employee_code, (payload.employee_code for _, payload in candidates))
+    taken_emails = _existing_values(db, Employee.email, (payload.email for _, payload in candidates))
+
+    accepted: list[tuple[int, dict[str, Any]]] = []
+    for row_number, payload in candidates:
+        if payload.employee_code in taken_codes:
+            errors.append(ImportRowError(row=row_number, detail="Employee code already exists"))
+            continue
+        if payload.email in taken_emails:
+            errors.append(ImportRowError(row=row_number, detail="Employee email already exists"))
+            continue
+        taken_codes.add(payload.employee_code)
+        taken_emails.add(payload.email)
+        accepted.append((row_number, payload.model_dump()))
+
+    inserted = _insert_batches(db, Employee, accepted, batch_size, errors)
+    errors.sort(key=lambda error: error.row)
+    return ImportReport(kind=ImportKind.EMPLOYEES, total_rows=len(rows), inserted=inserted, errors=errors)
+
+
+def _employees_for_rows(db: Session, rows: Sequence[dict[str, Any]]) -> tuple[dict[int, Any], dict[str, Any]]:
+    ids: set[int] = set()
+    codes: set[str] = set()
+    for row in rows:
+        if row.get("employee_id") not in (None, ""):
+            try:
+                ids.add(int(row["employee_id"]))
+            except (TypeError, ValueError):
+                continue
+        elif row.get("employee_code"):
+            codes.add(str(row["employee_code"]))
+
+    columns = (Employee.id, Employee.employee_code, Employee.email, Employee.status)
+    by_id: dict[int, Any] = {}
+    by_code: dict[str, Any] = {}
+    for chunk in _chunks(sorted(ids)):
+        by_id.update((employee.id, employee) for employee in db.execute(select(*columns).where(Employee.id.in_(chunk))))
+    for chunk in _chunks(sorted(codes)):
+        for employee in db.execute(select(*columns).where(Employee.employee_code.in_(chunk))):
+            by_code[employee.employee_code] = employee
+            by_id[employee.id] = employee
+    return by_id, by_code
+
+
+def import_grants(
+    db: Session,
+    rows: Sequence[dict[str, Any]],
+    *,
+    pool_size: int,
+    admin_email: str | None = None,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """Rows reference their employee by `employee_id` or `employee_code`."""
+    ensure_pool_state(db, pool_size)
+    db.commit()
+    remaining_pool = get_pool_snapshot(db, pool_size).remaining_options
+    employees_by_id, employees_by_code = _employees_for_rows(db, rows)
+
+    errors: list[ImportRowError] = []
+    accepted: list[tuple[int, dict[str, Any]]] = []
+    for row_number, raw_row in enumerate(rows, start=1):
+        row = dict(raw_row)
+        employee_code = row.pop("employee_code", None)
+        if row.get("employee_id") in (None, "") and employee_code:
+            employee = employees_by_code.get(str(employee_code))
+            if employee is None:
+                errors.append(ImportRowError(row=row_number, detail="Employee not found"))
+                continue
+            row["employee_id"] = employee.id
+
+        payload, detail = _validate(GrantCreate, row)
+        if payload is None:
+            errors.append(ImportRowError(row=row_number, detail=detail))
+            continue
+
+        employee = employees_by_id.get(payload.employee_id)
+        if employee is None:
+            detail = "Employee not found"
+        elif employee.status != EmployeeStatus.ACTIVE:
+            detail = "Cannot assign grants to inactive employees"
+        elif admin_email and employee.email.lower() == admin_email.lower():
+            detail = "Admins cannot assign grants to themselves"
+        elif payload.total_options > remaining_pool:
+            detail = "Grant exceeds available ESOP pool"
+        if detail is not None:
+            errors.append(ImportRowError(row=row_number, detail=detail))
+            continue
+
+        remaining_pool -= payload.total_options
+        accepted.append((row_number, payload.model_dump()))
+
+    def reserve(values: list[dict[str, Any]]) -> bool:
+        return allocate_pool_options(db, pool_size, sum(value["total_options"] for value in values))
+
+    inserted = _insert_batches(db, Grant, accepted, batch_size, errors, reserve=reserve)
+    errors.sort(key=lambda error: error.row)
+    return ImportReport(kind=ImportKind.GRANTS, total_rows=len(rows), inserted=inserted, errors=errors)
+
+
+def run_import(
+    db: Session,
+    kind: ImportKind,
+    rows: Sequence[dict[str, Any]],
+    *,
+    pool_size: int,
+    admin_email: str | None = None,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    if kind == ImportKind.EMPLOYEES:
+        return import_employees(db, rows, admin_email=admin_email, batch_size=batch_size)
+    return import_grants(db, rows, pool_size=pool_size, admin_email=admin_email, batch_size=batch_size)
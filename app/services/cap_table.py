@@ -0,0 +1,294 @@
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Select, extract, select
+from sqlalchemy.orm import Session
+
+from app.models import Employee, EmployeeStatus, Grant
+from app.schemas import GrantSummarySort, GrantVestingSummary
+from app.services.exercises import exercised_options_as_of_expression
+from app.services.vesting import BatchVestingResult, compute_vesting_batch
+
+DEFAULT_BATCH_SIZE = 5_000
+
+
+CAP_TABLE_COLUMNS = (
+    "grant_id",
+    "employee_id",
+    "employee_name",
+    "grant_name",
+    "as_of",
+    "total_options",
+    "vested_options",
+    "unvested_options",
+    "exercised_options",
+    "available_to_exercise",
+    "outstanding_options",
+)
+
+
+@dataclass(frozen=True)
+class VestingBatch:
+    grant_ids: list[int]
+    employee_ids: list[int]
+    employee_names: list[str]
+    grant_names: list[str]
+    total_options: np.ndarray
+    result: BatchVestingResult
+
+    def __len__(self) -> int:
+        return len(self.grant_ids)
+
+    def summaries(self, as_of: date, indices: Sequence[int] | None = None) -> list[GrantVestingSummary]:
+        if indices is None:
+            indices = range(len(self.grant_ids))
+        total = self.total_options.tolist()
+        vested = self.result.vested_options.tolist()
+        unvested = self.result.unvested_options.tolist()
+        exercised = self.result.exercised_options.tolist()
+        available = self.result.available_to_exercise.tolist()
+        outstanding = self.result.outstanding_options.tolist()
+        return [
+            GrantVestingSummary(
+                grant_id=self.grant_ids[index],
+                employee_id=self.employee_ids[index],
+                employee_name=self.employee_names[index],
+                grant_name=self.grant_names[index],
+                as_of=as_of,
+                total_options=total[index],
+                vested_options=vested[index],
+                unvested_options=unvested[index],
+                exercised_options=exercised[index],
+                available_to_exercise=available[index],
+                outstanding_options=outstanding[index],
+            )
+            for index in indices
+        ]
+
+
+    def rows(self, as_of: date) -> Iterator[tuple]:
+        """Plain tuples in `CAP_TABLE_COLUMNS` order, for writers that don't need Pydantic models."""
+        return zip(
+            self.grant_ids,
+            self.employee_ids,
+            self.employee_names,
+            self.grant_names,
+            [as_of.isoformat()] * len(self.grant_ids),
+            self.total_options.tolist(),
+            self.result.vested_options.tolist(),
+            self.result.unvested_options.tolist(),
+            self.result.exercised_options.tolist(),
+            self.result.available_to_exercise.tolist(),
+            self.result.outstanding_options.tolist(),
+        )
+
+
+@dataclass
+class VestingTotals:
+    total_grants: int = 0
+    pool_allocated: int = 0
+    vested_options: int = 0
+    unvested_options: int = 0
+    exercised_options: int = 0
+
+    def add_batch(self, batch: VestingBatch) -> None:
+        self.total_grants += len(batch)
+        self.pool_allocated += int(batch.total_options.sum())
+        self.vested_options += int(batch.result.vested_options.sum())
+        self.unvested_options += int(batch.result.unvested_options.sum())
+        self.exercised_options += int(batch.result.exercised_options.sum())
+
+
+def vesting_rows_statement(
+    as_of: date,
+    *,
+    employee_id: int | None = None,
+    employee_status: EmployeeStatus | None = None,
+    before_grant_id: int | None = None,
+    grant_ids: Sequence[int] | None = None,
+) -> Select:
+    """Only the columns the batch vesting math needs, with exercised totals resolved in SQL.
+
+    Grants with no exercise after `as_of` read the denormalized counter; the rest take one
+    indexed lookup in the exercise ledger.
+    """
+    stmt = (
+        select(
+            Grant.id,
+            Grant.employee_id,
+            Employee.full_name,
+            Grant.grant_name,
+            Grant.total_options,
+            (extract("year", Grant.vesting_start_date) * 12 + extract("month", Grant.vesting_start_date) - 1).label(
+                "start_month_ordinal"
+            ),
+            extract("day", Grant.vesting_start_date).label("start_day"),
+            Grant.cliff_months,
+            Grant.vesting_months,
+            Grant.vesting_frequency_months,
+            exercised_options_as_of_expression(as_of).label("exercised"),
+        )
+        .join(Employee, Employee.id == Grant.employee_id)
+        .order_by(Grant.id.desc())
+    )
+    if employee_id is not None:
+        stmt = stmt.where(Grant.employee_id == employee_id)
+    if employee_status is not None:
+        stmt = stmt.where(Employee.status == employee_status)
+    if before_grant_id is not None:
+        stmt = stmt.where(Grant.id < before_grant_id)
+    if grant_ids is not None:
+        stmt = stmt.where(Grant.id.in_(grant_ids))
+    return stmt
+
+
+def build_vesting_batch(rows, as_of: date) -> VestingBatch:
+    grant_ids, employee_ids, employee_names, grant_names, *numeric = zip(*rows)
+    total, start_months, start_days, cliff, vesting, frequency, exercised = (
+        np.array(column, dtype=np.int64) for column in numeric
+    )
+    return VestingBatch(
+        grant_ids=list(grant_ids),
+        employee_ids=list(employee_ids),
+        employee_names=list(employee_names),
+        grant_names=list(grant_names),
+        total_options=total,
+        result=compute_vesting_batch(
+            total_options=total,
+            start_month_ordinals=start_months,
+            start_days=start_days,
+            cliff_months=cliff,
+            vesting_months=vesting,
+            vesting_frequency_months=frequency,
+            exercised_options=exercised,
+            as_of=as_of,
+        ),
+    )
+
+
+def iter_vesting_batches(
+    db: Session,
+    as_of: date,
+    *,
+    employee_id: int | None = None,
+    employee_status: EmployeeStatus | None = None,
+    before_grant_id: int | None = None,
+    grant_ids: Sequence[int] | None = None,
+    limit: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[VestingBatch]:
+    """Stream grants in `batch_size` partitions so memory stays flat regardless of pool size."""
+    stmt = vesting_rows_statement(
+        as_of,
+        employee_id=employee_id,
+        employee_status=employee_status,
+        before_grant_id=before_grant_id,
+        grant_ids=grant_ids,
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            if rows:
+                yield build_vesting_batch(rows, as_of)
+    finally:
+        result.close()
+
+
+def compute_vesting_totals(
+    db: Session,
+    as_of: date,
+    employee_id: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> VestingTotals:
+    totals = VestingTotals()
+    for batch in iter_vesting_batches(db, as_of, employee_id=employee_id, batch_size=batch_size):
+        totals.add_batch(batch)
+    return totals
+
+
+@dataclass(frozen=True)
+class SummaryPageKey:
+    """Keyset position of the last row on a page: grant id plus the sort value when sorting by one."""
+
+    grant_id: int
+    value: int | None = None
+
+
+def _exercisable_mask(batch: VestingBatch, exercisable: bool | None) -> np.ndarray:
+    if exercisable is None:
+        return np.ones(len(batch), dtype=bool)
+    return (batch.result.available_to_exercise > 0) == exercisable
+
+
+def grant_summary_page(
+    db: Session,
+    as_of: date,
+    *,
+    limit: int,
+    sort: GrantSummarySort = GrantSummarySort.ID,
+    after: SummaryPageKey | None = None,
+    employee_id: int | None = None,
+    employee_status: EmployeeStatus | None = None,
+    exercisable: bool | None = None,
+) -> tuple[list[GrantVestingSummary], SummaryPageKey | None]:
+    """One page of grant summaries ordered by grant id (descending) or by a vesting figure.
+
+    Sorting by id walks the grants table from the cursor and stops once the page is full.
+    Sorting by vested/available needs the computed value for every matching grant, so only
+    (grant id, value) pairs are kept while streaming and full rows are fetched for the page alone.
+    """
+    if sort == GrantSummarySort.ID:
+        items: list[GrantVestingSummary] = []
+        for batch in iter_vesting_batches(
+            db,
+            as_of,
+            employee_id=employee_id,
+            employee_status=employee_status,
+            before_grant_id=after.grant_id if after else None,
+            limit=limit + 1 if exercisable is None else None,
+            batch_size=limit + 1 if exercisable is None else DEFAULT_BATCH_SIZE,
+        ):
+            indices = np.flatnonzero(_exercisable_mask(batch, exercisable)).tolist()
+            items.extend(batch.summaries(as_of, indices))
+            if len(items) > limit:
+                break
+
+        next_key = SummaryPageKey(grant_id=items[limit - 1].grant_id) if len(items) > limit else None
+        return items[:limit], next_key
+
+    id_chunks: list[np.ndarray] = []
+    value_chunks: list[np.ndarray] = []
+    for batch in iter_vesting_batches(db, as_of, employee_id=employee_id, employee_status=employee_status):
+        ids = np.array(batch.grant_ids, dtype=np.int64)
+        values = (
+            batch.result.vested_options if sort == GrantSummarySort.VESTED else batch.result.available_to_exercise
+        )
+        mask = _exercisable_mask(batch, exercisable)
+        if after is not None:
+            mask &= (values < after.value) | ((values == after.value) & (ids < after.grant_id))
+        id_chunks.append(ids[mask])
+        value_chunks.append(values[mask])
+
+    if not id_chunks:
+        return [], None
+
+    ids = np.concatenate(id_chunks)
+    values = np.concatenate(value_chunks)
+    order = np.lexsort((-ids, -values))[: limit + 1]
+    page_ids = ids[order[:limit]].tolist()
+
+    by_id: dict[int, GrantVestingSummary] = {}
+    for batch in iter_vesting_batches(db, as_of, grant_ids=page_ids):
+        by_id.update((summary.grant_id, summary) for summary in batch.summaries(as_of))
+    items = [by_id[grant_id] for grant_id in page_ids]
+
+    next_key = None
+    if len(order) > limit:
+        last = order[limit - 1]
+        next_key = SummaryPageKey(grant_id=int(ids[last]), value=int(values[last]))
+    return items, next_key
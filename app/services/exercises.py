@@ -0,0 +1,410 @@
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+from sqlalchemy import ScalarSelect, case, delete, except_, func, insert, select, union, update
+from sqlalchemy.orm import Session
+
+from app.models import Employee, Exercise, ExerciseLedgerEntry, Grant
+from app.services.vesting import compute_vesting_batch, month_ordinal
+
+# Stays well below SQLite's bound-parameter limit for IN (...) lookups.
+GRANT_LOOKUP_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class ExerciseTotalMismatch:
+    grant_id: int
+    stored_exercised: int
+    actual_exercised: int
+    stored_last_exercise_date: date | None
+    actual_last_exercise_date: date | None
+
+
+def ledger_exercised_as_of(grant_id, as_of: date) -> ScalarSelect:
+    """Indexed range lookup: cumulative total of the latest ledger row on or before `as_of`."""
+    return (
+        select(ExerciseLedgerEntry.cumulative_options)
+        .where(ExerciseLedgerEntry.grant_id == grant_id, ExerciseLedgerEntry.exercise_date <= as_of)
+        .order_by(ExerciseLedgerEntry.exercise_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def exercised_options_as_of_expression(as_of: date):
+    """SQL counterpart of `exercised_options_as_of` for set-based queries over grants."""
+    return case(
+        (Grant.last_exercise_date.is_(None), 0),
+        (Grant.last_exercise_date <= as_of, Grant.exercised_options),
+        else_=func.coalesce(ledger_exercised_as_of(Grant.id, as_of), 0),
+    )
+
+
+def exercised_options_as_of(db: Session, grant: Grant, as_of: date) -> int:
+    """O(1) from the grant counter unless `as_of` precedes the latest exercise, then one ledger lookup."""
+    if grant.last_exercise_date is None:
+        return 0
+    if as_of >= grant.last_exercise_date:
+        return grant.exercised_options
+    return db.scalar(select(ledger_exercised_as_of(grant.id, as_of))) or 0
+
+
+def _record_in_ledger(db: Session, grant_id: int, exercise_date: date, options_exercised: int) -> None:
+    """Add an exercise to the running totals; back-dated exercises shift every later row too."""
+    has_entry_on_date = db.scalar(
+        select(ExerciseLedgerEntry.id).where(
+            ExerciseLedgerEntry.grant_id == grant_id, ExerciseLedgerEntry.exercise_date == exercise_date
+        )
+    )
+    if has_entry_on_date is None:
+        db.execute(
+            insert(ExerciseLedgerEntry).values(
+                grant_id=grant_id,
+                exercise_date=exercise_date,
+                cumulative_options=select(
+                    func.coalesce(ledger_exercised_as_of(grant_id, exercise_date), 0) + options_exercised
+                ).scalar_subquery(),
+            )
+        )
+        later_entries = ExerciseLedgerEntry.exercise_date > exercise_date
+    else:
+        later_entries = ExerciseLedgerEntry.exercise_date >= exercise_date
+
+    db.execute(
+        update(ExerciseLedgerEntry)
+        .where(ExerciseLedgerEntry.grant_id == grant_id, later_entries)
+        .values(cumulative_options=ExerciseLedgerEntry.cumulative_options + options_exercised)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _increment_grant_counters(db: Session, grant_id: int, exercise_date: date, options_exercised: int) -> bool:
+    result = db.execute(
+        update(Grant)
+        .where(Grant.id == grant_id, Grant.exercised_options + options_exercised <= Grant.total_options)
+        .values(
+            exercised_options=Grant.exercised_options + options_exercised,
+            last_exercise_date=case(
+                (Grant.last_exercise_date.is_(None), exercise_date),
+                (Grant.last_exercise_date < exercise_date, exercise_date),
+                else_=Grant.last_exercise_date,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def add_exercise(
+    db: Session,
+    grant_id: int,
+    exercise_date: date,
+    options_exercised: int,
+    price_per_option_cents: int,
+) -> Exercise | None:
+    """Insert an exercise and bump the grant counters in the caller's transaction.
+
+    The counter update is a single conditional UPDATE, so two concurrent exercises cannot both
+    push a grant past `total_options`. Returns None without writing anything when the exercise
+    would exceed the grant.
+    """
+    if not _increment_grant_counters(db, grant_id, exercise_date, options_exercised):
+        return None
+
+    _record_in_ledger(db, grant_id, exercise_date, options_exercised)
+    exercise = Exercise(
+        grant_id=grant_id,
+        exercise_date=exercise_date,
+        options_exercised=options_exercised,
+        price_per_option_cents=price_per_option_cents,
+    )
+    db.add(exercise)
+    return exercise
+
+
+@dataclass(frozen=True)
+class ExerciseRequest:
+    grant_id: int
+    exercise_date: date
+    options_exercised: int
+    price_per_option_cents: int | None = None
+
+
+@dataclass(frozen=True)
+class ExerciseRowError:
+    index: int
+    detail: str
+
+
+@dataclass
+class _ExerciseTarget:
+    """What validating exercises against one grant needs: vesting terms, counters and ledger."""
+
+    total_options: int
+    strike_price_cents: int
+    vesting_start_date: date
+    cliff_months: int
+    vesting_months: int
+    vesting_frequency_months: int
+    exercised_options: int
+    employee_email: str
+    ledger_dates: list[date] = field(default_factory=list)
+    ledger_totals: list[int] = field(default_factory=list)
+
+    def exercised_as_of(self, as_of: date) -> int:
+        position = bisect_right(self.ledger_dates, as_of)
+        return self.ledger_totals[position - 1] if position else 0
+
+
+def _load_exercise_targets(db: Session, grant_ids: Sequence[int]) -> dict[int, _ExerciseTarget]:
+    """Grants, owners and exercise ledgers in one query per chunk of grant ids."""
+    targets: dict[int, _ExerciseTarget] = {}
+    ordered_ids = sorted(set(grant_ids))
+    for start in range(0, len(ordered_ids), GRANT_LOOKUP_CHUNK_SIZE):
+        chunk = ordered_ids[start : start + GRANT_LOOKUP_CHUNK_SIZE]
+        stmt = (
+            select(
+                Grant.id,
+                Grant.total_options,
+                Grant.strike_price_cents,
+                Grant.vesting_start_date,
+                Grant.cliff_months,
+                Grant.vesting_months,
+                Grant.vesting_frequency_months,
+                Grant.exercised_options,
+                Employee.email,
+                ExerciseLedgerEntry.exercise_date,
+                ExerciseLedgerEntry.cumulative_options,
+            )
+            .join(Employee, Employee.id == Grant.employee_id)
+            .outerjoin(ExerciseLedgerEntry, ExerciseLedgerEntry.grant_id == Grant.id)
+            .where(Grant.id.in_(chunk))
+            .order_by(Grant.id, ExerciseLedgerEntry.exercise_date)
+        )
+        for row in db.execute(stmt):
+            target = targets.get(row.id)
+            if target is None:
+                target = targets[row.id] = _ExerciseTarget(*row[1:9])
+            if row.exercise_date is not None:
+                target.ledger_dates.append(row.exercise_date)
+                target.ledger_totals.append(row.cumulative_options)
+    return targets
+
+
+def _vested_on_exercise_dates(
+    requests: Sequence[ExerciseRequest], indices: Sequence[int], targets: dict[int, _ExerciseTarget]
+) -> dict[int, int]:
+    """Vested options per request on its exercise date, one vectorized pass per distinct date."""
+    by_date: dict[date, list[int]] = defaultdict(list)
+    for index in indices:
+        by_date[requests[index].exercise_date].append(index)
+
+    vested: dict[int, int] = {}
+    for exercise_date, date_indices in by_date.items():
+        grants = [targets[requests[index].grant_id] for index in date_indices]
+        result = compute_vesting_batch(
+            total_options=np.array([grant.total_options for grant in grants], dtype=np.int64),
+            start_month_ordinals=np.array([month_ordinal(grant.vesting_start_date) for grant in grants], dtype=np.int64),
+            start_days=np.array([grant.vesting_start_date.day for grant in grants], dtype=np.int64),
+            cliff_months=np.array([grant.cliff_months for grant in grants], dtype=np.int64),
+            vesting_months=np.array([grant.vesting_months for grant in grants], dtype=np.int64),
+            vesting_frequency_months=np.array([grant.vesting_frequency_months for grant in grants], dtype=np.int64),
+            exercised_options=np.zeros(len(grants), dtype=np.int64),
+            as_of=exercise_date,
+        )
+        vested.update(zip(date_indices, result.vested_options.tolist()))
+    return vested
+
+
+def validate_exercise_batch(
+    db: Session, requests: Sequence[ExerciseRequest], *, admin_email: str | None = None
+) -> tuple[dict[int, _ExerciseTarget], list[ExerciseRowError]]:
+    """Apply `record_exercise`'s checks to every request, counting earlier requests in the batch.
+
+    A request is checked against the ledger total on its date plus earlier requests in the batch
+    for the same grant dated on or before it, and against `total_options` after every earlier
+    request for that grant.
+    """
+    targets = _load_exercise_targets(db, [request.grant_id for request in requests])
+    errors: list[ExerciseRowError] = []
+    candidates: list[int] = []
+    for index, request in enumerate(requests):
+        target = targets.get(request.grant_id)
+        if target is None:
+            errors.append(ExerciseRowError(index=index, detail="Grant not found"))
+        elif admin_email and target.employee_email.lower() == admin_email.lower():
+            errors.append(ExerciseRowError(index=index, detail="Admins cannot execute actions on their own grants"))
+        else:
+            candidates.append(index)
+
+    vested = _vested_on_exercise_dates(requests, candidates, targets)
+    accepted: dict[int, list[ExerciseRequest]] = defaultdict(list)
+    for index in candidates:
+        request = requests[index]
+        target = targets[request.grant_id]
+        earlier = accepted[request.grant_id]
+        exercised_until_date = target.exercised_as_of(request.exercise_date) + sum(
+            other.options_exercised for other in earlier if other.exercise_date <= request.exercise_date
+        )
+        exercised_total = target.exercised_options + sum(other.options_exercised for other in earlier)
+        if exercised_until_date + request.options_exercised > vested[index]:
+            errors.append(ExerciseRowError(index=index, detail="Exercise exceeds vested options on the selected date"))
+        elif exercised_total + request.options_exercised > target.total_options:
+            errors.append(ExerciseRowError(index=index, detail="Exercise exceeds total grant options"))
+        else:
+            earlier.append(request)
+
+    errors.sort(key=lambda error: error.index)
+    return targets, errors
+
+
+def add_exercises(
+    db: Session, requests: Sequence[ExerciseRequest], *, admin_email: str | None = None
+) -> tuple[list[Exercise], list[ExerciseRowError]]:
+    """Validate and insert a batch of exercises in the caller's transaction, all or nothing.
+
+    Nothing is written when any request fails; the caller should roll back when errors come back,
+    since a concurrent writer can still trip the conditional counter update.
+    """
+    targets, errors = validate_exercise_batch(db, requests, admin_email=admin_email)
+    if errors or not requests:
+        return [], errors
+
+    per_grant: dict[int, list[ExerciseRequest]] = defaultdict(list)
+    for request in requests:
+        per_grant[request.grant_id].append(request)
+    for grant_id, grant_requests in per_grant.items():
+        last_date = max(request.exercise_date for request in grant_requests)
+        if not _increment_grant_counters(
+            db, grant_id, last_date, sum(request.options_exercised for request in grant_requests)
+        ):
+            index = next(index for index, request in enumerate(requests) if request.grant_id == grant_id)
+            return [], [ExerciseRowError(index=index, detail="Exercise exceeds total grant options")]
+
+    exercises = list(
+        db.scalars(
+            insert(Exercise).returning(Exercise, sort_by_parameter_order=True),
+            [
+                {
+                    "grant_id": request.grant_id,
+                    "exercise_date": request.exercise_date,
+                    "options_exercised": request.options_exercised,
+                    "price_per_option_cents": (
+                        request.price_per_option_cents
+                        if request.price_per_option_cents is not None
+                        else targets[request.grant_id].strike_price_cents
+                    ),
+                }
+                for request in requests
+            ],
+        )
+    )
+    grant_ids = sorted(per_grant)
+    for start in range(0, len(grant_ids), GRANT_LOOKUP_CHUNK_SIZE):
+        _write_ledger_from_exercises(db, grant_ids[start : start + GRANT_LOOKUP_CHUNK_SIZE])
+    return exercises, []
+
+
+def _exercise_totals_subquery():
+    return (
+        select(
+            Exercise.grant_id,
+            func.sum(Exercise.options_exercised).label("exercised"),
+            func.max(Exercise.exercise_date).label("last_exercise_date"),
+        )
+        .group_by(Exercise.grant_id)
+        .subquery("exercise_totals")
+    )
+
+
+def find_exercise_total_mismatches(db: Session) -> list[ExerciseTotalMismatch]:
+    totals = _exercise_totals_subquery()
+    actual_exercised = func.coalesce(totals.c.exercised, 0)
+    stmt = (
+        select(
+            Grant.id,
+            Grant.exercised_options,
+            actual_exercised,
+            Grant.last_exercise_date,
+            totals.c.last_exercise_date,
+        )
+        .outerjoin(totals, totals.c.grant_id == Grant.id)
+        .where(
+            (Grant.exercised_options != actual_exercised)
+            | Grant.last_exercise_date.is_distinct_from(totals.c.last_exercise_date)
+        )
+        .order_by(Grant.id)
+    )
+    return [ExerciseTotalMismatch(*row) for row in db.execute(stmt)]
+
+
+def backfill_exercise_totals(db: Session) -> int:
+    """Recompute every grant's counters from its exercises; returns the number of grants corrected."""
+    mismatches = find_exercise_total_mismatches(db)
+    if mismatches:
+        db.execute(
+            update(Grant),
+            [
+                {
+                    "id": mismatch.grant_id,
+                    "exercised_options": mismatch.actual_exercised,
+                    "last_exercise_date": mismatch.actual_last_exercise_date,
+                }
+                for mismatch in mismatches
+            ],
+        )
+    db.commit()
+    return len(mismatches)
+
+
+def _expected_ledger_select():
+    daily = func.sum(Exercise.options_exercised)
+    return select(
+        Exercise.grant_id,
+        Exercise.exercise_date,
+        func.sum(daily).over(partition_by=Exercise.grant_id, order_by=Exercise.exercise_date).label("cumulative_options"),
+    ).group_by(Exercise.grant_id, Exercise.exercise_date)
+
+
+def find_ledger_mismatches(db: Session) -> list[int]:
+    """Grant ids whose ledger rows differ from running totals recomputed from exercises."""
+    actual = select(ExerciseLedgerEntry.grant_id, ExerciseLedgerEntry.exercise_date, ExerciseLedgerEntry.cumulative_options)
+    expected = _expected_ledger_select()
+    missing = except_(expected, actual).subquery("missing_entries")
+    unexpected = except_(actual, expected).subquery("unexpected_entries")
+    return sorted(db.scalars(union(select(missing.c.grant_id), select(unexpected.c.grant_id))))
+
+
+def _write_ledger_from_exercises(db: Session, grant_ids: Sequence[int] | None = None) -> None:
+    clear = delete(ExerciseLedgerEntry)
+    expected_select = _expected_ledger_select()
+    if grant_ids is not None:
+        clear = clear.where(ExerciseLedgerEntry.grant_id.in_(grant_ids))
+        expected_select = expected_select.where(Exercise.grant_id.in_(grant_ids))
+    db.execute(clear)
+    expected = expected_select.subquery("expected_ledger")
+    db.execute(
+        insert(ExerciseLedgerEntry).from_select(
+            ["grant_id", "exercise_date", "cumulative_options"],
+            select(expected.c.grant_id, expected.c.exercise_date, expected.c.cumulative_options),
+        )
+    )
+
+
+def rebuild_exercise_ledger(db: Session) -> int:
+    """Regenerate the whole ledger from exercises; returns the number of ledger rows written."""
+    _write_ledger_from_exercises(db)
+    db.commit()
+    return db.scalar(select(func.count()).select_from(ExerciseLedgerEntry)) or 0
+
+
+def backfill_after_schema_changes(db: Session, schema_changes: set[str]) -> None:
+    """Populate derived exercise data that `init_db` just added to an existing database."""
+    if "grants.exercised_options" in schema_changes:
+        backfill_exercise_totals(db)
+    if "exercise_ledger" in schema_changes:
+        rebuild_exercise_ledger(db)
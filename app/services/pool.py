@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Grant, PoolLedgerEntry, PoolLedgerKind, PoolState
+
+POOL_STATE_ID = 1
+
+
+@dataclass(frozen=True)
+class PoolSnapshot:
+    pool_size: int
+    allocated_options: int
+
+    @property
+    def remaining_options(self) -> int:
+        return max(self.pool_size - self.allocated_options, 0)
+
+
+def ensure_pool_state(db: Session, pool_size: int) -> None:
+    """Create the pool state row on first use and record configured pool-size changes.
+
+    The opening balance is the only full SUM over grants; every later write adjusts the row.
+    Call it before flushing a new grant so the opening balance does not already include it.
+    """
+    state = db.get(PoolState, POOL_STATE_ID)
+    if state is None:
+        allocated = db.scalar(select(func.coalesce(func.sum(Grant.total_options), 0))) or 0
+        try:
+            with db.begin_nested():
+                db.add(PoolState(id=POOL_STATE_ID, pool_size=pool_size, allocated_options=allocated))
+                db.add(
+                    PoolLedgerEntry(
+                        kind=PoolLedgerKind.OPENING_BALANCE,
+                        delta=allocated,
+                        allocated_options=allocated,
+                        pool_size=pool_size,
+                    )
+                )
+        except IntegrityError:
+            state = db.get(PoolState, POOL_STATE_ID, populate_existing=True)
+        else:
+            return
+
+    if state.pool_size != pool_size:
+        state.pool_size = pool_size
+        db.add(
+            PoolLedgerEntry(
+                kind=PoolLedgerKind.POOL_SIZE,
+                delta=0,
+                allocated_options=state.allocated_options,
+                pool_size=pool_size,
+            )
+        )
+        db.flush()
+
+
+def get_pool_snapshot(db: Session, pool_size: int) -> PoolSnapshot:
+    """Read-only: a single-row lookup, falling back to a SUM before the state row exists."""
+    row = db.execute(
+        select(PoolState.pool_size, PoolState.allocated_options).where(PoolState.id == POOL_STATE_ID)
+    ).one_or_none()
+    if row is None:
+        allocated = db.scalar(select(func.coalesce(func.sum(Grant.total_options), 0))) or 0
+        return PoolSnapshot(pool_size=pool_size, allocated_options=allocated)
+    return PoolSnapshot(pool_size=row.pool_size, allocated_options=row.allocated_options)
+
+
+def allocate_pool_options(db: Session, pool_size: int, delta: int, grant_id: int | None = None) -> bool:
+    """Apply `delta` to the allocated total in the caller's transaction.
+
+    Increases are a single conditional UPDATE on the state row, which takes SQLite's write lock,
+    so concurrent grant writes cannot both squeeze past the pool limit. Returns False without
+    changing anything when the pool cannot absorb the increase.
+    """
+    ensure_pool_state(db, pool_size)
+    stmt = update(PoolState).where(PoolState.id == POOL_STATE_ID)
+    if delta > 0:
+        stmt = stmt.where(PoolState.allocated_options + delta <= PoolState.pool_size)
+    row = db.execute(
+        stmt.values(allocated_options=PoolState.allocated_options + delta)
+        .returning(PoolState.allocated_options, PoolState.pool_size)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if row is None:
+        return False
+
+    db.execute(
+        insert(PoolLedgerEntry).values(
+            kind=PoolLedgerKind.ALLOCATION,
+            grant_id=grant_id,
+            delta=delta,
+            allocated_options=row.allocated_options,
+            pool_size=row.pool_size,
+        )
+    )
+    return True
@@ -0,0 +1,362 @@
+"""Deterministic synthetic cap tables for load and scale testing (`python -m app.cli seed`)."""
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Employee, EmployeeStatus, Exercise, ExerciseLedgerEntry, Grant, PoolState
+from app.services.pool import POOL_STATE_ID, allocate_pool_options, ensure_pool_state, get_pool_snapshot
+from app.services.vesting import compute_vesting_batch, month_ordinal
+
+DEFAULT_SEED_BATCH_SIZE = 50_000
+DEFAULT_AS_OF = date(2025, 12, 31)
+HISTORY_START = date(2015, 1, 1)
+# Exercises are dated on this day of the month, so vesting on that date is a whole number of months.
+EXERCISE_DAY = 28
+MAX_EXERCISES_PER_GRANT = 3
+INACTIVE_SHARE = 0.08
+
+# (cliff_months, vesting_months, vesting_frequency_months, weight); each satisfies GrantBase's validators.
+VESTING_PLANS = (
+    (12, 48, 1, 0.45),
+    (12, 48, 3, 0.15),
+    (12, 48, 12, 0.05),
+    (0, 48, 1, 0.08),
+    (12, 36, 1, 0.08),
+    (6, 24, 3, 0.06),
+    (0, 12, 1, 0.05),
+    (24, 60, 12, 0.03),
+    (12, 60, 3, 0.05),
+)
+
+FIRST_NAMES = (
+    "Aarav", "Ada", "Alejandro", "Amara", "Ana", "Arjun", "Ben", "Chen", "Chloe", "Daniel",
+    "Diya", "Elena", "Emeka", "Fatima", "Grace", "Hana", "Ines", "Isaac", "Jin", "Kavya",
+    "Layla", "Leo", "Lucas", "Maya", "Mei", "Mohammed", "Nadia", "Noah", "Olga", "Omar",
+    "Priya", "Rahul", "Rosa", "Sakura", "Sofia", "Tariq", "Tomas", "Wei", "Yusuf", "Zara",
+)
+LAST_NAMES = (
+    "Adeyemi", "Alvarez", "Anderson", "Bauer", "Chen", "Costa", "Das", "Dubois", "Eriksen", "Fernandes",
+    "Garcia", "Gupta", "Haddad", "Ivanova", "Jensen", "Kim", "Kowalski", "Kumar", "Larsen", "Lee",
+    "Martin", "Mehta", "Moreau", "Nakamura", "Nguyen", "Novak", "Okafor", "Patel", "Rossi", "Santos",
+    "Schmidt", "Silva", "Singh", "Tanaka", "Taylor", "Wang", "Weber", "Williams", "Yilmaz", "Zhang",
+)
+
+
+class SeedError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SeedReport:
+    employees: int
+    grants: int
+    exercises: int
+    allocated_options: int
+    pool_size: int
+
+
+@dataclass
+class _GrantColumns:
+    employee_index: np.ndarray
+    grant_ordinal: np.ndarray
+    total_options: np.ndarray
+    strike_price_cents: np.ndarray
+    cliff_months: np.ndarray
+    vesting_months: np.ndarray
+    vesting_frequency_months: np.ndarray
+    is_refresh: np.ndarray
+
+
+@dataclass
+class _ExerciseColumns:
+    grant_index: np.ndarray
+    exercise_ordinal: np.ndarray
+    options_exercised: np.ndarray
+    cumulative_options: np.ndarray
+
+
+class _Calendar:
+    """`date`/`datetime` objects for a range of ordinals, built once instead of per row."""
+
+    def __init__(self, first: date, last: date):
+        self.first = first.toordinal()
+        self.dates = [date.fromordinal(ordinal) for ordinal in range(self.first, last.toordinal() + 1)]
+        self.datetimes = [datetime.combine(day, time(), tzinfo=timezone.utc) for day in self.dates]
+
+    def date(self, ordinal: int) -> date:
+        return self.dates[ordinal - self.first]
+
+    def datetime(self, ordinal: int) -> datetime:
+        return self.datetimes[ordinal - self.first]
+
+
+def _generate_employees(rng: np.random.Generator, count: int, as_of: date) -> tuple[np.ndarray, ...]:
+    joining = rng.integers(HISTORY_START.toordinal(), as_of.toordinal(), size=count, endpoint=True)
+    first_names = rng.integers(0, len(FIRST_NAMES), size=count)
+    last_names = rng.integers(0, len(LAST_NAMES), size=count)
+    inactive = rng.random(count) < INACTIVE_SHARE
+    return joining, first_names, last_names, inactive
+
+
+def _generate_grants(rng: np.random.Generator, count: int, joining: np.ndarray, as_of: date) -> _GrantColumns:
+    employees = len(joining)
+    hire_grants = min(employees, count)
+    employee_index = np.concatenate(
+        [rng.permutation(employees)[:hire_grants], rng.integers(0, employees, size=count - hire_grants)]
+    )
+    is_refresh = np.arange(count) >= hire_grants
+    refresh_delay = rng.integers(180, 4 * 365, size=count)
+    grant_ordinal = np.minimum(joining[employee_index] + np.where(is_refresh, refresh_delay, 0), as_of.toordinal())
+
+    plan = rng.choice(len(VESTING_PLANS), size=count, p=[weight for *_, weight in VESTING_PLANS])
+    plans = np.array([terms for *terms, _ in VESTING_PLANS], dtype=np.int64)
+
+    sizes = rng.lognormal(np.where(is_refresh, 7.2, 8.0), 0.9)
+    total_options = np.maximum(np.round(sizes / 50) * 50, 50).astype(np.int64)
+
+    years = (grant_ordinal - HISTORY_START.toordinal()) / 365.25
+    strike_price_cents = np.round(25 * np.exp(0.35 * years) * rng.uniform(0.9, 1.1, size=count)).astype(np.int64)
+
+    return _GrantColumns(
+        employee_index=employee_index,
+        grant_ordinal=grant_ordinal,
+        total_options=total_options,
+        strike_price_cents=strike_price_cents,
+        cliff_months=plans[plan, 0],
+        vesting_months=plans[plan, 1],
+        vesting_frequency_months=plans[plan, 2],
+        is_refresh=is_refresh,
+    )
+
+
+def _generate_exercises(
+    rng: np.random.Generator, grants: _GrantColumns, calendar: _Calendar, as_of: date, exercise_rate: float
+) -> _ExerciseColumns:
+    """Up to three exercises on a share of grants, each within what had vested by its date."""
+    count = len(grants.total_options)
+    start_months = np.array([month_ordinal(day) for day in calendar.dates], dtype=np.int64)[
+        grants.grant_ordinal - calendar.first
+    ]
+    start_days = np.array([day.day for day in calendar.dates], dtype=np.int64)[grants.grant_ordinal - calendar.first]
+    last_month = month_ordinal(as_of) - (as_of.day < EXERCISE_DAY)
+    first_month = start_months + grants.cliff_months
+
+    eligible = (first_month <= last_month) & (rng.random(count) < exercise_rate)
+    exercises = np.where(eligible, rng.integers(1, MAX_EXERCISES_PER_GRANT, size=count, endpoint=True), 0)
+    span = np.maximum(last_month - first_month, 0) + 1
+    months = np.sort(first_month[:, None] + (rng.random((count, MAX_EXERCISES_PER_GRANT)) * span[:, None]).astype(np.int64))
+    fractions = rng.uniform(0.2, 0.8, size=(count, MAX_EXERCISES_PER_GRANT))
+
+    cumulative = np.zeros(count, dtype=np.int64)
+    steps: list[tuple[np.ndarray, ...]] = []
+    for step in range(MAX_EXERCISES_PER_GRANT):
+        active = np.flatnonzero(exercises > step)
+        if step:
+            active = active[months[active, step] > months[active, step - 1]]
+        step_months = months[active, step]
+        vested = np.zeros(len(active), dtype=np.int64)
+        for month in np.unique(step_months).tolist():
+            in_month = step_months == month
+            grant_index = active[in_month]
+            exercise_date = date(month // 12, month % 12 + 1, EXERCISE_DAY)
+            vested[in_month] = compute_vesting_batch(
+                total_options=grants.total_options[grant_index],
+                start_month_ordinals=start_months[grant_index],
+                start_days=start_days[grant_index],
+                cliff_months=grants.cliff_months[grant_index],
+                vesting_months=grants.vesting_months[grant_index],
+                vesting_frequency_months=grants.vesting_frequency_months[grant_index],
+                exercised_options=np.zeros(len(grant_index), dtype=np.int64),
+                as_of=exercise_date,
+            ).vested_options
+        amounts = np.floor((vested - cumulative[active]) * fractions[active, step]).astype(np.int64)
+        exercised = amounts > 0
+        active, step_months, amounts = active[exercised], step_months[exercised], amounts[exercised]
+        cumulative[active] += amounts
+        exercise_ordinals = np.array(
+            [date(month // 12, month % 12 + 1, EXERCISE_DAY).toordinal() for month in step_months.tolist()],
+            dtype=np.int64,
+        )
+        steps.append((active, exercise_ordinals, amounts, cumulative[active].copy()))
+
+    grant_index, exercise_ordinal, options_exercised, cumulative_options = (np.concatenate(parts) for parts in zip(*steps))
+    order = np.lexsort((exercise_ordinal, grant_index))
+    return _ExerciseColumns(
+        grant_index=grant_index[order],
+        exercise_ordinal=exercise_ordinal[order],
+        options_exercised=options_exercised[order],
+        cumulative_options=cumulative_options[order],
+    )
+
+
+def _batches(total: int, batch_size: int) -> Iterable[tuple[int, int]]:
+    for start in range(0, total, batch_size):
+        yield start, min(start + batch_size, total)
+
+
+def generate_cap_table(
+    db: Session,
+    *,
+    employees: int,
+    grants: int,
+    seed: int,
+    pool_size: int | None = None,
+    exercise_rate: float = 0.3,
+    as_of: date = DEFAULT_AS_OF,
+    batch_size: int = DEFAULT_SEED_BATCH_SIZE,
+) -> SeedReport:
+    """Append synthetic employees, grants and exercise histories, one transaction per batch.
+
+    The same seed, sizes and `as_of` produce the same rows in an empty database. Grant counters,
+    the exercise ledger, pool state and data versions are written as the API would, so the
+    consistency checks in `app.cli` pass on the result. Without a `pool_size`, a database that
+    has no pool yet gets one sized to exactly fit its grants; otherwise its pool is kept. Raises
+    `SeedError`, before writing anything but the pool state row, when the grants would not fit
+    the remaining ESOP pool.
+    """
+    if employees < 1 or grants < 0:
+        raise SeedError("At least one employee is required and the grant count cannot be negative")
+    if as_of <= HISTORY_START:
+        raise SeedError(f"as_of must be after {HISTORY_START.isoformat()}")
+
+    rng = np.random.default_rng(seed)
+    calendar = _Calendar(HISTORY_START, as_of)
+    joining, first_names, last_names, inactive = _generate_employees(rng, employees, as_of)
+    grant_columns = _generate_grants(rng, grants, joining, as_of)
+    requested = int(grant_columns.total_options.sum())
+
+    if pool_size is None:
+        state = db.get(PoolState, POOL_STATE_ID)
+        pool_size = state.pool_size if state else get_pool_snapshot(db, 0).allocated_options + requested
+    ensure_pool_state(db, pool_size)
+    db.commit()
+    remaining_pool = get_pool_snapshot(db, pool_size).remaining_options
+    if requested > remaining_pool:
+        raise SeedError(
+            f"These grants need {requested} options but the ESOP pool has {remaining_pool} left; "
+            f"raise the pool size (--pool-size, or ESOP_POOL_SIZE for the app) by at least {requested - remaining_pool}"
+        )
+    first_employee_id = (db.scalar(select(func.max(Employee.id))) or 0) + 1
+    first_grant_id = (db.scalar(select(func.max(Grant.id))) or 0) + 1
+
+    exercise_columns = _generate_exercises(rng, grant_columns, calendar, as_of, exercise_rate)
+
+    for start, stop in _batches(employees, batch_size):
+        rows = []
+        for index, joining_ordinal, first, last, is_inactive in zip(
+            range(start, stop),
+            joining[start:stop].tolist(),
+            first_names[start:stop].tolist(),
+            last_names[start:stop].tolist(),
+            inactive[start:stop].tolist(),
+        ):
+            employee_id = first_employee_id + index
+            first_name, last_name = FIRST_NAMES[first], LAST_NAMES[last]
+            joined_at = calendar.datetime(joining_ordinal)
+            rows.append(
+                {
+                    "id": employee_id,
+                    "employee_code": f"SYN-{employee_id:07d}",
+                    "full_name": f"{first_name} {last_name}",
+                    "email": f"{first_name}.{last_name}.{employee_id}@synthetic.example".lower(),
+                    "joining_date": calendar.date(joining_ordinal),
+                    "status": EmployeeStatus.INACTIVE if is_inactive else EmployeeStatus.ACTIVE,
+                    "created_at": joined_at,
+                    "updated_at": joined_at,
+                }
+            )
+        db.execute(insert(Employee.__table__), rows)
+        db.commit()
+
+    exercised_totals = np.zeros(grants, dtype=np.int64)
+    last_exercise = np.zeros(grants, dtype=np.int64)
+    np.add.at(exercised_totals, exercise_columns.grant_index, exercise_columns.options_exercised)
+    np.maximum.at(last_exercise, exercise_columns.grant_index, exercise_columns.exercise_ordinal)
+    exercise_bounds = np.searchsorted(exercise_columns.grant_index, [start for start, _ in _batches(grants, batch_size)] + [grants])
+
+    allocated = 0
+    for batch_number, (start, stop) in enumerate(_batches(grants, batch_size)):
+        rows = []
+        for index, employee_index, grant_ordinal, total, strike, cliff, vesting, frequency, refresh, exercised, last in zip(
+            range(start, stop),
+            grant_columns.employee_index[start:stop].tolist(),
+            grant_columns.grant_ordinal[start:stop].tolist(),
+            grant_columns.total_options[start:stop].tolist(),
+            grant_columns.strike_price_cents[start:stop].tolist(),
+            grant_columns.cliff_months[start:stop].tolist(),
+            grant_columns.vesting_months[start:stop].tolist(),
+            grant_columns.vesting_frequency_months[start:stop].tolist(),
+            grant_columns.is_refresh[start:stop].tolist(),
+            exercised_totals[start:stop].tolist(),
+            last_exercise[start:stop].tolist(),
+        ):
+            grant_date = calendar.date(grant_ordinal)
+            granted_at = calendar.datetime(grant_ordinal)
+            rows.append(
+                {
+                    "id": first_grant_id + index,
+                    "employee_id": first_employee_id + employee_index,
+                    "grant_name": f"{grant_date.year} refresh grant" if refresh else "New hire grant",
+                    "grant_date": grant_date,
+                    "total_options": total,
+                    "strike_price_cents": strike,
+                    "vesting_start_date": grant_date,
+                    "cliff_months": cliff,
+                    "vesting_months": vesting,
+                    "vesting_frequency_months": frequency,
+                    "exercised_options": exercised,
+                    "last_exercise_date": calendar.date(last) if last else None,
+                    "created_at": granted_at,
+                    "updated_at": granted_at,
+                }
+            )
+        db.execute(insert(Grant.__table__), rows)
+
+        low, high = exercise_bounds[batch_number], exercise_bounds[batch_number + 1]
+        if high > low:
+            grant_ids = (exercise_columns.grant_index[low:high] + first_grant_id).tolist()
+            exercise_dates = [calendar.date(ordinal) for ordinal in exercise_columns.exercise_ordinal[low:high].tolist()]
+            strikes = grant_columns.strike_price_cents[exercise_columns.grant_index[low:high]].tolist()
+            db.execute(
+                insert(Exercise.__table__),
+                [
+                    {
+                        "grant_id": grant_id,
+                        "exercise_date": exercise_date,
+                        "options_exercised": options,
+                        "price_per_option_cents": strike,
+                        "created_at": calendar.datetime(exercise_date.toordinal()),
+                    }
+                    for grant_id, exercise_date, options, strike in zip(
+                        grant_ids, exercise_dates, exercise_columns.options_exercised[low:high].tolist(), strikes
+                    )
+                ],
+            )
+            db.execute(
+                insert(ExerciseLedgerEntry.__table__),
+                [
+                    {"grant_id": grant_id, "exercise_date": exercise_date, "cumulative_options": cumulative}
+                    for grant_id, exercise_date, cumulative in zip(
+                        grant_ids, exercise_dates, exercise_columns.cumulative_options[low:high].tolist()
+                    )
+                ],
+            )
+
+        batch_options = int(grant_columns.total_options[start:stop].sum())
+        if not allocate_pool_options(db, pool_size, batch_options):
+            db.rollback()
+            raise SeedError("The ESOP pool changed while seeding; no further batches were written")
+        db.commit()
+        allocated += batch_options
+
+    return SeedReport(
+        employees=employees,
+        grants=grants,
+        exercises=len(exercise_columns.grant_index),
+        allocated_options=allocated,
+        pool_size=pool_size,
+    )
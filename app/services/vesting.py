@@ -1,5 +1,9 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
+
 from app.models import Grant
 from app.schemas import GrantVestingSummary
 
@@ -54,3 +58,115 @@ def summarize_grant(grant: Grant, as_of: date) -> GrantVestingSummary:
         available_to_exercise=available_to_exercise,
         outstanding_options=outstanding,
     )
+
+
+def month_ordinal(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+@dataclass(frozen=True)
+class BatchVestingResult:
+    vested_options: np.ndarray
+    unvested_options: np.ndarray
+    exercised_options: np.ndarray
+    available_to_exercise: np.ndarray
+    outstanding_options: np.ndarray
+
+
+def compute_vesting_batch(
+    *,
+    total_options: np.ndarray,
+    start_month_ordinals: np.ndarray,
+    start_days: np.ndarray,
+    cliff_months: np.ndarray,
+    vesting_months: np.ndarray,
+    vesting_frequency_months: np.ndarray,
+    exercised_options: np.ndarray,
+    as_of: date,
+) -> BatchVestingResult:
+    """Vectorized equivalent of `vested_options_for_grant` + `summarize_grant` over column arrays.
+
+    `start_month_ordinals` are `month_ordinal(vesting_start_date)` and `start_days` the day of month,
+    so complete months can be derived without materializing `date` objects. `exercised_options`
+    holds each grant's exercised total as of `as_of`.
+    """
+    total = np.asarray(total_options, dtype=np.int64)
+    start_months = np.asarray(start_month_ordinals, dtype=np.int64)
+    days = np.asarray(start_days, dtype=np.int64)
+    cliff = np.asarray(cliff_months, dtype=np.int64)
+    vesting = np.asarray(vesting_months, dtype=np.int64)
+    frequency = np.maximum(np.asarray(vesting_frequency_months, dtype=np.int64), 1)
+    exercised_raw = np.asarray(exercised_options, dtype=np.int64)
+
+    complete_months = (month_ordinal(as_of) - start_months) - (as_of.day < days)
+    started = complete_months >= 0
+
+    total_periods = vesting // frequency
+    elapsed_periods = np.maximum(np.minimum(complete_months, vesting) // frequency, 0)
+    cliff_periods = cliff // frequency
+    vested_periods = np.minimum(elapsed_periods, total_periods)
+
+    partially_vested = (total * vested_periods) // np.maximum(total_periods, 1)
+    vested = np.where(vested_periods >= total_periods, total, partially_vested)
+    vested = np.where(started & (elapsed_periods >= cliff_periods), vested, 0)
+
+    exercised = np.minimum(exercised_raw, total)
+    return BatchVestingResult(
+        vested_options=vested,
+        unvested_options=np.maximum(total - vested, 0),
+        exercised_options=exercised,
+        available_to_exercise=np.maximum(vested - exercised, 0),
+        outstanding_options=np.maximum(total - exercised, 0),
+    )
+
+
+def _int_column(values, count: int) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64, count=count)
+
+
+def summarize_grants(
+    grants: Sequence[Grant], as_of: date, exercised: Sequence[int] | None = None
+) -> list[GrantVestingSummary]:
+    """Batch `summarize_grant`; pass `exercised` (per grant, as of `as_of`) to skip summing `grant.exercises`."""
+    if not grants:
+        return []
+
+    count = len(grants)
+    result = compute_vesting_batch(
+        total_options=_int_column((grant.total_options for grant in grants), count),
+        start_month_ordinals=_int_column((month_ordinal(grant.vesting_start_date) for grant in grants), count),
+        start_days=_int_column((grant.vesting_start_date.day for grant in grants), count),
+        cliff_months=_int_column((grant.cliff_months for grant in grants), count),
+        vesting_months=_int_column((grant.vesting_months for grant in grants), count),
+        vesting_frequency_months=_int_column((grant.vesting_frequency_months for grant in grants), count),
+        exercised_options=_int_column(
+            exercised
+            if exercised is not None
+            else (sum(ex.options_exercised for ex in grant.exercises if ex.exercise_date <= as_of) for grant in grants),
+            count,
+        ),
+        as_of=as_of,
+    )
+
+    vested = result.vested_options.tolist()
+    unvested = result.unvested_options.tolist()
+    exercised = result.exercised_options.tolist()
+    available = result.available_to_exercise.tolist()
+    outstanding = result.outstanding_options.tolist()
+
+    return [
+        GrantVestingSummary(
+            grant_id=grant.id,
+            employee_id=grant.employee_id,
+            employee_name=grant.employee.full_name,
+            grant_name=grant.grant_name,
+            as_of=as_of,
+            total_options=grant.total_options,
+            vested_options=vested[index],
+            unvested_options=unvested[index],
+            exercised_options=exercised[index],
+            available_to_exercise=available[index],
+            outstanding_options=outstanding[index],
+        )
+        for index, grant in enumerate(grants)
+    ]
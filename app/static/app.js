@@ -4,6 +4,7 @@ const state = {
   employees: [],
   grants: [],
   dashboard: null,
+  grantSummaries: [],
   employeeSearch: "",
   employeeStatus: "all",
   grantSearch: "",
@@ -76,7 +77,7 @@ const els = {
   exerciseTableBody: document.getElementById("exerciseTableBody"),
 };
 
-async function api(path, options = {}) {
+async function apiResponse(path, options = {}) {
   const response = await fetch(path, {
     headers: { "Content-Type": "application/json" },
     ...options,
@@ -88,11 +89,16 @@ async function api(path, options = {}) {
     throw new Error("Session expired. Please sign in again.");
   }
 
-  if (!response.ok) {
+  if (!response.ok && response.status !== 304) {
     const data = await response.json().catch(() => ({}));
     throw new Error(data.detail || `Request failed (${response.status})`);
   }
 
+  return response;
+}
+
+async function api(path, options = {}) {
+  const response = await apiResponse(path, options);
   if (response.status === 204) {
     return null;
   }
@@ -100,17 +106,74 @@ async function api(path, options = {}) {
   return response.json();
 }
 
+function nextPageUrl(response) {
+  const link = response.headers.get("Link") || "";
+  const match = link.match(/<([^>]+)>\s*;\s*rel="next"/);
+  return match ? match[1] : null;
+}
+
+// url -> { etag, data, next } for reads revalidated with If-None-Match, least recently used first.
+const conditionalCache = new Map();
+const CONDITIONAL_CACHE_LIMIT = 200;
+
+function rememberConditional(path, entry) {
+  conditionalCache.delete(path);
+  conditionalCache.set(path, entry);
+  while (conditionalCache.size > CONDITIONAL_CACHE_LIMIT) {
+    conditionalCache.delete(conditionalCache.keys().next().value);
+  }
+}
+
+async function conditionalGet(path) {
+  const cached = conditionalCache.get(path);
+  const response = await apiResponse(path, {
+    headers: cached ? { "If-None-Match": cached.etag } : {},
+    cache: "no-store",
+  });
+  if (response.status === 304 && cached) {
+    rememberConditional(path, cached);
+    return cached;
+  }
+
+  const entry = { etag: response.headers.get("ETag"), data: await response.json(), next: nextPageUrl(response) };
+  if (entry.etag) {
+    rememberConditional(path, entry);
+  }
+  return entry;
+}
+
+async function cachedApi(path) {
+  return (await conditionalGet(path)).data;
+}
+
 async function fetchAllPaginated(path, pageSize = 200) {
   const results = [];
-  let offset = 0;
+  let url = `${path}?limit=${pageSize}`;
+
+  while (url) {
+    const page = await conditionalGet(url);
+    results.push(...page.data);
+    url = page.next;
+  }
+
+  return results;
+}
+
+async function fetchAllCursorPages(path, params = {}, pageSize = 500) {
+  const results = [];
+  let cursor = null;
 
   while (true) {
-    const page = await api(`${path}?limit=${pageSize}&offset=${offset}`);
-    results.push(...page);
-    if (page.length < pageSize) {
+    const query = new URLSearchParams({ ...params, limit: String(pageSize) });
+    if (cursor) {
+      query.set("after", cursor);
+    }
+    const page = await cachedApi(`${path}?${query.toString()}`);
+    results.push(...page.items);
+    if (!page.next_cursor) {
       break;
     }
-    offset += pageSize;
+    cursor = page.next_cursor;
   }
 
   return results;
@@ -181,10 +244,7 @@ function getEmployeeById(employeeId) {
 }
 
 function getSummaryByGrantId(grantId) {
-  if (!state.dashboard) {
-    return null;
-  }
-  return state.dashboard.grant_summaries.find((summary) => summary.grant_id === grantId) || null;
+  return state.grantSummaries.find((summary) => summary.grant_id === grantId) || null;
 }
 
 function normalizeScreen(screen) {
@@ -294,7 +354,7 @@ function renderMetrics() {
 }
 
 function renderDashboardGrants() {
-  const rows = state.dashboard?.grant_summaries || [];
+  const rows = state.grantSummaries;
   if (!rows.length) {
     els.dashboardGrantTableBody.innerHTML = '<tr><td class="empty" colspan="6">No grants created yet.</td></tr>';
     return;
@@ -444,7 +504,7 @@ async function loadExerciseHistory(grantId) {
     return;
   }
 
-  const data = await api(`/api/grants/${grantId}/exercises`);
+  const data = await cachedApi(`/api/grants/${grantId}/exercises`);
   state.exerciseHistory = data;
   renderExerciseHistory();
 }
@@ -485,15 +545,17 @@ function renderExerciseHistory() {
 }
 
 async function refreshCoreData() {
-  const [employees, grants, dashboard] = await Promise.all([
+  const [employees, grants, dashboard, grantSummaries] = await Promise.all([
     fetchAllPaginated("/api/employees"),
     fetchAllPaginated("/api/grants"),
-    api(`/api/dashboard/summary?as_of=${state.asOf}`),
+    cachedApi(`/api/dashboard/summary?as_of=${state.asOf}`),
+    fetchAllCursorPages("/api/dashboard/grant-summaries", { as_of: state.asOf }),
   ]);
 
   state.employees = employees;
   state.grants = grants;
   state.dashboard = dashboard;
+  state.grantSummaries = grantSummaries;
 
   const hasSelectedGrant = state.grants.some((grant) => grant.id === state.selectedExerciseGrantId);
   if (!hasSelectedGrant) {
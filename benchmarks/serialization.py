@@ -0,0 +1,47 @@
+"""DashboardSummary serialization: `python -m benchmarks.serialization`."""
+import argparse
+import json
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas import DashboardSummary
+from benchmarks.timing import best_seconds
+
+SUMMARY = DashboardSummary(
+    as_of=date(2025, 6, 15),
+    total_employees=48_211,
+    active_employees=44_390,
+    total_grants=1_000_000,
+    pool_size=10_000_000_000,
+    pool_allocated=3_128_450_150,
+    pool_remaining=6_871_549_850,
+    vested_options=2_004_118_337,
+    unvested_options=1_124_331_813,
+    exercised_options=402_778_120,
+)
+
+
+def run(iterations: int = 50_000, repeat: int = 3) -> dict[str, float]:
+    """Microseconds per serialization: the cached-response path and FastAPI's default response_model path."""
+    cases = {
+        "model_dump_json": lambda: SUMMARY.model_dump_json().encode("utf-8"),
+        "jsonable_encoder": lambda: json.dumps(jsonable_encoder(SUMMARY), separators=(",", ":")).encode("utf-8"),
+    }
+    results = {}
+    for name, case in cases.items():
+        seconds = best_seconds(lambda: [case() for _ in range(iterations)], repeat)
+        results[f"dashboard_summary.{name}"] = round(seconds / iterations * 1_000_000, 3)
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args(argv)
+    for name, overhead in run(args.iterations).items():
+        print(f"{name:>36}: {overhead:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
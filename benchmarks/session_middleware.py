@@ -0,0 +1,88 @@
+"""Per-request overhead of SignedSessionMiddleware: `python -m benchmarks.session_middleware`."""
+import argparse
+import asyncio
+import time
+
+from app.core.session import SignedSessionMiddleware
+from benchmarks.timing import best_seconds
+
+SECRET = "benchmark-secret"
+
+
+async def _endpoint(scope, receive, send) -> None:
+    if scope["path"] == "/login":
+        scope["session"]["user_id"] = scope["session"].get("user_id", 0) + 1
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(_message) -> None:
+    return None
+
+
+def _scope(path: str, cookie: bytes | None) -> dict:
+    headers = [
+        (b"host", b"localhost"),
+        (b"user-agent", b"Mozilla/5.0 (benchmark)"),
+        (b"accept", b"application/json"),
+        (b"accept-encoding", b"gzip, deflate, br"),
+    ]
+    if cookie is not None:
+        headers.append((b"cookie", b"_ga=GA1.1.123456789.1700000000; theme=dark; esop_session=" + cookie))
+    return {"type": "http", "method": "GET", "path": path, "headers": headers}
+
+
+async def _time_requests(app, path: str, cookie: bytes | None, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(_scope(path, cookie), _receive, _send)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def _measure(iterations: int) -> dict[str, float]:
+    middleware = SignedSessionMiddleware(_endpoint, secret_key=SECRET)
+    cookie = middleware._encode({"user_id": 42, "email": "someone@example.com"}, int(time.time()))
+
+    baseline = await _time_requests(_endpoint, "/", None, iterations)
+    results = {
+        "no_cookie": await _time_requests(middleware, "/", None, iterations),
+        "unchanged_session": await _time_requests(middleware, "/", cookie, iterations),
+        "modified_session": await _time_requests(middleware, "/login", cookie, iterations),
+    }
+    return {name: round(value - baseline, 3) for name, value in results.items()}
+
+
+def run(iterations: int = 20_000) -> dict[str, float]:
+    """Microseconds the middleware adds per request, over a bare ASGI app, for each session state."""
+    return asyncio.run(_measure(iterations))
+
+
+def run_codec(iterations: int = 50_000, repeat: int = 3) -> dict[str, float]:
+    """Microseconds to sign and serialize a session cookie, and to verify and load one."""
+    middleware = SignedSessionMiddleware(_endpoint, secret_key=SECRET)
+    session = {"user_id": 42, "email": "someone@example.com"}
+    issued_at = int(time.time())
+    cookie = middleware._encode(session, issued_at)
+    cases = {
+        "encode": lambda: [middleware._encode(session, issued_at) for _ in range(iterations)],
+        "decode": lambda: [middleware._decode(cookie) for _ in range(iterations)],
+    }
+    return {name: round(best_seconds(case, repeat) / iterations * 1_000_000, 3) for name, case in cases.items()}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args(argv)
+    for name, overhead in run(args.iterations).items():
+        print(f"{name:>18}: {overhead:8.2f} us/request")
+    for name, overhead in run_codec(args.iterations).items():
+        print(f"{name:>18}: {overhead:8.2f} us/cookie")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark suite with JSON baselines: `python -m benchmarks.suite run|compare`.
+
+`run` measures every benchmark and can save the results (`--save`) or check them against a
+baseline (`--against`); `compare` checks two saved result files. Both exit with status 1 when a
+benchmark got slower than its baseline by more than `--threshold`.
+
+Timings only compare on the host that recorded them, so no baseline is shipped: record one
+locally with `run --save` before changing the code, then check the change with `--against`.
+"""
+import argparse
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks import serialization, session_middleware, vesting
+
+# Local, git-ignored location for the baseline recorded on this host.
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "baseline.json"
+# Relative slowdown treated as a regression; timings on a quiet machine vary by a few percent.
+DEFAULT_THRESHOLD = 0.2
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    unit: str
+    baseline: float
+    current: float
+
+    @property
+    def comparable(self) -> bool:
+        """A zero (or negative) baseline, e.g. a path too fast to measure, has no meaningful ratio."""
+        return self.baseline > 0
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def regressed(self, threshold: float) -> bool:
+        return self.comparable and self.ratio > 1 + threshold
+
+
+def collect(*, sizes: tuple[int, ...] = vesting.SIZES, repeat: int = 3, iterations: int = 50_000) -> dict[str, dict]:
+    """Every benchmark as `{name: {"value": ..., "unit": ...}}`; lower is better for all of them."""
+    groups = [
+        ("vesting", "ms", vesting.run(sizes, repeat)),
+        ("session.middleware", "us", session_middleware.run(iterations)),
+        ("session.cookie", "us", session_middleware.run_codec(iterations, repeat)),
+        ("serialization", "us", serialization.run(iterations, repeat)),
+    ]
+    return {
+        f"{prefix}.{name}": {"value": value, "unit": unit}
+        for prefix, unit, results in groups
+        for name, value in results.items()
+    }
+
+
+def environment() -> dict[str, str]:
+    import numpy
+    import pydantic
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "pydantic": pydantic.__version__,
+    }
+
+
+def save(path: Path, results: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2) + "\n", encoding="utf-8")
+
+
+def load(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def compare(baseline: dict[str, dict], current: dict[str, dict]) -> list[Comparison]:
+    """Benchmarks present in both sets; those with a non-positive baseline are kept but not `comparable`."""
+    return [
+        Comparison(name=name, unit=result["unit"], baseline=baseline[name]["value"], current=result["value"])
+        for name, result in current.items()
+        if name in baseline
+    ]
+
+
+def report(comparisons: list[Comparison], threshold: float) -> int:
+    regressions = [comparison for comparison in comparisons if comparison.regressed(threshold)]
+    skipped = [comparison.name for comparison in comparisons if not comparison.comparable]
+    for comparison in comparisons:
+        if not comparison.comparable:
+            change, flag = "", "SKIPPED (baseline is not positive)"
+        else:
+            change, flag = f"({comparison.ratio - 1:+7.1%})", "REGRESSION" if comparison.regressed(threshold) else ""
+        print(
+            f"{comparison.name:>52}: {comparison.baseline:12.3f} -> {comparison.current:12.3f} {comparison.unit:<2} "
+            f"{change} {flag}".rstrip()
+        )
+    compared = len(comparisons) - len(skipped)
+    print(f"{len(regressions)} of {compared} benchmark(s) slower than baseline by more than {threshold:.0%}")
+    if skipped:
+        print(f"{len(skipped)} benchmark(s) not compared, baseline is not positive: {', '.join(skipped)}")
+    return 1 if regressions else 0
+
+
+def _print_results(results: dict[str, Any]) -> None:
+    for name, result in results.items():
+        print(f"{name:>52}: {result['value']:12.3f} {result['unit']}")
+
+
+def _run(args: argparse.Namespace) -> int:
+    results = collect(sizes=tuple(args.sizes), repeat=args.repeat, iterations=args.iterations)
+    if args.save:
+        save(args.save, results)
+    if args.against:
+        return report(compare(load(args.against), results), args.threshold)
+    _print_results(results)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    return report(compare(load(args.baseline), load(args.current)), args.threshold)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure every benchmark")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(vesting.SIZES), help="Grant counts")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the fastest is kept")
+    run_parser.add_argument("--iterations", type=int, default=50_000, help="Calls per session/serialization run")
+    run_parser.add_argument("--save", type=Path, help=f"Write results as a baseline, e.g. {DEFAULT_BASELINE}")
+    run_parser.add_argument(
+        "--against", type=Path, help="Baseline recorded on this host with --save (none is shipped) to compare with"
+    )
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_parser.set_defaults(handler=_run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.set_defaults(handler=_compare)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Vesting hot paths over 1k/100k/1M grants: `python -m benchmarks.vesting`."""
+import argparse
+import random
+from datetime import date, timedelta
+
+from app.models import Employee, Exercise, Grant
+from app.services.synthetic import VESTING_PLANS
+from app.services.vesting import complete_months_between, summarize_grant, summarize_grants, vested_options_for_grant
+from benchmarks.timing import best_seconds
+
+SIZES = (1_000, 100_000, 1_000_000)
+AS_OF = date(2025, 6, 15)
+# At this size one run takes seconds and is already stable, so it is not repeated.
+SINGLE_RUN_SIZE = 1_000_000
+# Larger runs cycle through this many distinct transient grants instead of building a million ORM objects.
+DISTINCT_GRANTS = 10_000
+
+
+def build_grants(count: int, seed: int = 0) -> list[Grant]:
+    """Transient grants with an employee and zero to two exercises each, like a loaded dashboard."""
+    rng = random.Random(seed)
+    distinct = []
+    for index in range(min(count, DISTINCT_GRANTS)):
+        cliff, vesting, frequency, _ = rng.choice(VESTING_PLANS)
+        start = date(2018, 1, 1) + timedelta(days=rng.randrange(2_500))
+        total = rng.randrange(100, 50_000)
+        employee = Employee(
+            id=index + 1,
+            employee_code=f"B-{index:06d}",
+            full_name=f"Benchmark Employee {index}",
+            email=f"bench.{index}@example.com",
+            joining_date=start,
+        )
+        distinct.append(
+            Grant(
+                id=index + 1,
+                employee_id=employee.id,
+                employee=employee,
+                grant_name="Benchmark grant",
+                grant_date=start,
+                total_options=total,
+                strike_price_cents=100,
+                vesting_start_date=start,
+                cliff_months=cliff,
+                vesting_months=vesting,
+                vesting_frequency_months=frequency,
+                exercises=[
+                    Exercise(
+                        exercise_date=start + timedelta(days=400 + 200 * number),
+                        options_exercised=total // 10,
+                        price_per_option_cents=100,
+                    )
+                    for number in range(rng.randrange(3))
+                ],
+            )
+        )
+    return [distinct[index % len(distinct)] for index in range(count)]
+
+
+def run(sizes: tuple[int, ...] = SIZES, repeat: int = 3) -> dict[str, float]:
+    """Milliseconds to process N grants with each function, best of `repeat` runs (one run from a million)."""
+    results: dict[str, float] = {}
+    for size in sizes:
+        grants = build_grants(size)
+        cases = {
+            "complete_months_between": lambda: [complete_months_between(g.vesting_start_date, AS_OF) for g in grants],
+            "vested_options_for_grant": lambda: [vested_options_for_grant(g, AS_OF) for g in grants],
+            "summarize_grant": lambda: [summarize_grant(g, AS_OF) for g in grants],
+            "summarize_grants": lambda: summarize_grants(grants, AS_OF),
+        }
+        for name, case in cases.items():
+            runs = 1 if size >= SINGLE_RUN_SIZE else repeat
+            results[f"{name}[{size}]"] = round(best_seconds(case, runs) * 1000, 3)
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    for name, milliseconds in run(tuple(args.sizes), args.repeat).items():
+        print(f"{name:>36}: {milliseconds:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
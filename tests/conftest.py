@@ -1,36 +1,100 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 import sys
 from types import SimpleNamespace
 
 import pytest
+from fastapi import Request
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from app.api.deps import get_current_user, get_current_user_optional, get_db_session
-from app.core.database import Base
+from app.api.deps import (
+    get_async_db_session,
+    get_current_user,
+    get_current_user_optional,
+    get_db_session,
+    get_read_db_session,
+)
+from app.api.profiling import _profiling_requested, get_profiling_admin
+from app.core.cache import identity_cache, response_cache
+from app.core.config import get_settings
+from app.core.database import Base, create_async_database_engine, create_database_engine, read_only_database_url
 from app.main import app
 from app.models import UserRole
 
 
 @pytest.fixture()
-def client(tmp_path) -> Generator[TestClient, None, None]:
+def engine(tmp_path) -> Generator[Engine, None, None]:
     test_db_path = tmp_path / "test.db"
     engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
-    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
-
     Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+
+
+@pytest.fixture()
+def async_session_factory(engine) -> Generator[async_sessionmaker, None, None]:
+    async_engine = create_async_database_engine(engine.url.render_as_string(hide_password=False))
+    yield async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture()
+def read_session_factory(engine) -> Generator[sessionmaker, None, None]:
+    """Sessions on the production read-only engine (`mode=ro`, `query_only`), so a read route that writes fails."""
+    read_engine = create_database_engine(
+        read_only_database_url(engine.url.render_as_string(hide_password=False)), read_only=True
+    )
+    yield sessionmaker(bind=read_engine, autocommit=False, autoflush=False, class_=Session)
+    read_engine.dispose()
+
+
+@pytest.fixture()
+def db_session(session_factory) -> Generator[Session, None, None]:
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture()
+def client(session_factory, read_session_factory, async_session_factory, monkeypatch) -> Generator[TestClient, None, None]:
+    # Routes declaring @query_budget fail the test when a request runs more statements than allowed.
+    monkeypatch.setattr(get_settings(), "enforce_query_budgets", True)
+    response_cache.clear()
+    identity_cache.clear()
 
     def override_get_db() -> Generator[Session, None, None]:
-        db = TestingSessionLocal()
+        db = session_factory()
         try:
             yield db
         finally:
             db.close()
 
+    def override_get_read_db() -> Generator[Session, None, None]:
+        db = read_session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as db:
+            yield db
+
     fake_admin = SimpleNamespace(
         id=1,
         email="admin@company.com",
@@ -39,12 +103,17 @@ def client(tmp_path) -> Generator[TestClient, None, None]:
         employee_id=None,
     )
 
+    def profiling_admin(request: Request) -> SimpleNamespace | None:
+        return fake_admin if _profiling_requested(request) else None
+
     app.dependency_overrides[get_db_session] = override_get_db
+    app.dependency_overrides[get_read_db_session] = override_get_read_db
+    app.dependency_overrides[get_async_db_session] = override_get_async_db
     app.dependency_overrides[get_current_user] = lambda: fake_admin
     app.dependency_overrides[get_current_user_optional] = lambda: fake_admin
+    app.dependency_overrides[get_profiling_admin] = profiling_admin
 
     with TestClient(app) as test_client:
         yield test_client
 
     app.dependency_overrides.clear()
-    Base.metadata.drop_all(bind=engine)
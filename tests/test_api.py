@@ -1,7 +1,9 @@
+import json
 from types import SimpleNamespace
 from datetime import date, datetime, timezone
 
 from app.api.deps import get_current_employee_record, get_current_user, get_current_user_optional
+from app.api.pagination import encode_id_cursor
 from app.main import app
 from app.models import UserRole
 
@@ -174,3 +176,185 @@ def test_employee_role_is_read_only_and_scoped(client) -> None:
         app.dependency_overrides.pop(get_current_user, None)
         app.dependency_overrides.pop(get_current_user_optional, None)
         app.dependency_overrides.pop(get_current_employee_record, None)
+
+
+def test_dashboard_aggregates_respect_as_of(client) -> None:
+    grant_ids = []
+    for index in range(3):
+        employee = client.post(
+            "/api/employees",
+            json={
+                "employee_code": f"E-30{index}",
+                "full_name": f"Pool Member {index}",
+                "email": f"pool{index}@example.com",
+                "joining_date": "2023-01-01",
+                "status": "active",
+            },
+        )
+        grant = client.post(
+            "/api/grants",
+            json={
+                "employee_id": employee.json()["id"],
+                "grant_name": f"Pool Grant {index}",
+                "grant_date": "2023-01-01",
+                "total_options": 1200 * (index + 1),
+                "strike_price_cents": 100,
+                "vesting_start_date": "2023-01-01",
+                "cliff_months": 12,
+                "vesting_months": 48,
+                "vesting_frequency_months": 1,
+                "notes": None,
+            },
+        )
+        grant_ids.append(grant.json()["id"])
+
+    for exercise_date in ("2024-02-01", "2025-02-01"):
+        response = client.post(
+            f"/api/grants/{grant_ids[0]}/exercises",
+            json={"exercise_date": exercise_date, "options_exercised": 100, "price_per_option_cents": 100},
+        )
+        assert response.status_code == 201
+
+    dashboard = client.get("/api/dashboard/summary", params={"as_of": "2024-06-01"}).json()
+    assert dashboard["total_grants"] == 3
+    assert dashboard["pool_allocated"] == 7200
+    assert dashboard["vested_options"] == sum(1200 * n * 17 // 48 for n in (1, 2, 3))
+    assert dashboard["exercised_options"] == 100
+    assert dashboard["unvested_options"] == 7200 - dashboard["vested_options"]
+    assert "grant_summaries" not in dashboard
+
+    first_page = client.get("/api/dashboard/grant-summaries", params={"as_of": "2024-06-01", "limit": 2}).json()
+    assert [row["grant_id"] for row in first_page["items"]] == sorted(grant_ids, reverse=True)[:2]
+    second_page = client.get(
+        "/api/dashboard/grant-summaries",
+        params={"as_of": "2024-06-01", "limit": 2, "after": first_page["next_cursor"]},
+    ).json()
+    assert [row["grant_id"] for row in second_page["items"]] == [min(grant_ids)]
+    assert second_page["next_cursor"] is None
+
+    by_available = []
+    cursor = None
+    while True:
+        params = {"as_of": "2024-06-01", "limit": 1, "sort": "available"}
+        if cursor:
+            params["after"] = cursor
+        page = client.get("/api/dashboard/grant-summaries", params=params).json()
+        by_available.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    available = [row["available_to_exercise"] for row in by_available]
+    assert available == sorted(available, reverse=True)
+    assert len(by_available) == 3
+
+    not_exercisable = client.get(
+        "/api/dashboard/grant-summaries", params={"as_of": "2023-06-01", "exercisable": "true"}
+    ).json()
+    assert not_exercisable["items"] == []
+
+    bad_cursor = client.get("/api/dashboard/grant-summaries", params={"after": "not-a-cursor"})
+    assert bad_cursor.status_code == 400
+    other_date = client.get(
+        "/api/dashboard/grant-summaries",
+        params={"as_of": "2025-06-01", "limit": 2, "after": first_page["next_cursor"]},
+    )
+    assert other_date.status_code == 400
+    other_sort = client.get(
+        "/api/dashboard/grant-summaries",
+        params={"as_of": "2024-06-01", "limit": 2, "sort": "vested", "after": first_page["next_cursor"]},
+    )
+    assert other_sort.status_code == 400
+
+
+
+def test_cap_table_export_streams_csv_and_ndjson(client) -> None:
+    grant_ids = []
+    for index in range(3):
+        employee = client.post(
+            "/api/employees",
+            json={
+                "employee_code": f"E-50{index}",
+                "full_name": f"Export Member {index}",
+                "email": f"export{index}@example.com",
+                "joining_date": "2023-01-01",
+                "status": "active",
+            },
+        )
+        grant = client.post(
+            "/api/grants",
+            json={
+                "employee_id": employee.json()["id"],
+                "grant_name": f"Export Grant {index}",
+                "grant_date": "2023-01-01",
+                "total_options": 1200 * (index + 1),
+                "strike_price_cents": 100,
+                "vesting_start_date": "2023-01-01",
+                "cliff_months": 12,
+                "vesting_months": 48,
+                "vesting_frequency_months": 1,
+                "notes": None,
+            },
+        )
+        grant_ids.append(grant.json()["id"])
+    exercise = client.post(
+        f"/api/grants/{grant_ids[0]}/exercises",
+        json={"exercise_date": "2024-02-01", "options_exercised": 100, "price_per_option_cents": 100},
+    )
+    assert exercise.status_code == 201
+
+    csv_export = client.get("/api/exports/cap-table", params={"as_of": "2024-06-01", "batch_size": 100})
+    assert csv_export.status_code == 200
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    assert csv_export.headers["content-disposition"] == 'attachment; filename="cap-table-2024-06-01.csv"'
+    lines = csv_export.text.splitlines()
+    assert lines[0].startswith("grant_id,employee_id,employee_name")
+    assert len(lines) == 4
+
+    ndjson_export = client.get("/api/exports/cap-table", params={"as_of": "2024-06-01", "format": "ndjson"})
+    assert ndjson_export.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in ndjson_export.text.splitlines()]
+    assert sum(row["vested_options"] for row in exported) == sum(1200 * n * 17 // 48 for n in (1, 2, 3))
+    assert {row["grant_id"]: row for row in exported}[grant_ids[0]]["exercised_options"] == 100
+
+
+def test_list_endpoints_follow_keyset_cursor(client) -> None:
+    created_ids = []
+    for index in range(5):
+        response = client.post(
+            "/api/employees",
+            json={
+                "employee_code": f"E-40{index}",
+                "full_name": f"Cursor Member {index}",
+                "email": f"cursor{index}@example.com",
+                "joining_date": "2024-01-01",
+                "status": "active",
+            },
+        )
+        created_ids.append(response.json()["id"])
+
+    seen = []
+    url = "/api/employees?limit=2"
+    while url:
+        page = client.get(url)
+        assert page.status_code == 200
+        seen.extend(row["id"] for row in page.json())
+        link = page.headers.get("link")
+        url = link[1 : link.index(">")] if link else None
+    assert seen == sorted(created_ids, reverse=True)
+
+    offset_page = client.get("/api/employees", params={"limit": 2, "offset": 2})
+    assert [row["id"] for row in offset_page.json()] == sorted(created_ids, reverse=True)[2:4]
+
+    empty_grants = client.get("/api/grants", params={"limit": 2})
+    assert empty_grants.json() == []
+    assert "link" not in empty_grants.headers
+
+    bool_cursor = client.get("/api/employees", params={"after": encode_id_cursor(True)})
+    assert bool_cursor.status_code == 400
+
+    cursor = encode_id_cursor(created_ids[-1])
+    for path in ("/api/employees", "/api/grants"):
+        both = client.get(path, params={"after": cursor, "offset": 2})
+        assert both.status_code == 400
+        assert both.json()["detail"] == "Pass either after or offset, not both"
+        assert client.get(path, params={"after": cursor, "offset": 0}).status_code == 200
@@ -0,0 +1,41 @@
+from benchmarks import suite
+
+
+def test_suite_runs_and_saves_comparable_results(tmp_path) -> None:
+    results = suite.collect(sizes=(10,), repeat=1, iterations=10)
+    assert {"vesting.summarize_grants[10]", "session.cookie.decode", "serialization.dashboard_summary.model_dump_json"} <= set(
+        results
+    )
+
+    baseline = tmp_path / "baseline.json"
+    suite.save(baseline, results)
+    assert suite.load(baseline) == results
+    assert suite.main(["compare", str(baseline), str(baseline)]) == 0
+
+
+def test_compare_flags_slowdowns_beyond_the_threshold(tmp_path, capsys) -> None:
+    baseline = {
+        "vesting.summarize_grant[1000]": {"value": 10.0, "unit": "ms"},
+        "session.cookie.encode": {"value": 4.0, "unit": "us"},
+        "session.middleware.no_cookie": {"value": 0.0, "unit": "us"},
+    }
+    current = {
+        "vesting.summarize_grant[1000]": {"value": 11.5, "unit": "ms"},
+        "session.cookie.encode": {"value": 6.0, "unit": "us"},
+        "session.middleware.no_cookie": {"value": 1.0, "unit": "us"},
+        "serialization.dashboard_summary.model_dump_json": {"value": 2.0, "unit": "us"},
+    }
+
+    comparisons = suite.compare(baseline, current)
+    assert [comparison.name for comparison in comparisons] == [
+        "vesting.summarize_grant[1000]",
+        "session.cookie.encode",
+        "session.middleware.no_cookie",
+    ]
+    assert [comparison.regressed(0.2) for comparison in comparisons] == [False, True, False]
+    assert suite.report(comparisons, 0.2) == 1
+    output = capsys.readouterr().out
+    assert "REGRESSION" in output
+    assert "1 of 2 benchmark(s) slower" in output
+    assert "not compared, baseline is not positive: session.middleware.no_cookie" in output
+    assert suite.report(comparisons, 0.6) == 0
@@ -0,0 +1,109 @@
+import json
+from datetime import date
+
+from app.api.routes import imports as import_routes
+from app.models import Employee, Grant
+from app.schemas import ImportFormat
+from app.services.bulk_import import import_grants, parse_import_rows
+from app.services.pool import get_pool_snapshot
+
+EMPLOYEES_CSV = """employee_code,full_name,email,joining_date,status
+E-7001,Import One,one@example.com,2024-01-01,active
+E-7002,Import Two,two@example.com,2024-02-01,
+E-7001,Duplicate Code,dupe@example.com,2024-01-01,active
+E-7003,Bad Date,three@example.com,not-a-date,active
+E-7004,Admin Self,admin@company.com,2024-01-01,active
+E-7005,Former,former@example.com,2023-01-01,inactive
+"""
+
+
+def test_employee_csv_import_reports_row_errors(client) -> None:
+    response = client.post("/api/imports/employees", content=EMPLOYEES_CSV, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 6
+    assert report["inserted"] == 3
+    assert [(error["row"], error["detail"]) for error in report["errors"]][0] == (3, "Employee code already exists")
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+
+    employees = client.get("/api/employees").json()
+    assert {employee["employee_code"] for employee in employees} == {"E-7001", "E-7002", "E-7005"}
+    assert next(e for e in employees if e["employee_code"] == "E-7002")["status"] == "active"
+
+    again = client.post("/api/imports/employees?format=csv", content=EMPLOYEES_CSV).json()
+    assert again["inserted"] == 0
+
+
+def test_grant_json_import_checks_employees_and_pool(client) -> None:
+    client.post("/api/imports/employees", content=EMPLOYEES_CSV, headers={"Content-Type": "text/csv"})
+    grant = {
+        "grant_name": "Imported",
+        "grant_date": "2024-01-01",
+        "strike_price_cents": 100,
+        "vesting_start_date": "2024-01-01",
+    }
+    rows = [
+        {**grant, "employee_code": "E-7001", "total_options": 600_000},
+        {**grant, "employee_code": "E-7002", "total_options": 500_000},
+        {**grant, "employee_code": "E-7005", "total_options": 10},
+        {**grant, "employee_code": "E-9999", "total_options": 10},
+        {**grant, "employee_code": "E-7002", "total_options": 400_000},
+        {**grant, "employee_code": "E-7002", "total_options": 0},
+    ]
+    response = client.post("/api/imports/grants", json=rows)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 2
+    details = {error["row"]: error["detail"] for error in report["errors"]}
+    assert details[2] == "Grant exceeds available ESOP pool"
+    assert details[3] == "Cannot assign grants to inactive employees"
+    assert details[4] == "Employee not found"
+    assert 6 in details
+
+    dashboard = client.get("/api/dashboard/summary").json()
+    assert dashboard["pool_allocated"] == 1_000_000
+    assert dashboard["pool_remaining"] == 0
+
+
+def test_import_rejects_malformed_payloads(client) -> None:
+    assert client.post("/api/imports/grants", json={"not": "a list"}).status_code == 400
+    assert client.post("/api/imports/grants", content=b"[]", headers={"Content-Type": "text/plain"}).status_code == 415
+
+
+def test_import_rejects_oversized_bodies(client, monkeypatch) -> None:
+    monkeypatch.setattr(import_routes.settings, "import_max_bytes", 64)
+    response = client.post("/api/imports/employees", content=EMPLOYEES_CSV, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 413
+
+    def chunked():
+        yield EMPLOYEES_CSV.encode("utf-8")
+
+    response = client.post("/api/imports/employees", content=chunked(), headers={"Content-Type": "text/csv"})
+    assert response.status_code == 413
+    assert client.get("/api/employees").json() == []
+
+
+def test_grant_import_commits_in_batches(db_session) -> None:
+    employee = Employee(
+        employee_code="E-7100", full_name="Batch User", email="batch@example.com", joining_date=date(2024, 1, 1)
+    )
+    db_session.add(employee)
+    db_session.commit()
+
+    content = json.dumps(
+        [
+            {
+                "employee_id": employee.id,
+                "grant_name": f"Batch {index}",
+                "grant_date": "2024-01-01",
+                "total_options": 100,
+                "strike_price_cents": 1,
+                "vesting_start_date": "2024-01-01",
+            }
+            for index in range(5)
+        ]
+    )
+    report = import_grants(db_session, parse_import_rows(content, ImportFormat.JSON), pool_size=1_000, batch_size=2)
+    assert report.inserted == 5
+    assert db_session.query(Grant).count() == 5
+    assert get_pool_snapshot(db_session, 1_000).allocated_options == 500
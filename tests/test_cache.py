@@ -0,0 +1,195 @@
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import event, text
+
+from app.api.deps import get_current_employee_record, get_current_user
+from app.core.cache import ResponseCache, identity_cache, response_cache
+from app.core import data_versions
+from app.core.data_versions import CAP_TABLE_SCOPE, IDENTITY_SCOPE, read_data_versions
+from app.models import Employee, User, UserRole
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == b"1234"
+    cache.set("c", b"1234")
+    assert cache.get("b") is None
+
+    cache.set("d", b"12345")
+    assert cache.stats()["bytes"] <= 10
+    assert cache.get("a") is None
+    cache.set("too-big", b"x" * 11)
+    assert cache.get("too-big") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["evictions"]) == (1, 2)
+
+
+def test_data_version_bumps_only_on_committed_writes(db_session) -> None:
+    def current() -> int:
+        return read_data_versions(db_session).get(CAP_TABLE_SCOPE, 0)
+
+    before = current()
+    db_session.add(
+        Employee(employee_code="E-8001", full_name="Versioned", email="versioned@example.com", joining_date=date(2024, 1, 1))
+    )
+    db_session.flush()
+    db_session.rollback()
+    assert current() == before
+
+    db_session.add(
+        Employee(employee_code="E-8001", full_name="Versioned", email="versioned@example.com", joining_date=date(2024, 1, 1))
+    )
+    db_session.commit()
+    assert current() == before + 1
+
+    db_session.query(Employee).all()
+    db_session.commit()
+    assert current() == before + 1
+
+
+def test_data_versions_bump_without_an_upsert_dialect(db_session, monkeypatch) -> None:
+    monkeypatch.setattr(data_versions, "_UPSERT_INSERTS", {})
+    for number in range(2):
+        db_session.add(
+            Employee(
+                employee_code=f"E-802{number}",
+                full_name="Portable",
+                email=f"portable{number}@example.com",
+                joining_date=date(2024, 1, 1),
+            )
+        )
+        db_session.commit()
+    versions = read_data_versions(db_session)
+    assert (versions[CAP_TABLE_SCOPE], versions[IDENTITY_SCOPE]) == (2, 2)
+
+
+def test_dashboard_summary_is_served_from_cache_until_a_write(client) -> None:
+    first = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"})
+    second = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"})
+    assert first.json() == second.json()
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+
+    client.post(
+        "/api/employees",
+        json={
+            "employee_code": "E-8002",
+            "full_name": "Cache Buster",
+            "email": "buster@example.com",
+            "joining_date": "2024-01-01",
+            "status": "active",
+        },
+    )
+    third = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"})
+    assert third.json()["total_employees"] == first.json()["total_employees"] + 1
+    assert response_cache.misses == 2
+
+
+def test_writes_from_another_process_invalidate_cached_responses(client, session_factory) -> None:
+    before = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"}).json()
+
+    # A separate session stands in for another worker (or the CLI) writing to the same database.
+    with session_factory() as other_worker:
+        other_worker.add(
+            Employee(employee_code="E-8003", full_name="Other Worker", email="other@example.com", joining_date=date(2024, 1, 1))
+        )
+        other_worker.commit()
+
+    after = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"}).json()
+    assert after["total_employees"] == before["total_employees"] + 1
+    assert response_cache.hits == 0
+
+
+def test_read_endpoints_answer_if_none_match_with_304(client) -> None:
+    employees = client.get("/api/employees")
+    etag = employees.headers["etag"]
+    assert employees.headers["cache-control"] == "private, no-cache"
+
+    not_modified = client.get("/api/employees", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert client.get("/api/employees?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+    dashboard = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"})
+    misses = response_cache.misses
+    revalidated = client.get(
+        "/api/dashboard/summary", params={"as_of": "2025-01-01"}, headers={"If-None-Match": dashboard.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert (response_cache.hits, response_cache.misses) == (0, misses)
+
+    client.post(
+        "/api/employees",
+        json={
+            "employee_code": "E-8004",
+            "full_name": "Etag Buster",
+            "email": "etag@example.com",
+            "joining_date": "2024-01-01",
+            "status": "active",
+        },
+    )
+    changed = client.get("/api/employees", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_identity_is_loaded_in_one_query_and_cached_until_a_user_write(engine, db_session) -> None:
+    identity_cache.clear()
+    employee = Employee(employee_code="E-8101", full_name="Iris", email="iris@example.com", joining_date=date(2024, 1, 1))
+    db_session.add(employee)
+    db_session.flush()
+    user = User(
+        email="iris@example.com", full_name="Iris", google_sub="sub-iris", role=UserRole.EMPLOYEE, employee_id=employee.id
+    )
+    db_session.add(user)
+    db_session.commit()
+    user_id, employee_id = user.id, employee.id
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    request = SimpleNamespace(session={"user_id": user_id}, state=SimpleNamespace())
+
+    current_user = get_current_user(request, db_session)
+    assert get_current_employee_record(request, current_user, db_session).id == employee_id
+    assert len(statements) == 1
+
+    assert get_current_user(request, db_session) is current_user
+    assert len(statements) == 1
+
+    # A cache hit costs one primary-key lookup of the identity data version.
+    request = SimpleNamespace(session={"user_id": user_id}, state=SimpleNamespace())
+    assert get_current_user(request, db_session).email == "iris@example.com"
+    assert len(statements) == 2
+    assert "data_versions" in statements[-1] and "users" not in statements[-1]
+
+    db_session.get(User, user_id).full_name = "Iris Renamed"
+    db_session.commit()
+    statements.clear()
+    request = SimpleNamespace(session={"user_id": user_id}, state=SimpleNamespace())
+    assert get_current_user(request, db_session).full_name == "Iris Renamed"
+    assert len(statements) == 1
+
+    # Another worker's commit: no in-process invalidation, only a newer identity version.
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE users SET role = 'ADMIN' WHERE id = :id"), {"id": user_id})
+        connection.execute(text("UPDATE data_versions SET version = version + 1 WHERE scope = 'identity'"))
+    db_session.rollback()  # each request reads in a fresh transaction
+    request = SimpleNamespace(session={"user_id": user_id}, state=SimpleNamespace())
+    assert get_current_user(request, db_session).role == UserRole.ADMIN
+
+    # Users without a linked record are matched by email, in an indexed lookup of its own.
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE users SET employee_id = NULL WHERE id = :id"), {"id": user_id})
+        connection.execute(text("UPDATE data_versions SET version = version + 1 WHERE scope = 'identity'"))
+    db_session.rollback()
+    statements.clear()
+    request = SimpleNamespace(session={"user_id": user_id}, state=SimpleNamespace())
+    assert get_current_employee_record(request, get_current_user(request, db_session), db_session).id == employee_id
+    assert len(statements) == 3
+    assert "employees.email" in statements[-1]
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[-1]}", ("iris@example.com",)).all()
+    assert any("USING INDEX" in detail for *_, detail in plan)
@@ -0,0 +1,74 @@
+import gzip
+
+import brotli
+
+from app.core.compression import choose_encoding
+from app.main import static_assets
+
+
+def _create_employees(client, count: int) -> None:
+    for index in range(count):
+        client.post(
+            "/api/employees",
+            json={
+                "employee_code": f"E-90{index:02d}",
+                "full_name": f"Compressed Member {index}",
+                "email": f"compressed{index}@example.com",
+                "joining_date": "2024-01-01",
+                "status": "active",
+            },
+        )
+
+
+def test_choose_encoding_honours_q_values() -> None:
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*") == "br"
+
+
+def test_large_json_responses_are_compressed(client) -> None:
+    _create_employees(client, 20)
+
+    response = client.get("/api/employees", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].endswith('-gzip"')
+    assert len(response.json()) == 20
+
+    revalidated = client.get(
+        "/api/employees", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    plain = client.get("/api/employees", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+
+def test_static_assets_are_fingerprinted_and_precompressed(client) -> None:
+    index = client.get("/", headers={"Accept-Encoding": "br"})
+    assert index.headers["content-encoding"] == "br"
+    assert index.headers["cache-control"] == "no-cache"
+    hashed_url = static_assets.url_for("app.js")
+    assert hashed_url != "/static/app.js"
+    assert hashed_url in index.text
+
+    asset = client.get(hashed_url, headers={"Accept-Encoding": "gzip"})
+    assert asset.status_code == 200
+    assert asset.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert asset.headers["content-encoding"] == "gzip"
+    original = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert original.headers["cache-control"] == "no-cache"
+    assert asset.content == original.content
+
+    stored = static_assets.assets[hashed_url.removeprefix("/static/")]
+    assert gzip.decompress(stored.encoded["gzip"]) == stored.content
+    assert brotli.decompress(stored.encoded["br"]) == stored.content
+
+    not_modified = client.get(hashed_url, headers={"If-None-Match": asset.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert client.get("/static/missing.js").status_code == 404
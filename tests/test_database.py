@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.api.deps import get_async_db_session, get_read_db_session
+from app.api.query_budget import QUERY_BUDGET_ATTR, QueryBudgetExceeded
+from app.api.routes import auth as auth_routes
+from app.api.routes import employees as employee_routes
+from app.core import database
+from app.core.config import Settings
+from app.core.database import create_database_engine, read_only_database_url, track_queries
+from app.core.maintenance import DatabaseMaintenance
+from app.main import app
+from app.models import Employee, User
+
+
+def test_sqlite_performance_profile_is_applied_per_connection(tmp_path) -> None:
+    profile = Settings(sqlite_synchronous="full", sqlite_cache_size_kib=2048, sqlite_busy_timeout_ms=1234)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'profile.db'}", profile)
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 2
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -2048
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+    finally:
+        engine.dispose()
+
+
+def test_maintenance_run_reports_status(tmp_path) -> None:
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'maintenance.db'}", Settings())
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            connection.execute(text("INSERT INTO items (name) VALUES ('a'), ('b')"))
+
+        maintenance = DatabaseMaintenance(engine, interval_seconds=60)
+        maintenance.run_once()
+        maintenance.run_once()
+
+        status = maintenance.status()
+        assert status["enabled"] is True
+        assert status["runs"] == 2
+        assert status["last_error"] is None
+        assert status["last_checkpoint"]["busy"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_health_exposes_maintenance_status(client) -> None:
+    body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert "runs" in body["database_maintenance"]
+
+
+def test_read_only_engine_rejects_writes(tmp_path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'split.db'}"
+    writer = create_database_engine(database_url, Settings())
+    reader = create_database_engine(read_only_database_url(database_url), Settings(), read_only=True)
+    try:
+        with writer.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+        with reader.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM items")).scalar() == 1
+            assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+            with pytest.raises(OperationalError):
+                connection.execute(text("INSERT INTO items (id) VALUES (2)"))
+    finally:
+        reader.dispose()
+        writer.dispose()
+
+
+def test_writer_transactions_serialize_instead_of_failing(tmp_path) -> None:
+    writer = create_database_engine(f"sqlite:///{tmp_path / 'writers.db'}", Settings(), pool_size=2)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"))
+        connection.execute(text("INSERT INTO counter (id, value) VALUES (1, 0)"))
+
+    def read_then_write() -> None:
+        with writer.begin() as connection:
+            value = connection.execute(text("SELECT value FROM counter WHERE id = 1")).scalar()
+            time.sleep(0.05)
+            connection.execute(text("UPDATE counter SET value = :value WHERE id = 1"), {"value": value + 1})
+
+    try:
+        threads = [threading.Thread(target=read_then_write) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with writer.connect() as connection:
+            assert connection.execute(text("SELECT value FROM counter WHERE id = 1")).scalar() == 2
+    finally:
+        writer.dispose()
+
+
+def test_auth_callback_waits_for_the_database_without_blocking_the_event_loop(
+    engine, async_session_factory, db_session, monkeypatch
+) -> None:
+    async def authorize_access_token(_request):
+        return {"userinfo": {"email": "loop@example.com", "name": "Loop", "sub": "sub-loop"}}
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    async def get_oauth_client():
+        return SimpleNamespace(authorize_access_token=authorize_access_token)
+
+    monkeypatch.setattr(auth_routes, "_get_oauth_client", get_oauth_client)
+    app.dependency_overrides[get_async_db_session] = override_get_async_db
+
+    async def scenario() -> tuple[httpx.Response, float]:
+        loop = asyncio.get_running_loop()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            # Another writer holds the lock, so the callback's transaction has to wait for it.
+            lock = engine.connect()
+            lock.exec_driver_sql("PRAGMA journal_mode=wal")
+            lock.exec_driver_sql("BEGIN IMMEDIATE")
+            callback = asyncio.create_task(http.get("/api/auth/callback"))
+
+            longest_gap, last_tick, started = 0.0, loop.time(), loop.time()
+            while loop.time() - started < 0.5:
+                await asyncio.sleep(0.01)
+                longest_gap, last_tick = max(longest_gap, loop.time() - last_tick), loop.time()
+            assert not callback.done()
+
+            lock.rollback()
+            lock.close()
+            return await callback, longest_gap
+
+    try:
+        response, longest_gap = asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.pop(get_async_db_session, None)
+
+    assert response.status_code == 302
+    assert longest_gap < 0.1
+    assert db_session.scalar(select(User.full_name).where(User.email == "loop@example.com")) == "Loop"
+
+
+def test_slow_statements_are_logged_with_their_parameters(db_session, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(database.settings, "slow_query_ms", 1)
+    slow_count = text(
+        "WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < :limit) "
+        "SELECT count(*) FROM numbers"
+    )
+    with caplog.at_level("WARNING", logger="app.sql"):
+        assert db_session.execute(slow_count, {"limit": 300_000}).scalar() == 300_000
+    assert any("Slow query" in message and "300000" in message for message in caplog.messages)
+
+
+def test_repeated_statements_in_one_request_are_reported(db_session) -> None:
+    with track_queries() as queries:
+        for employee_id in range(12):
+            db_session.get(Employee, employee_id + 1000)
+        db_session.execute(text("SELECT 1"))
+
+    repeated = queries.repeated_statements(10)
+    assert len(repeated) == 1 and repeated[0][1] == 12
+    assert queries.count == 13
+
+
+def test_client_fails_requests_over_their_query_budget(client, monkeypatch) -> None:
+    client.get("/api/employees")
+    monkeypatch.setattr(employee_routes.list_employees, QUERY_BUDGET_ATTR, 1)
+    with pytest.raises(QueryBudgetExceeded, match="GET /api/employees ran"):
+        client.get("/api/employees")
+
+
+def test_read_routes_run_on_the_read_only_engine(client) -> None:
+    read_sessions = app.dependency_overrides[get_read_db_session]()
+    db = next(read_sessions)
+    try:
+        assert db.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(OperationalError):
+            db.execute(text("DELETE FROM employees"))
+    finally:
+        read_sessions.close()
+
+    created = client.post(
+        "/api/employees",
+        json={"employee_code": "RO-1", "full_name": "Reader", "email": "reader@example.com", "joining_date": "2024-01-01"},
+    )
+    assert created.status_code == 201
+    listed = client.get("/api/employees")
+    assert listed.status_code == 200
+    assert [employee["employee_code"] for employee in listed.json()] == ["RO-1"]
+
+
+def test_missing_columns_are_added_with_quoted_ddl(tmp_path, monkeypatch) -> None:
+    metadata = MetaData()
+    Table(
+        "order",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("group", Integer, server_default="0", nullable=False),
+    )
+    monkeypatch.setattr(database.Base, "metadata", metadata)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'upgrade.db'}", Settings())
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE "order" (id INTEGER PRIMARY KEY)')
+            connection.exec_driver_sql('INSERT INTO "order" (id) VALUES (1)')
+
+        with engine.begin() as connection, track_queries() as stats:
+            assert database._add_missing_columns(connection) == {"order.group"}
+        with engine.connect() as connection:
+            assert connection.execute(text('SELECT "group" FROM "order"')).scalar() == 0
+        assert 'ALTER TABLE "order" ADD COLUMN "group" INTEGER NOT NULL DEFAULT \'0\'' in stats.statements
+    finally:
+        engine.dispose()
@@ -0,0 +1,161 @@
+from datetime import date
+
+from sqlalchemy import delete, select, update
+
+from app.models import Employee, Exercise, ExerciseLedgerEntry, Grant
+from app.services.exercises import (
+    ExerciseRequest,
+    add_exercise,
+    add_exercises,
+    backfill_exercise_totals,
+    exercised_options_as_of,
+    find_exercise_total_mismatches,
+    find_ledger_mismatches,
+    rebuild_exercise_ledger,
+)
+
+
+def _make_grant(db_session, total_options: int = 1000) -> Grant:
+    employee = Employee(
+        employee_code="E-5001", full_name="Counter User", email="counter@example.com", joining_date=date(2024, 1, 1)
+    )
+    grant = Grant(
+        employee=employee,
+        grant_name="Counter Grant",
+        grant_date=date(2024, 1, 1),
+        total_options=total_options,
+        strike_price_cents=100,
+        vesting_start_date=date(2024, 1, 1),
+    )
+    db_session.add(grant)
+    db_session.commit()
+    return grant
+
+
+def test_add_exercise_maintains_counters_and_rejects_overflow(db_session) -> None:
+    grant = _make_grant(db_session)
+
+    assert add_exercise(db_session, grant.id, date(2025, 6, 1), 300, 100) is not None
+    assert add_exercise(db_session, grant.id, date(2025, 3, 1), 200, 100) is not None
+    db_session.commit()
+    db_session.refresh(grant)
+
+    assert grant.exercised_options == 500
+    assert grant.last_exercise_date == date(2025, 6, 1)
+    assert exercised_options_as_of(db_session, grant, date(2025, 4, 1)) == 200
+    assert exercised_options_as_of(db_session, grant, date(2026, 1, 1)) == 500
+
+    assert add_exercise(db_session, grant.id, date(2025, 7, 1), 501, 100) is None
+    db_session.rollback()
+    assert db_session.query(Exercise).count() == 2
+    assert find_exercise_total_mismatches(db_session) == []
+
+
+def test_consistency_check_and_backfill(db_session) -> None:
+    grant = _make_grant(db_session)
+    db_session.add(Exercise(grant_id=grant.id, exercise_date=date(2025, 2, 1), options_exercised=40, price_per_option_cents=1))
+    db_session.commit()
+
+    mismatches = find_exercise_total_mismatches(db_session)
+    assert [(m.grant_id, m.stored_exercised, m.actual_exercised) for m in mismatches] == [(grant.id, 0, 40)]
+
+    assert backfill_exercise_totals(db_session) == 1
+    assert find_exercise_total_mismatches(db_session) == []
+
+    db_session.execute(update(Grant).where(Grant.id == grant.id).values(exercised_options=0))
+    db_session.commit()
+    assert len(find_exercise_total_mismatches(db_session)) == 1
+
+
+def test_ledger_handles_back_dated_exercises(db_session) -> None:
+    grant = _make_grant(db_session)
+    exercises = [(date(2025, 6, 1), 100), (date(2025, 9, 1), 50), (date(2025, 3, 1), 25), (date(2025, 6, 1), 10)]
+    for exercise_date, options in exercises:
+        assert add_exercise(db_session, grant.id, exercise_date, options, 100) is not None
+    db_session.commit()
+    db_session.refresh(grant)
+
+    entries = db_session.execute(
+        select(ExerciseLedgerEntry.exercise_date, ExerciseLedgerEntry.cumulative_options)
+        .where(ExerciseLedgerEntry.grant_id == grant.id)
+        .order_by(ExerciseLedgerEntry.exercise_date)
+    ).all()
+    assert entries == [(date(2025, 3, 1), 25), (date(2025, 6, 1), 135), (date(2025, 9, 1), 185)]
+
+    assert exercised_options_as_of(db_session, grant, date(2025, 2, 28)) == 0
+    assert exercised_options_as_of(db_session, grant, date(2025, 7, 1)) == 135
+    assert exercised_options_as_of(db_session, grant, date(2025, 9, 1)) == 185
+    assert find_ledger_mismatches(db_session) == []
+
+    db_session.execute(delete(ExerciseLedgerEntry))
+    db_session.commit()
+    assert find_ledger_mismatches(db_session) == [grant.id]
+    assert rebuild_exercise_ledger(db_session) == 3
+    assert find_ledger_mismatches(db_session) == []
+
+
+def test_bulk_exercises_validate_against_earlier_rows(db_session) -> None:
+    grant = _make_grant(db_session)
+    assert add_exercise(db_session, grant.id, date(2025, 6, 1), 100, 100) is not None
+    db_session.commit()
+
+    requests = [
+        ExerciseRequest(grant.id, date(2026, 1, 1), 300),
+        ExerciseRequest(grant.id, date(2025, 1, 1), 200),
+        ExerciseRequest(grant.id, date(2025, 1, 1), 51),
+        ExerciseRequest(grant.id + 1, date(2025, 1, 1), 1),
+    ]
+    exercises, errors = add_exercises(db_session, requests)
+    assert exercises == []
+    assert [(error.index, error.detail) for error in errors] == [
+        (2, "Exercise exceeds vested options on the selected date"),
+        (3, "Grant not found"),
+    ]
+
+    exercises, errors = add_exercises(db_session, requests[:2] + [ExerciseRequest(grant.id, date(2026, 12, 1), 50, 7)])
+    assert errors == []
+    db_session.commit()
+    db_session.refresh(grant)
+    assert [exercise.price_per_option_cents for exercise in exercises] == [100, 100, 7]
+    assert grant.exercised_options == 650
+    assert exercised_options_as_of(db_session, grant, date(2025, 7, 1)) == 300
+    assert find_exercise_total_mismatches(db_session) == []
+    assert find_ledger_mismatches(db_session) == []
+
+
+def test_bulk_exercise_endpoint_is_all_or_nothing(client) -> None:
+    employee = client.post(
+        "/api/employees",
+        json={
+            "employee_code": "E-5101",
+            "full_name": "Bulk Exercise User",
+            "email": "bulk-exercise@example.com",
+            "joining_date": "2020-01-01",
+            "status": "active",
+        },
+    ).json()
+    grant = client.post(
+        "/api/grants",
+        json={
+            "employee_id": employee["id"],
+            "grant_name": "Liquidity Grant",
+            "grant_date": "2020-01-01",
+            "total_options": 1000,
+            "strike_price_cents": 50,
+            "vesting_start_date": "2020-01-01",
+            "cliff_months": 12,
+            "vesting_months": 48,
+            "vesting_frequency_months": 1,
+        },
+    ).json()
+
+    rows = [{"grant_id": grant["id"], "exercise_date": "2025-01-01", "options_exercised": 600}] * 2
+    rejected = client.post("/api/grants/exercises:bulk", json={"exercises": rows})
+    assert rejected.status_code == 400
+    assert rejected.json()["detail"] == [{"index": 1, "detail": "Exercise exceeds vested options on the selected date"}]
+    assert client.get(f"/api/grants/{grant['id']}/exercises").json() == []
+
+    created = client.post("/api/grants/exercises:bulk", json={"exercises": rows[:1] + [{**rows[0], "options_exercised": 400}]})
+    assert created.status_code == 201
+    assert [exercise["options_exercised"] for exercise in created.json()] == [600, 400]
+    assert client.get(f"/api/grants/{grant['id']}/summary?as_of=2025-01-01").json()["exercised_options"] == 1000
@@ -0,0 +1,86 @@
+import json
+import os
+from types import SimpleNamespace
+
+from app.api.deps import get_current_user_optional
+from app.core.config import get_settings
+from app.core.database import QueryStats
+from app.core.metrics import RequestMetrics, request_metrics
+from app.main import app
+from app.models import UserRole
+
+
+def test_metrics_endpoint_reports_route_templates_and_query_counts(client) -> None:
+    request_metrics.clear()
+    client.post(
+        "/api/employees",
+        json={
+            "employee_code": "E-9101",
+            "full_name": "Metered",
+            "email": "metered@example.com",
+            "joining_date": "2024-01-01",
+        },
+    )
+    client.get("/api/grants/12345/summary")
+    client.get("/api/grants/12346/summary")
+    client.request("BREW", "/coffee")
+    client.request("PROPFIND", "/coffee")
+
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="POST",route="/api/employees",status="201"} 1' in body
+    assert 'http_requests_total{method="GET",route="/api/grants/{grant_id}/summary",status="404"} 2' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/grants/{grant_id}/summary"} 2' in body
+    assert 'http_request_db_queries_bucket{method="POST",route="/api/employees",le="0"} 0' in body
+    assert "http_requests_in_flight 0" in body
+    assert 'http_requests_total{method="OTHER",route="<unmatched>",status="404"} 2' in body
+    assert "BREW" not in body
+    assert "/metrics" not in body
+
+
+def test_metrics_are_summed_across_worker_snapshots(tmp_path) -> None:
+    metrics = RequestMetrics(tmp_path)
+    metrics.observe_request("GET", "/api/employees", 200, 0.02, 512, QueryStats(count=3, seconds=0.004))
+
+    sibling = RequestMetrics(None)
+    sibling.observe_request("GET", "/api/employees", 200, 0.2, 2048, QueryStats(count=1, seconds=0.001))
+    sibling.add_in_flight(4)
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(sibling.snapshot()))
+
+    body = metrics.render()
+    assert 'http_requests_total{method="GET",route="/api/employees",status="200"} 2' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/employees",le="0.025"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/employees",le="0.25"} 2' in body
+    assert 'http_request_db_queries_sum{method="GET",route="/api/employees"} 4' in body
+    assert "http_requests_in_flight 4" in body
+
+
+def test_start_removes_snapshots_of_dead_workers(tmp_path) -> None:
+    dead_pid = 2**22 + 1  # above Linux's default pid_max
+    (tmp_path / f"{dead_pid}.json").write_text(json.dumps(RequestMetrics(None).snapshot()))
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(RequestMetrics(None).snapshot()))
+
+    RequestMetrics(tmp_path).remove_stale_snapshots()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{os.getppid()}.json"]
+
+
+def test_scrapes_drop_snapshots_of_recycled_workers(tmp_path) -> None:
+    recycled = RequestMetrics(None)
+    recycled.observe_request("GET", "/api/employees", 200, 0.02, 512, QueryStats())
+    dead_pid = 2**22 + 1
+    (tmp_path / f"{dead_pid}.json").write_text(json.dumps(recycled.snapshot()))
+
+    body = RequestMetrics(tmp_path).render()
+    assert "/api/employees" not in body
+    assert not (tmp_path / f"{dead_pid}.json").exists()
+
+
+def test_metrics_endpoint_is_admin_only_unless_public(client, monkeypatch) -> None:
+    app.dependency_overrides[get_current_user_optional] = lambda: None
+    assert client.get("/metrics").status_code == 401
+    employee = SimpleNamespace(id=5, email="e@example.com", full_name="E", role=UserRole.EMPLOYEE, employee_id=None)
+    app.dependency_overrides[get_current_user_optional] = lambda: employee
+    assert client.get("/metrics").status_code == 403
+
+    monkeypatch.setattr(get_settings(), "metrics_public", True)
+    app.dependency_overrides[get_current_user_optional] = lambda: None
+    assert client.get("/metrics").status_code == 200
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.api.routes import auth as auth_routes
+from app.core.oidc import OIDCProviderCache
+
+DISCOVERY_URL = "http://idp.test/.well-known/openid-configuration"
+
+
+def _stand_in_idp(requests: list[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/.well-known/openid-configuration":
+            return httpx.Response(
+                200,
+                json={
+                    "issuer": "http://idp.test",
+                    "authorization_endpoint": "http://idp.test/authorize",
+                    "token_endpoint": "http://idp.test/token",
+                    "jwks_uri": "http://idp.test/jwks",
+                },
+            )
+        if request.url.path == "/jwks":
+            return httpx.Response(200, json={"keys": [{"kty": "RSA", "kid": "k1", "n": "AQAB", "e": "AQAB"}]})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def test_provider_metadata_is_fetched_once_and_persisted(tmp_path) -> None:
+    requests: list[str] = []
+    cache_path = tmp_path / "oidc.json"
+    provider = OIDCProviderCache(DISCOVERY_URL, cache_path, ttl_seconds=3600, transport=_stand_in_idp(requests))
+
+    async def load_twice() -> dict:
+        await provider.get()
+        return await provider.get()
+
+    metadata = asyncio.run(load_twice())
+    assert metadata["jwks"]["keys"][0]["kid"] == "k1"
+    assert requests == ["/.well-known/openid-configuration", "/jwks"]
+    assert json.loads(cache_path.read_text())["metadata"]["token_endpoint"] == "http://idp.test/token"
+
+    restarted = OIDCProviderCache(DISCOVERY_URL, cache_path, ttl_seconds=3600, transport=_stand_in_idp(requests))
+    assert asyncio.run(restarted.get())["authorization_endpoint"] == "http://idp.test/authorize"
+    assert len(requests) == 2
+
+
+def test_expired_metadata_is_served_while_refreshing_in_background(tmp_path) -> None:
+    requests: list[str] = []
+    cache_path = tmp_path / "oidc.json"
+    cache_path.write_text(
+        json.dumps(
+            {
+                "discovery_url": DISCOVERY_URL,
+                "fetched_at": time.time() - 7200,
+                "metadata": {"authorization_endpoint": "http://idp.test/old", "jwks": {"keys": []}},
+            }
+        )
+    )
+    provider = OIDCProviderCache(DISCOVERY_URL, cache_path, ttl_seconds=3600, transport=_stand_in_idp(requests))
+
+    async def scenario() -> tuple[dict, dict]:
+        stale = await provider.get()
+        await provider._refresh_task
+        return stale, await provider.get()
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale["authorization_endpoint"] == "http://idp.test/old"
+    assert fresh["authorization_endpoint"] == "http://idp.test/authorize"
+    assert not provider.expired
+
+
+def test_login_redirects_using_cached_metadata(client, monkeypatch) -> None:
+    requests: list[str] = []
+    provider = OIDCProviderCache(DISCOVERY_URL, None, ttl_seconds=3600, transport=_stand_in_idp(requests))
+    monkeypatch.setattr(auth_routes, "oidc_provider", provider)
+    monkeypatch.setattr(auth_routes, "oauth_google_client", None)
+    monkeypatch.setattr(auth_routes.settings, "google_client_id", "client-id")
+    monkeypatch.setattr(auth_routes.settings, "google_client_secret", "client-secret")
+
+    for _ in range(2):
+        response = client.get("/api/auth/login", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"].startswith("http://idp.test/authorize?")
+    assert requests == ["/.well-known/openid-configuration", "/jwks"]
+
+
+def test_client_keeps_rotated_keys_until_the_provider_refreshes(client, monkeypatch) -> None:
+    requests: list[str] = []
+    provider = OIDCProviderCache(DISCOVERY_URL, None, ttl_seconds=3600, transport=_stand_in_idp(requests))
+    monkeypatch.setattr(auth_routes, "oidc_provider", provider)
+    monkeypatch.setattr(auth_routes, "oauth_google_client", None)
+    monkeypatch.setattr(auth_routes.settings, "google_client_id", "client-id")
+    monkeypatch.setattr(auth_routes.settings, "google_client_secret", "client-secret")
+
+    oauth_client = asyncio.run(auth_routes._get_oauth_client())
+    assert oauth_client.server_metadata["jwks"]["keys"][0]["kid"] == "k1"
+
+    # authlib re-fetches the JWKS itself when a token is signed with an unknown key.
+    oauth_client.server_metadata["jwks"] = {"keys": [{"kid": "rotated"}]}
+    assert asyncio.run(auth_routes._get_oauth_client()).server_metadata["jwks"]["keys"][0]["kid"] == "rotated"
+
+    asyncio.run(provider.refresh())
+    assert asyncio.run(auth_routes._get_oauth_client()).server_metadata["jwks"]["keys"][0]["kid"] == "k1"
+
+
+def test_refresh_loop_survives_unexpected_errors(monkeypatch) -> None:
+    def broken(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=["not", "a", "document"])
+
+    provider = OIDCProviderCache(DISCOVERY_URL, None, ttl_seconds=3600, transport=httpx.MockTransport(broken))
+    monkeypatch.setattr("app.core.oidc.RETRY_SECONDS", 0.01)
+
+    async def scenario() -> bool:
+        provider.start()
+        await asyncio.sleep(0.05)
+        running = provider.status()["running"]
+        await provider.stop()
+        return running
+
+    assert asyncio.run(scenario())
+    assert "TypeError" in provider.status()["last_error"]
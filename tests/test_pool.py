@@ -0,0 +1,84 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from app.models import Employee, Grant, PoolLedgerEntry, PoolLedgerKind
+from app.services.pool import allocate_pool_options, ensure_pool_state, get_pool_snapshot
+
+
+def _grant_payload(employee_id: int, total_options: int) -> dict:
+    return {
+        "employee_id": employee_id,
+        "grant_name": "Pool Grant",
+        "grant_date": "2024-01-01",
+        "total_options": total_options,
+        "strike_price_cents": 100,
+        "vesting_start_date": "2024-01-01",
+        "cliff_months": 12,
+        "vesting_months": 48,
+        "vesting_frequency_months": 1,
+        "notes": None,
+    }
+
+
+def test_grant_writes_are_checked_against_pool_ledger(client) -> None:
+    employee = client.post(
+        "/api/employees",
+        json={
+            "employee_code": "E-6001",
+            "full_name": "Pool Ledger User",
+            "email": "ledger@example.com",
+            "joining_date": "2024-01-01",
+            "status": "active",
+        },
+    ).json()
+
+    first = client.post("/api/grants", json=_grant_payload(employee["id"], 900_000))
+    assert first.status_code == 201
+    over = client.post("/api/grants", json=_grant_payload(employee["id"], 200_000))
+    assert over.status_code == 400
+
+    grown = client.patch(f"/api/grants/{first.json()['id']}", json={"total_options": 950_000})
+    assert grown.status_code == 200
+    too_big = client.patch(f"/api/grants/{first.json()['id']}", json={"total_options": 1_000_001})
+    assert too_big.status_code == 400
+
+    dashboard = client.get("/api/dashboard/summary").json()
+    assert dashboard["pool_allocated"] == 950_000
+    assert dashboard["pool_remaining"] == 50_000
+
+
+def test_pool_state_opening_balance_and_size_changes(db_session) -> None:
+    employee = Employee(
+        employee_code="E-6002", full_name="Opening User", email="opening@example.com", joining_date=date(2024, 1, 1)
+    )
+    db_session.add(
+        Grant(
+            employee=employee,
+            grant_name="Existing Grant",
+            grant_date=date(2024, 1, 1),
+            total_options=400,
+            strike_price_cents=1,
+            vesting_start_date=date(2024, 1, 1),
+        )
+    )
+    db_session.commit()
+    assert get_pool_snapshot(db_session, 1000).allocated_options == 400
+
+    ensure_pool_state(db_session, 1000)
+    assert allocate_pool_options(db_session, 1000, 600)
+    assert not allocate_pool_options(db_session, 1000, 1)
+    assert allocate_pool_options(db_session, 1000, -100)
+
+    ensure_pool_state(db_session, 2000)
+    db_session.commit()
+    snapshot = get_pool_snapshot(db_session, 2000)
+    assert (snapshot.pool_size, snapshot.allocated_options, snapshot.remaining_options) == (2000, 900, 1100)
+
+    kinds = db_session.scalars(select(PoolLedgerEntry.kind).order_by(PoolLedgerEntry.id)).all()
+    assert kinds == [
+        PoolLedgerKind.OPENING_BALANCE,
+        PoolLedgerKind.ALLOCATION,
+        PoolLedgerKind.ALLOCATION,
+        PoolLedgerKind.POOL_SIZE,
+    ]
@@ -0,0 +1,97 @@
+import pstats
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import profiling as profiling_api
+from app.core import profiling
+from app.main import app
+from app.models import UserRole
+
+
+@pytest.fixture()
+def profile_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "profiles"
+    monkeypatch.setattr(profiling.profile_store, "directory", directory)
+    return directory
+
+
+def _tree_functions(nodes: list[dict]) -> set[str]:
+    names = set()
+    for node in nodes:
+        names.add(node["function"])
+        names |= _tree_functions(node["children"])
+    return names
+
+
+def test_admin_can_profile_a_request_and_download_the_report(client, profile_dir, tmp_path) -> None:
+    client.post(
+        "/api/employees",
+        json={"employee_code": "E-9201", "full_name": "Profiled", "email": "profiled@example.com", "joining_date": "2024-01-01"},
+    )
+    response = client.get("/api/dashboard/summary", params={"as_of": "2025-01-01"}, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+
+    listing = client.get("/api/admin/profiles").json()
+    assert len(listing) == 1
+    summary = listing[0]
+    assert (summary["route"], summary["sampled"], summary["requested_by"]) == (
+        "/api/dashboard/summary",
+        False,
+        "admin@company.com",
+    )
+    assert summary["sql_count"] > 0
+
+    report = client.get(f"/api/admin/profiles/{summary['id']}").json()
+    assert any("FROM employees" in statement["statement"] for statement in report["sql"]["statements"])
+    assert any("_build_dashboard_summary" in name for name in _tree_functions(report["call_tree"]))
+
+    download = client.get(f"/api/admin/profiles/{summary['id']}/pstats")
+    assert download.status_code == 200
+    (tmp_path / "download.prof").write_bytes(download.content)
+    assert pstats.Stats(str(tmp_path / "download.prof")).total_calls > 0
+
+    assert client.get("/api/admin/profiles/../../etc/passwd").status_code == 404
+    assert profile_dir.stat().st_mode & 0o777 == 0o700
+
+
+def test_profiling_flag_is_ignored_for_non_admins(client, profile_dir, monkeypatch) -> None:
+    employee = SimpleNamespace(id=5, email="e@example.com", full_name="E", role=UserRole.EMPLOYEE, employee_id=None)
+    lookups = []
+
+    def current_user_optional(request, db):
+        lookups.append(request.url.path)
+        return employee
+
+    monkeypatch.setattr(profiling_api, "get_current_user_optional", current_user_optional)
+    del app.dependency_overrides[profiling_api.get_profiling_admin]
+
+    assert client.get("/api/grants").status_code == 200
+    assert lookups == []
+    response = client.get("/api/grants", params={"profile": "1"})
+    assert response.status_code == 200
+    assert lookups == ["/api/grants"]
+    assert not profile_dir.exists()
+
+
+def test_sampling_profiles_one_in_n_requests(client, profile_dir, monkeypatch) -> None:
+    monkeypatch.setattr(profiling.request_profiler, "sample_rate", 2)
+    for _ in range(4):
+        client.get("/api/grants")
+
+    reports = [report for report in client.get("/api/admin/profiles").json() if report["route"] == "/api/grants"]
+    assert len(reports) == 2
+    assert all(report["sampled"] and report["requested_by"] is None for report in reports)
+
+
+def test_sampled_profiles_never_overlap_and_stats_are_cleared() -> None:
+    profiler = profiling.RequestProfiler(sample_rate=1)
+    tag = profiler.begin()
+    assert profiler.begin(exclusive=True) is None
+    profiler.end(tag)
+
+    tag = profiler.begin(exclusive=True)
+    assert tag is not None
+    profiler.end(tag)
+    assert not profiling.yappi.is_running()
+    assert profiling.yappi.get_func_stats().empty()
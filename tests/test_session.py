@@ -0,0 +1,66 @@
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.session import SignedSessionMiddleware
+
+
+async def _login(request: Request) -> JSONResponse:
+    request.session["user_id"] = 7
+    return JSONResponse({})
+
+
+async def _whoami(request: Request) -> JSONResponse:
+    return JSONResponse({"user_id": request.session.get("user_id")})
+
+
+async def _logout(request: Request) -> JSONResponse:
+    request.session.clear()
+    return JSONResponse({})
+
+
+def _client(refresh_after: int = 3600) -> tuple[TestClient, SignedSessionMiddleware]:
+    app = Starlette(routes=[Route("/login", _login), Route("/whoami", _whoami), Route("/logout", _logout)])
+    app.add_middleware(SignedSessionMiddleware, secret_key="test-secret", refresh_after=refresh_after)
+    client = TestClient(app)
+    return client, SignedSessionMiddleware(app, secret_key="test-secret", refresh_after=refresh_after)
+
+
+def test_unchanged_session_skips_set_cookie() -> None:
+    client, _ = _client()
+    login = client.get("/login")
+    assert "esop_session=" in login.headers["set-cookie"]
+    assert "HttpOnly" in login.headers["set-cookie"]
+
+    whoami = client.get("/whoami")
+    assert whoami.json() == {"user_id": 7}
+    assert "set-cookie" not in whoami.headers
+
+    logout = client.get("/logout")
+    assert "Max-Age=0" in logout.headers["set-cookie"]
+    assert client.get("/whoami").json() == {"user_id": None}
+
+
+def test_session_is_reissued_after_refresh_window() -> None:
+    client, middleware = _client(refresh_after=60)
+    issued_long_ago = int(time.time()) - 120
+    client.cookies.set("esop_session", middleware._encode({"user_id": 7}, issued_long_ago).decode("ascii"))
+
+    refreshed = client.get("/whoami")
+    assert refreshed.json() == {"user_id": 7}
+    assert "esop_session=" in refreshed.headers["set-cookie"]
+
+
+def test_tampered_or_expired_cookies_are_ignored() -> None:
+    client, middleware = _client()
+    value = middleware._encode({"user_id": 7}, int(time.time())).decode("ascii")
+    client.cookies.set("esop_session", value[:-1] + ("0" if value[-1] != "0" else "1"))
+    assert client.get("/whoami").json() == {"user_id": None}
+
+    expired = middleware._encode({"user_id": 7}, int(time.time()) - middleware.max_age - 1).decode("ascii")
+    client.cookies.set("esop_session", expired)
+    assert client.get("/whoami").json() == {"user_id": None}
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app import cli
+from app.core.data_versions import CAP_TABLE_SCOPE, read_data_versions
+from app.core.database import Base
+from app.models import Employee, Exercise, ExerciseLedgerEntry, Grant
+from app.schemas import GrantCreate
+from app.services.exercises import find_exercise_total_mismatches, find_ledger_mismatches
+from app.services.pool import PoolSnapshot, get_pool_snapshot
+from app.services.synthetic import SeedError, generate_cap_table
+
+POOL_SIZE = 100_000_000
+
+
+def _seeded_rows(db: Session) -> tuple[list, list]:
+    grants = db.execute(select(Grant.__table__).order_by(Grant.id)).all()
+    exercises = db.execute(
+        select(Exercise.grant_id, Exercise.exercise_date, Exercise.options_exercised).order_by(Exercise.id)
+    ).all()
+    return grants, exercises
+
+
+def test_seed_is_deterministic_and_consistent(db_session, tmp_path) -> None:
+    report = generate_cap_table(db_session, employees=50, grants=400, seed=11, pool_size=POOL_SIZE, batch_size=150)
+    assert (report.employees, report.grants) == (50, 400)
+    assert report.exercises > 0
+
+    assert find_exercise_total_mismatches(db_session) == []
+    assert find_ledger_mismatches(db_session) == []
+    assert db_session.scalar(select(func.count()).select_from(ExerciseLedgerEntry)) == report.exercises
+    assert db_session.scalar(select(func.count()).select_from(Employee)) == 50
+    assert get_pool_snapshot(db_session, POOL_SIZE).allocated_options == report.allocated_options
+    assert db_session.scalar(select(func.sum(Grant.total_options))) == report.allocated_options
+    assert read_data_versions(db_session)[CAP_TABLE_SCOPE] > 0
+
+    for grant in db_session.scalars(select(Grant)):
+        GrantCreate.model_validate(grant, from_attributes=True)
+        assert grant.grant_date >= grant.employee.joining_date
+
+    other_engine = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    Base.metadata.create_all(bind=other_engine)
+    with Session(other_engine) as other:
+        generate_cap_table(other, employees=50, grants=400, seed=11, pool_size=POOL_SIZE, batch_size=400)
+        assert _seeded_rows(other) == _seeded_rows(db_session)
+        generate_cap_table(other, employees=50, grants=400, seed=12, pool_size=POOL_SIZE)
+        assert other.scalar(select(func.count()).select_from(Grant)) == 800
+    other_engine.dispose()
+
+
+def test_seed_refuses_grants_that_do_not_fit_the_pool(db_session) -> None:
+    with pytest.raises(SeedError, match="ESOP_POOL_SIZE"):
+        generate_cap_table(db_session, employees=10, grants=100, seed=1, pool_size=1_000)
+    assert db_session.scalar(select(func.count()).select_from(Grant)) == 0
+    assert db_session.scalar(select(func.count()).select_from(Employee)) == 0
+
+
+def test_seed_command_writes_to_its_own_file_with_a_fitting_pool(tmp_path) -> None:
+    database = tmp_path / "load.db"
+    assert cli.main(["seed", "--database", str(database), "--employees", "20", "--grants", "300"]) == 0
+
+    engine = create_engine(f"sqlite:///{database}")
+    with Session(engine) as db:
+        allocated = db.scalar(select(func.sum(Grant.total_options)))
+        assert get_pool_snapshot(db, 0) == PoolSnapshot(pool_size=allocated, allocated_options=allocated)
+    engine.dispose()
+
+    # The pool now recorded in the file is kept, so a second run no longer fits.
+    assert cli.main(["seed", "--database", str(database), "--employees", "20", "--grants", "300"]) == 2
+    assert cli.main(["seed", "--database", str(database), "--grants", "300", "--pool-size", str(10 * allocated)]) == 0
@@ -1,7 +1,8 @@
-from datetime import date
+from datetime import date, timedelta
 from types import SimpleNamespace
+import random
 
-from app.services.vesting import complete_months_between, vested_options_for_grant
+from app.services.vesting import complete_months_between, summarize_grant, summarize_grants, vested_options_for_grant
 
 
 def test_complete_months_between_handles_day_boundary() -> None:
@@ -21,3 +22,38 @@ def test_vesting_respects_cliff_and_full_term() -> None:
     assert vested_options_for_grant(grant, date(2024, 12, 31)) == 0
     assert vested_options_for_grant(grant, date(2025, 1, 1)) == 1200
     assert vested_options_for_grant(grant, date(2028, 1, 1)) == 4800
+
+
+def test_batch_vesting_matches_scalar_summaries() -> None:
+    rng = random.Random(7)
+    grants = []
+    for grant_id in range(1, 501):
+        frequency = rng.choice([1, 3, 6, 12])
+        vesting_months = frequency * rng.randint(1, 240 // frequency)
+        cliff_months = frequency * rng.randint(0, vesting_months // frequency)
+        start = date(2020, 1, 1) + timedelta(days=rng.randint(0, 2000))
+        total_options = rng.randint(1, 100_000)
+        exercises = [
+            SimpleNamespace(
+                exercise_date=start + timedelta(days=rng.randint(0, 3000)),
+                options_exercised=rng.randint(1, total_options),
+            )
+            for _ in range(rng.randint(0, 3))
+        ]
+        grants.append(
+            SimpleNamespace(
+                id=grant_id,
+                employee_id=grant_id,
+                employee=SimpleNamespace(full_name=f"Employee {grant_id}"),
+                grant_name=f"Grant {grant_id}",
+                total_options=total_options,
+                vesting_start_date=start,
+                cliff_months=cliff_months,
+                vesting_months=vesting_months,
+                vesting_frequency_months=frequency,
+                exercises=exercises,
+            )
+        )
+
+    for as_of in (date(2019, 12, 31), date(2021, 2, 28), date(2023, 7, 31), date(2026, 1, 1), date(2045, 1, 1)):
+        assert summarize_grants(grants, as_of) == [summarize_grant(grant, as_of) for grant in grants]